@@ -0,0 +1,132 @@
+"""Micro-benchmark: classifying a busy advertisement stream.
+
+Replays a synthetic stream — a few scales among many non-scale devices,
+each re-advertising with volatile bytes changing — through ``detect_model``,
+a ``DetectionCache`` and ``detect_models_bulk``, and times the
+fallback-matcher step alone: the compiled index against the per-pattern
+``fnmatch`` loop it replaced.
+
+    python benchmarks/bench_detect_model.py
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import random
+import time
+
+from etekcity_esf551_ble import detection
+from etekcity_esf551_ble.detection import (
+    ETEKCITY_MANUFACTURER_ID,
+    QN_MANUFACTURER_ID,
+    DetectionCache,
+    detect_model,
+    detect_models_bulk,
+)
+
+DEVICES = 2000
+ADVERTISEMENTS = 200_000
+
+
+def _mac(rng: random.Random) -> tuple[str, bytes]:
+    octets = bytes(rng.randrange(256) for _ in range(6))
+    return ":".join(f"{o:02X}" for o in octets), octets[::-1]
+
+
+def make_stream(seed: int = 0) -> list[tuple[str | None, dict[int, bytes], str]]:
+    rng = random.Random(seed)
+    devices = []
+    for i in range(DEVICES):
+        address, rmac = _mac(rng)
+        kind = i % 20
+        if kind == 0:  # ESF-551
+            devices.append(
+                (
+                    "Etekcity Fitness Scale",
+                    ETEKCITY_MANUFACTURER_ID,
+                    b"\x01" + rmac + b"\x00\x02",
+                    address,
+                )
+            )
+        elif kind == 1:  # ESF-24
+            devices.append(
+                (None, QN_MANUFACTURER_ID, b"\x01\x26\x01\x00\x00" + rmac, address)
+            )
+        elif kind == 2:  # another Etekcity product
+            devices.append(
+                (
+                    None,
+                    ETEKCITY_MANUFACTURER_ID,
+                    b"\x01" + rmac + b"\xc6\x23\x02",
+                    address,
+                )
+            )
+        else:  # phones, headphones, beacons
+            devices.append(
+                (
+                    f"Device {i}",
+                    76 + kind,
+                    bytes(rng.randrange(256) for _ in range(12)),
+                    address,
+                )
+            )
+    stream = []
+    for _ in range(ADVERTISEMENTS):
+        name, company, payload, address = rng.choice(devices)
+        volatile = bytearray(payload)
+        if company == QN_MANUFACTURER_ID:
+            volatile[3] = rng.randrange(256)
+        elif company != ETEKCITY_MANUFACTURER_ID:
+            volatile[-1] = rng.randrange(256)
+        stream.append((name, {company: bytes(volatile)}, address))
+    return stream
+
+
+def fnmatch_fallback(local_name, manufacturer_data, address):
+    """The fallback loop before the index: fnmatch per pattern and candidate."""
+    for model, required_mfr_id, pattern in detection.FALLBACK_MATCHERS:
+        if required_mfr_id is not None and required_mfr_id not in manufacturer_data:
+            continue
+        for candidate in (local_name, address):
+            if candidate and fnmatch.fnmatch(candidate.lower(), pattern.lower()):
+                return model, pattern
+    return None
+
+
+def _time(fn, stream) -> float:
+    start = time.perf_counter()
+    for name, mfr, address in stream:
+        fn(name, mfr, address)
+    return (time.perf_counter() - start) / len(stream) * 1e6
+
+
+def main() -> None:
+    stream = make_stream()
+    cache = DetectionCache(maxsize=8192)
+    cases = [("detect_model", detect_model), ("DetectionCache", cache.detect)]
+    baseline = None
+    for label, fn in cases:
+        per_ad = _time(fn, stream)
+        baseline = baseline or per_ad
+        print(f"{label:<15} {per_ad:6.2f} us/advertisement ({baseline / per_ad:4.1f}x)")
+    print(
+        f"cache: {cache.hits} hits, {cache.misses} misses, "
+        f"{len(cache)} entries, hit rate {cache.hit_rate:.1%}"
+    )
+
+    rows = [(address, name, mfr) for name, mfr, address in stream]
+    start = time.perf_counter()
+    for _ in detect_models_bulk(rows):
+        pass
+    per_ad = (time.perf_counter() - start) / len(rows) * 1e6
+    print(f"{'bulk':<15} {per_ad:6.2f} us/advertisement ({baseline / per_ad:4.1f}x)")
+
+    print("fallback matchers only:")
+    before = _time(fnmatch_fallback, stream)
+    after = _time(detection._match_fallback, stream)
+    print(f"  fnmatch loop    {before:6.2f} us/advertisement")
+    print(f"  compiled index  {after:6.2f} us/advertisement ({before / after:4.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Benchmark: ESF-24 fast start against the prompt-driven handshake.
+
+Runs sequential weigh-ins against a simulated ESF-24 at several link
+latencies and reports time-to-final-frame (connection attempt started to the
+final reading parsed) for three cases: the default prompt-driven flow, fast
+start against a scale that takes early commands, and fast start against one
+that drops them. The last pays the fallback timeout for the first three
+sessions, then waits for the prompts like the default flow.
+
+Captures cannot answer this question: a replay feeds the recorded
+notifications back without the scale reacting to the client's writes.
+
+    python benchmarks/bench_esf24_fast_start.py [sessions]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import statistics
+import sys
+
+from etekcity_esf551_ble import (
+    ESF24Scale,
+    LatencyMonitor,
+    LinkConditions,
+    ScaleSimulator,
+    SessionPhase,
+)
+from etekcity_esf551_ble.simulator import SimulatedESF24
+
+ADDRESS = "ED:67:39:11:22:33"
+
+CASES = [
+    ("prompt-driven", False, True),
+    ("fast start", True, True),
+    ("fast start, early commands dropped", True, False),
+]
+
+
+async def run(sessions: int, latency: float, fast_start: bool, early: bool):
+    sim = ScaleSimulator(LinkConditions(latency=latency, jitter=latency / 2), seed=0)
+    sim.add(SimulatedESF24(ADDRESS, frame_interval=2 * latency, early_commands=early))
+    timings = []
+    monitor = LatencyMonitor(listener=timings.append)
+    scale = ESF24Scale(
+        ADDRESS,
+        None,
+        bleak_scanner_backend=sim.scanner(),
+        client_factory=sim.connect,
+        cooldown_seconds=0,
+        fast_start=fast_start,
+    )
+    monitor.attach(scale)
+    await scale.async_start()
+    for _ in range(sessions):
+        count = len(timings)
+        await sim.advertise()
+        while len(timings) == count or scale._client is not None:
+            await asyncio.sleep(latency / 4)
+    await scale.async_stop()
+    return [
+        t.between(SessionPhase.CONNECTING, SessionPhase.FINAL_FRAME)
+        for t in timings
+        if t.completed
+    ], scale.fast_start_fallbacks
+
+
+async def main(sessions: int) -> None:
+    for latency in (0.005, 0.02, 0.05):
+        print(f"{sessions} sessions, {latency * 1e3:.0f} ms link latency")
+        for label, fast_start, early in CASES:
+            values, fallbacks = await run(sessions, latency, fast_start, early)
+            print(
+                f"  {label:<36} median {statistics.median(values) * 1e3:7.1f} ms"
+                f"  max {max(values) * 1e3:7.1f} ms  fallbacks {fallbacks}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 10))
@@ -0,0 +1,144 @@
+"""Benchmark: advertisement filtering pushed down into BlueZ or-patterns.
+
+Replays a crowded RF environment (a few scales among thousands of phones,
+wearables, beacons, other Etekcity products and other company-ID 65535
+devices) through a fake passive scanner that applies or-patterns the way
+BlueZ's advertisement monitor does. Only matching advertisements cost a
+Python callback: building the ``BLEDevice``/``AdvertisementData`` bleak hands
+over, then routing by address like ``ScaleHub``. The benchmark compares the
+old FLAGS-only patterns (everything passes) with the scale patterns a hub
+uses. A scale client uses the same patterns and drops other scales'
+advertisements by address in Python.
+
+    python benchmarks/bench_filter_patterns.py
+"""
+
+from __future__ import annotations
+
+import random
+import time
+
+from bleak.backends.device import BLEDevice
+from bleak.backends.scanner import AdvertisementData
+
+from etekcity_esf551_ble.detection import (
+    ETEKCITY_MANUFACTURER_ID,
+    QN_MANUFACTURER_ID,
+    advertisement_filter_patterns,
+)
+
+DEVICES = 3000
+SCALES = 12
+ADVERTISEMENTS = 300_000
+
+FLAGS_PATTERNS = [(0, 0x01, b"\x02"), (0, 0x01, b"\x06"), (0, 0x01, b"\x1a")]
+
+
+def _mac(rng: random.Random) -> tuple[str, bytes]:
+    octets = bytes(rng.randrange(256) for _ in range(6))
+    return ":".join(f"{o:02X}" for o in octets), octets[::-1]
+
+
+def make_environment(seed: int = 0):
+    """(address, local_name, {company: payload}) per device; scales first."""
+    rng = random.Random(seed)
+    devices = []
+    for i in range(DEVICES):
+        address, rmac = _mac(rng)
+        if i < SCALES:
+            if i % 3:
+                mfr = {ETEKCITY_MANUFACTURER_ID: b"\x01" + rmac + b"\x00\x02"}
+            else:
+                mfr = {QN_MANUFACTURER_ID: b"\x01\x26\x01\x00\x00" + rmac}
+        elif i % 50 == 0:  # other Etekcity products (purifiers, plugs)
+            mfr = {ETEKCITY_MANUFACTURER_ID: b"\x01" + rmac + b"\xc6\x23\x02"}
+        elif i % 25 == 0:  # other vendors' catch-all company ID
+            mfr = {QN_MANUFACTURER_ID: bytes(rng.randrange(256) for _ in range(11))}
+        else:  # Apple, Microsoft, Samsung, Google...
+            company = rng.choice((0x004C, 0x0006, 0x0075, 0x00E0, 0x0059))
+            mfr = {
+                company: bytes(rng.randrange(256) for _ in range(rng.randint(4, 24)))
+            }
+        name = f"Device {i}" if rng.random() < 0.3 else None
+        devices.append((address, name, mfr))
+    return devices
+
+
+def _structures(name, mfr) -> list[tuple[int, bytes]]:
+    structures = [(0x01, b"\x06")]
+    if name:
+        structures.append((0x09, name.encode()))
+    for company, payload in mfr.items():
+        structures.append((0xFF, company.to_bytes(2, "little") + payload))
+    return structures
+
+
+class FakePassiveScanner:
+    """Applies or-patterns like BlueZ, then runs the Python-side callback."""
+
+    def __init__(self, patterns, callback) -> None:
+        self._patterns = patterns
+        self._callback = callback
+
+    def matches(self, structures) -> bool:
+        """bluetoothd's side: no Python callback for a non-matching one."""
+        return any(
+            t == ad_type and data[start : start + len(content)] == content
+            for start, ad_type, content in self._patterns
+            for t, data in structures
+        )
+
+    def deliver(self, address, name, mfr) -> None:
+        device = BLEDevice(address, name, None)
+        data = AdvertisementData(
+            local_name=name,
+            manufacturer_data=mfr,
+            service_data={},
+            service_uuids=[],
+            tx_power=None,
+            rssi=-70,
+            platform_data=(),
+        )
+        self._callback(device, data)
+
+
+def main() -> None:
+    rng = random.Random(1)
+    devices = make_environment()
+    scales = {address: [] for address, _, _ in devices[:SCALES]}
+    stream = [rng.choice(devices) for _ in range(ADVERTISEMENTS)]
+    stream = [(a, n, m, _structures(n, m)) for a, n, m in stream]
+
+    def route(device, data):
+        if (readings := scales.get(device.address)) is not None:
+            readings.append(data)
+
+    cases = [
+        ("FLAGS only (before)", FLAGS_PATTERNS),
+        ("scale patterns (hub)", advertisement_filter_patterns()),
+    ]
+    print(f"{DEVICES} devices, {SCALES} scales, {ADVERTISEMENTS} advertisements")
+    for label, patterns in cases:
+        for readings in scales.values():
+            readings.clear()
+        scanner = FakePassiveScanner(patterns, route)
+        forwarded = [
+            (address, name, mfr)
+            for address, name, mfr, structures in stream
+            if scanner.matches(structures)
+        ]
+        start = time.perf_counter()
+        for address, name, mfr in forwarded:
+            scanner.deliver(address, name, mfr)
+        elapsed = time.perf_counter() - start
+        routed = sum(len(r) for r in scales.values())
+        avoided = 1 - len(forwarded) / len(stream)
+        print(
+            f"{label:<22} {len(forwarded):>7} callbacks ({avoided:6.1%} avoided),"
+            f" {routed} scale advertisements routed,"
+            f" {elapsed * 1e3:7.1f} ms in Python"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Micro-benchmark: A5 FrameReassembler against the byte-by-byte original.
+
+Feeds the same notification stream — captured EFS-A591S frames split into
+20-byte BLE notifications — through the current reassembler and through the
+per-byte implementation it replaced, and reports the time per frame.
+
+    python benchmarks/bench_frame_reassembler.py
+"""
+
+from __future__ import annotations
+
+import struct
+import timeit
+
+from etekcity_esf551_ble.efsa591s import protocol as a5
+
+# Captured frames (see tests/unit/test_efsa591s_protocol.py).
+KE_RESP = bytes.fromhex("a513140f001f0101420000000645862801eacfbe50")
+MEAS = bytes.fromhex(
+    "a5033825008a012144000150242bf17c291c80514cf20804c2b26a627dfa6324a2c9dd53c449d800add65c"
+)
+FRAMES = [KE_RESP] + [MEAS] * 200
+MTU_PAYLOAD = 20
+
+
+class LegacyFrameReassembler:
+    """The per-byte reassembler, kept verbatim as the baseline."""
+
+    def __init__(self) -> None:
+        self._buf = bytearray()
+        self._expected = 0
+
+    def feed(self, chunk: bytes):
+        for b in chunk:
+            if not self._buf:
+                if b != a5.A5_MAGIC:
+                    continue
+                self._buf.append(b)
+            else:
+                self._buf.append(b)
+                if len(self._buf) == 5:
+                    self._expected = struct.unpack("<H", bytes(self._buf[3:5]))[0] + 6
+                if self._expected and len(self._buf) == self._expected:
+                    frame = bytes(self._buf)
+                    self._buf = bytearray()
+                    self._expected = 0
+                    yield frame
+
+
+def _notifications(mtu: int) -> list[bytearray]:
+    stream = b"".join(FRAMES)
+    return [bytearray(stream[i : i + mtu]) for i in range(0, len(stream), mtu)]
+
+
+def _run(factory, notifications, method: str = "feed") -> int:
+    reassembler = factory()
+    feed = getattr(reassembler, method)
+    count = 0
+    for chunk in notifications:
+        for _ in feed(chunk):
+            count += 1
+    return count
+
+
+def main() -> None:
+    cases = [
+        ("legacy per-byte", LegacyFrameReassembler, "feed"),
+        ("feed", a5.FrameReassembler, "feed"),
+        ("feed_parsed", a5.FrameReassembler, "feed_parsed"),
+        ("feed (resync)", lambda: a5.FrameReassembler(resync=True), "feed"),
+    ]
+    for label, mtu in (("20-byte notifications", MTU_PAYLOAD), ("whole frames", 0)):
+        notifications = (
+            _notifications(mtu) if mtu else [bytearray(f) for f in FRAMES]
+        )
+        print(f"{label}: {len(FRAMES)} frames in {len(notifications)} notifications")
+        baseline = None
+        for name, factory, method in cases:
+            assert _run(factory, notifications, method) == len(FRAMES)
+            timer = timeit.Timer(lambda: _run(factory, notifications, method))
+            loops, _ = timer.autorange()
+            best = min(timer.repeat(repeat=5, number=loops)) / loops
+            per_frame = best / len(FRAMES) * 1e6
+            baseline = baseline or per_frame
+            print(
+                f"  {name:<16} {per_frame:8.2f} us/frame  "
+                f"({baseline / per_frame:5.1f}x vs legacy)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Micro-benchmark: how long ``generate_dh`` holds the event loop.
+
+``generate_dh`` runs inside ``_start_scale_session``, on the event loop. The
+original drew random candidates and trial-divided each one, so its cost
+varied from call to call; it now picks from a prime table sieved once. This
+reports per-call latency percentiles for both, and the tail of the gaps an
+``asyncio`` ticker sees while a burst of handshakes is set up.
+
+    python benchmarks/bench_generate_dh.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import secrets
+import statistics
+import time
+
+from etekcity_esf551_ble.efsa591s import protocol as a5
+
+CALLS = 20_000
+
+
+def _legacy_is_prime(n: int) -> bool:
+    if n < 2:
+        return False
+    if n % 2 == 0:
+        return n == 2
+    i = 3
+    while i * i <= n:
+        if n % i == 0:
+            return False
+        i += 2
+    return True
+
+
+def _legacy_rand_prime(lo: int, hi: int) -> int:
+    while True:
+        n = secrets.randbelow(hi - lo + 1) + lo
+        if _legacy_is_prime(n):
+            return n
+
+
+def legacy_generate_dh() -> a5.DHParams:
+    d = _legacy_rand_prime(a5.DH_MOD_MIN, a5.DH_MOD_MAX)
+    e = _legacy_rand_prime(a5.DH_BASE_MIN, a5.DH_BASE_MAX)
+    g = secrets.randbelow(a5.DH_EXP_MAX - a5.DH_EXP_MIN + 1) + a5.DH_EXP_MIN
+    return a5.DHParams(d=d, e=e, g=g, f=pow(e, g, d))
+
+
+def _latencies(fn) -> list[float]:
+    out = []
+    for _ in range(CALLS):
+        start = time.perf_counter()
+        fn()
+        out.append((time.perf_counter() - start) * 1e6)
+    return out
+
+
+async def _loop_gap(fn, sessions: int = 5_000) -> float:
+    """99.9th-percentile interval between ticker wake-ups while ``sessions`` run."""
+    gaps: list[float] = []
+    stop = False
+
+    async def ticker() -> None:
+        last = time.perf_counter()
+        while not stop:
+            await asyncio.sleep(0)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    for _ in range(sessions):
+        fn()
+        await asyncio.sleep(0)
+    stop = True
+    await task
+    gaps.sort()
+    return gaps[int(len(gaps) * 0.999)] * 1e6
+
+
+def main() -> None:
+    # Prime tables are sieved lazily; time the one-off cost separately.
+    a5._primes_between.cache_clear()
+    start = time.perf_counter()
+    a5.generate_dh()
+    print(f"first call (sieves tables): {(time.perf_counter() - start) * 1e6:.0f} us")
+
+    for name, fn in (("legacy", legacy_generate_dh), ("prime table", a5.generate_dh)):
+        lat = sorted(_latencies(fn))
+        p50 = statistics.median(lat)
+        p99 = lat[int(len(lat) * 0.99)]
+        p999 = lat[int(len(lat) * 0.999)]
+        gap = asyncio.run(_loop_gap(fn))
+        print(
+            f"{name:<12} p50 {p50:6.1f} us  p99 {p99:6.1f} us  p99.9 {p999:7.1f} us"
+            f"  | loop gap p99.9 {gap:7.1f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Appends and queries on a large ``MeasurementStore``.
+
+Ten years of readings from a household of scales: append throughput, a
+one-week time-range query, a per-address query and body metrics over every
+reading of one address.
+
+    python benchmarks/bench_measurement_store.py
+"""
+
+from __future__ import annotations
+
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from etekcity_esf551_ble import MeasurementStore, ScaleData, Sex
+
+SCALES = 8
+READINGS = 200_000
+START = 1_500_000_000.0
+SPAN = 10 * 365 * 86400
+
+
+def main() -> None:
+    rng = random.Random(0)
+    addresses = [f"D0:4D:00:00:00:{i:02X}" for i in range(SCALES)]
+    step = SPAN / READINGS
+    readings = [
+        ScaleData(
+            address=rng.choice(addresses),
+            weight=round(rng.uniform(50, 110), 2),
+            impedance=rng.randrange(400, 700),
+            received_at=START + i * step,
+        )
+        for i in range(READINGS)
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "history.etkms"
+        store = MeasurementStore(path, compact_every=None)
+        start = time.perf_counter()
+        for reading in readings:
+            store.append(reading, "ESF-551")
+        elapsed = time.perf_counter() - start
+        print(f"append (file)     {elapsed / READINGS * 1e6:7.2f} us/reading")
+        size = path.stat().st_size
+        print(f"file size         {size / READINGS:7.1f} bytes/reading")
+        store.close()
+
+        start = time.perf_counter()
+        store = MeasurementStore(path)
+        print(f"load              {(time.perf_counter() - start) * 1e3:7.1f} ms")
+
+    week_start = START + SPAN / 2
+    for label, kwargs in [
+        ("one week", dict(start=week_start, end=week_start + 7 * 86400)),
+        ("one address", dict(address=addresses[0])),
+        (
+            "week, one address",
+            dict(start=week_start, end=week_start + 7 * 86400, address=addresses[0]),
+        ),
+    ]:
+        start = time.perf_counter()
+        columns = store.query(**kwargs)
+        elapsed = time.perf_counter() - start
+        print(
+            f"query {label:<18} {elapsed * 1e3:7.2f} ms ({len(columns.timestamp)} rows)"
+        )
+
+    try:
+        start = time.perf_counter()
+        metrics = store.body_metrics(1.75, 40, Sex.Female, address=addresses[0])
+        elapsed = time.perf_counter() - start
+        print(
+            f"body metrics       {elapsed * 1e3:7.1f} ms ({len(metrics['timestamp'])} rows)"
+        )
+    except ImportError:
+        print("body metrics       skipped (NumPy not installed)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Memory held per reading: ``ScaleData`` against a dict-backed equivalent.
+
+Keeps a few months of readings in memory, as a trend view would, and reports
+the bytes each one costs (tracemalloc).
+
+    python benchmarks/bench_scale_data_memory.py
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import time
+import tracemalloc
+
+from etekcity_esf551_ble import ScaleData, WeightUnit
+
+READINGS = 100_000
+
+
+@dataclasses.dataclass
+class DictScaleData:
+    """The reading type before typed fields: a plain dataclass with a dict."""
+
+    name: str = ""
+    address: str = ""
+    hw_version: str = ""
+    sw_version: str = ""
+    display_unit: WeightUnit = WeightUnit.KG
+    measurements: dict = dataclasses.field(default_factory=dict)
+    timing: object = None
+
+
+def build(make) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    readings = [make(i) for i in range(READINGS)]
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del readings
+    return used / READINGS
+
+
+def main() -> None:
+    now = time.time()
+    old = build(
+        lambda i: DictScaleData(
+            "Etekcity Fitness Scale",
+            "D0:4D:00:1C:29:62",
+            measurements={"weight": 70 + i / 1e5, "impedance": 500 + i % 50},
+        )
+    )
+    new = build(
+        lambda i: ScaleData(
+            "Etekcity Fitness Scale",
+            "D0:4D:00:1C:29:62",
+            weight=70 + i / 1e5,
+            impedance=500 + i % 50,
+            received_at=now + i,
+        )
+    )
+    print(f"dict-backed  {old:6.0f} bytes/reading")
+    print(f"ScaleData    {new:6.0f} bytes/reading ({old / new:.1f}x smaller)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Micro-benchmark: per-frame A5 result decryption.
+
+Compares building a fresh AES-CBC cipher for every frame (the one-off
+``decrypt_frame_payload`` path) with the session's ``SessionCipher``, which
+expands the key once at key establishment.
+
+    python benchmarks/bench_session_cipher.py
+"""
+
+from __future__ import annotations
+
+import os
+import timeit
+
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
+from etekcity_esf551_ble.efsa591s import protocol as a5
+
+KEY = os.urandom(16)
+IV = os.urandom(16)
+
+
+def _per_frame_cipher(parsed: a5.ParsedFrame) -> bytes:
+    ct = parsed.payload[: len(parsed.payload) // 16 * 16]
+    dec = Cipher(algorithms.AES(KEY), modes.CBC(IV)).decryptor()
+    return a5._pkcs7_unpad(dec.update(ct) + dec.finalize())
+
+
+def main() -> None:
+    # A 38-byte result body pads to three AES blocks, like a real 0x443a frame.
+    body = a5._pkcs7_pad(bytes(38))
+    payload = a5.SessionCipher(KEY, IV).encrypt(body)
+    parsed = a5.parse_frame(a5.build_frame(1, a5.OPCODE_RESULT, payload, 1))
+    session = a5.SessionCipher(KEY, IV)
+    assert session.decrypt_payload(parsed) == _per_frame_cipher(parsed)
+
+    cases = [
+        ("cipher per frame", lambda: _per_frame_cipher(parsed)),
+        ("session cipher", lambda: session.decrypt_payload(parsed)),
+    ]
+    baseline = None
+    for name, fn in cases:
+        timer = timeit.Timer(fn)
+        loops, _ = timer.autorange()
+        per_frame = min(timer.repeat(repeat=5, number=loops)) / loops * 1e6
+        baseline = baseline or per_frame
+        print(f"{name:<18} {per_frame:6.2f} us/frame ({baseline / per_frame:4.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
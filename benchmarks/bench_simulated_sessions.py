@@ -0,0 +1,93 @@
+"""End-to-end benchmark: full weigh-in sessions against simulated scales.
+
+Runs one advertisement -> connect -> handshake -> measurement cycle for a
+mixed fleet of virtual scales (ESF-551, ESF-24, EFS-A591S, EFS-C651) on one
+event loop and reports the advertisement-to-callback latency per model.
+
+    python benchmarks/bench_simulated_sessions.py [scales] [latency_ms]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import statistics
+import sys
+import time
+
+from etekcity_esf551_ble import (
+    EFSA591SScale,
+    EFSC651Scale,
+    ESF24Scale,
+    ESF551Scale,
+    LinkConditions,
+    ScaleHub,
+    ScaleSimulator,
+)
+from etekcity_esf551_ble.simulator import (
+    SimulatedEFSA591S,
+    SimulatedEFSC651,
+    SimulatedESF24,
+    SimulatedESF551,
+)
+
+FLEET = [
+    (SimulatedESF551, ESF551Scale),
+    (SimulatedESF24, ESF24Scale),
+    (SimulatedEFSA591S, EFSA591SScale),
+    (SimulatedEFSC651, EFSC651Scale),
+]
+
+
+async def run(count: int, latency: float) -> None:
+    sim = ScaleSimulator(LinkConditions(latency=latency, jitter=latency / 2), seed=0)
+    # One shared scanner, as a gateway would run: per-client scanners would
+    # deliver every advertisement to every client.
+    hub = ScaleHub(bleak_scanner_backend=sim.scanner())
+    await hub.async_start()
+    latencies: dict[str, list[float]] = {}
+    pending = count
+    done = asyncio.Event()
+    start = 0.0
+
+    def callback(data) -> None:
+        nonlocal pending
+        model = sim.scales[data.address].model
+        latencies.setdefault(model, []).append(time.perf_counter() - start)
+        pending -= 1
+        if not pending:
+            done.set()
+
+    for i in range(count):
+        sim_cls, client_cls = FLEET[i % len(FLEET)]
+        address = f"C0:00:00:00:{i >> 8:02X}:{i & 0xFF:02X}"
+        sim.add(sim_cls(address, frame_interval=latency))
+        client = client_cls(address, callback, hub=hub, client_factory=sim.connect)
+        await client.async_start()
+
+    start = time.perf_counter()
+    await sim.advertise()
+    try:
+        await asyncio.wait_for(done.wait(), 60)
+    except asyncio.TimeoutError:
+        print(f"{pending} of {count} sessions did not complete")
+    wall = time.perf_counter() - start
+
+    print(f"{count} sessions, {latency * 1e3:.0f} ms link latency: {wall:.2f} s wall")
+    for model, values in sorted(latencies.items()):
+        values.sort()
+        p99 = values[min(len(values) - 1, int(len(values) * 0.99))]
+        print(
+            f"  {model:<10} n={len(values):<4} "
+            f"median {statistics.median(values) * 1e3:7.1f} ms  "
+            f"p99 {p99 * 1e3:7.1f} ms"
+        )
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    latency = float(sys.argv[2]) / 1e3 if len(sys.argv) > 2 else 10.0 / 1e3
+    asyncio.run(run(count, latency))
+
+
+if __name__ == "__main__":
+    main()
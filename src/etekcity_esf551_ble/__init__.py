@@ -1,3 +1,18 @@
+"""
+Etekcity smart fitness scales over BLE.
+
+Only the BLE-free parts — body metrics, detection, data types, constants —
+are imported with the package. The scale clients and everything else that
+needs ``bleak``, ``bleak_retry_connector`` or ``cryptography`` load on first
+attribute access (PEP 562), so ``from etekcity_esf551_ble import
+BodyMetrics`` stays cheap for processes that never talk to a scale.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
 from ._version import __version__, __version_info__
 from .body_metrics import BaseBodyMetrics, BodyMetrics, BodyMetricsV2, Sex, calc_age
 from .const import (
@@ -16,36 +31,114 @@ from .detection import (
     CAPABILITIES,
     ETEKCITY_MANUFACTURER_ID,
     QN_MANUFACTURER_ID,
+    BulkDetectionReport,
+    DetectionCache,
     ScaleCapabilities,
     ScaleModel,
+    advertisement_filter_patterns,
     detect_model,
+    detect_models_bulk,
     is_etekcity_frame,
     parse_model_code,
+    register_fallback_matcher,
 )
-from .efsa591s import EFSA591SScale
-from .efsc651 import EFSC651Scale
-from .esf24 import ESF24Scale
-from .esf551 import ESF551Scale
-from .fit8s import FIT8SScale
-from .scale import (
-    AdvertisementScale,
-    EtekcitySmartFitnessScale,
-    GattScale,
-    ScaleSessionError,
-)
 
-# Model -> concrete client class. detection.py stays import-light (no client
-# imports), so this map lives here where the classes are already imported.
-SCALE_CLASSES: dict[ScaleModel, type[EtekcitySmartFitnessScale]] = {
-    ScaleModel.ESF551: ESF551Scale,
-    ScaleModel.ESF24: ESF24Scale,
-    ScaleModel.FIT8S: FIT8SScale,
-    ScaleModel.EFSA591S: EFSA591SScale,
-    ScaleModel.EFSC651: EFSC651Scale,
-    ScaleModel.ESF17: ESF24Scale,
-    ScaleModel.ESF18: ESF24Scale,
+if TYPE_CHECKING:
+    from .admission import AdmissionController, AdmissionDropped
+    from .capture import CaptureRecorder, CaptureReplayer, read_capture
+    from .cooldown import AdaptiveCooldown, CooldownStats
+    from .efsa591s import EFSA591SScale, FileKeyStore, KeyStore, MemoryKeyStore
+    from .efsc651 import EFSC651Scale
+    from .esf24 import ESF24Scale
+    from .esf551 import ESF551Scale
+    from .fit8s import FIT8SScale
+    from .hub import ScaleHub
+    from .scale import (
+        AdvertisementScale,
+        EtekcitySmartFitnessScale,
+        GattScale,
+        ScaleSessionError,
+    )
+    from .scanning import HybridScanner
+    from .scheduler import AdapterStats, ConnectionPriority, ConnectionScheduler
+    from .service_cache import ServiceCache, ServiceCacheStats
+    from .simulator import LinkConditions, ScaleSimulator
+    from .store import MeasurementColumns, MeasurementStore
+    from .stream import MeasurementStream, OverflowPolicy
+    from .timing import LatencyHistogram, LatencyMonitor, SessionPhase, SessionTiming
+
+    SCALE_CLASSES: dict[ScaleModel, type[EtekcitySmartFitnessScale]]
+
+# Attribute -> submodule it is loaded from on first access.
+_LAZY_ATTRIBUTES = {
+    "AdmissionController": ".admission",
+    "AdmissionDropped": ".admission",
+    "CaptureRecorder": ".capture",
+    "CaptureReplayer": ".capture",
+    "read_capture": ".capture",
+    "AdaptiveCooldown": ".cooldown",
+    "CooldownStats": ".cooldown",
+    "EFSA591SScale": ".efsa591s",
+    "FileKeyStore": ".efsa591s",
+    "KeyStore": ".efsa591s",
+    "MemoryKeyStore": ".efsa591s",
+    "EFSC651Scale": ".efsc651",
+    "ESF24Scale": ".esf24",
+    "ESF551Scale": ".esf551",
+    "FIT8SScale": ".fit8s",
+    "ScaleHub": ".hub",
+    "AdvertisementScale": ".scale",
+    "EtekcitySmartFitnessScale": ".scale",
+    "GattScale": ".scale",
+    "ScaleSessionError": ".scale",
+    "HybridScanner": ".scanning",
+    "AdapterStats": ".scheduler",
+    "ConnectionPriority": ".scheduler",
+    "ConnectionScheduler": ".scheduler",
+    "ServiceCache": ".service_cache",
+    "ServiceCacheStats": ".service_cache",
+    "LinkConditions": ".simulator",
+    "ScaleSimulator": ".simulator",
+    "MeasurementColumns": ".store",
+    "MeasurementStore": ".store",
+    "MeasurementStream": ".stream",
+    "OverflowPolicy": ".stream",
+    "LatencyHistogram": ".timing",
+    "LatencyMonitor": ".timing",
+    "SessionPhase": ".timing",
+    "SessionTiming": ".timing",
 }
 
+
+def _scale_classes() -> dict[ScaleModel, type[EtekcitySmartFitnessScale]]:
+    # Model -> concrete client class. detection.py stays import-light (no
+    # client imports), so this map lives here and is built on first use.
+    return {
+        ScaleModel.ESF551: __getattr__("ESF551Scale"),
+        ScaleModel.ESF24: __getattr__("ESF24Scale"),
+        ScaleModel.FIT8S: __getattr__("FIT8SScale"),
+        ScaleModel.EFSA591S: __getattr__("EFSA591SScale"),
+        ScaleModel.EFSC651: __getattr__("EFSC651Scale"),
+        ScaleModel.ESF17: __getattr__("ESF24Scale"),
+        ScaleModel.ESF18: __getattr__("ESF24Scale"),
+    }
+
+
+def __getattr__(name: str) -> Any:
+    if name == "SCALE_CLASSES":
+        value = _scale_classes()
+    elif (module := _LAZY_ATTRIBUTES.get(name)) is not None:
+        value = getattr(importlib.import_module(module, __name__), name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
+
+
 __all__ = [
     "__version__",
     "__version_info__",
@@ -60,6 +153,33 @@ __all__ = [
     "WeightUnit",
     "ScaleData",
     "ScaleSessionError",
+    "ScaleHub",
+    "HybridScanner",
+    "ConnectionScheduler",
+    "ConnectionPriority",
+    "AdapterStats",
+    "AdmissionController",
+    "AdmissionDropped",
+    "ServiceCache",
+    "ServiceCacheStats",
+    "MeasurementColumns",
+    "MeasurementStore",
+    "MeasurementStream",
+    "OverflowPolicy",
+    "CaptureRecorder",
+    "CaptureReplayer",
+    "read_capture",
+    "ScaleSimulator",
+    "LinkConditions",
+    "AdaptiveCooldown",
+    "CooldownStats",
+    "LatencyMonitor",
+    "LatencyHistogram",
+    "SessionPhase",
+    "SessionTiming",
+    "KeyStore",
+    "FileKeyStore",
+    "MemoryKeyStore",
     "HEART_RATE_KEY",
     "IMPEDANCE_500KHZ_KEY",
     "IMPEDANCE_KEY",
@@ -78,6 +198,11 @@ __all__ = [
     "ScaleCapabilities",
     "ScaleModel",
     "detect_model",
+    "detect_models_bulk",
+    "BulkDetectionReport",
+    "DetectionCache",
     "is_etekcity_frame",
     "parse_model_code",
+    "register_fallback_matcher",
+    "advertisement_filter_patterns",
 ]
@@ -0,0 +1,332 @@
+"""Vectorized body-composition metrics over NumPy arrays.
+
+Backs :meth:`BodyMetrics.batch <.body_metrics.BodyMetrics.batch>` and
+:meth:`BodyMetricsV2.batch <.body_metrics.BodyMetricsV2.batch>`. Every
+formula mirrors its scalar counterpart in :mod:`.body_metrics` operation for
+operation — same constants, same evaluation order, same truncation, clamping
+and rounding — so each column equals what the scalar class returns for that
+row, bit for bit. Keep the two in step when either changes.
+
+Requires NumPy (the ``batch`` extra); :mod:`.body_metrics` only imports this
+module when a batch is actually requested.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+# Upper bounds of the health-score bands in BodyMetrics.metabolic_age; a
+# score's band index is the age adjustment it earns.
+_METABOLIC_AGE_THRESHOLDS = np.array(
+    [50, 60, 65, 68, 70, 73, 75, 80, 85, 88, 90, 93, 95, 97, 98, 99]
+)
+
+# Distance from a rounding tie below which np.rint on the scaled float might
+# disagree with Python's round(), which rounds the exact binary value.
+_TIE_TOLERANCE = 1e-6
+
+
+def _round(values: np.ndarray, ndigits: int) -> np.ndarray:
+    """Elementwise ``round(value, ndigits)`` with Python's exact semantics.
+
+    ``np.round`` scales, rounds half-to-even and scales back, which differs
+    from Python's correctly-rounded ``round`` only when the scaled value lands
+    on (or within float error of) a tie. Those rare elements are recomputed
+    with ``round`` itself.
+    """
+    factor = 10.0**ndigits
+    scaled = values * factor
+    result = np.rint(scaled) / factor
+    fraction = np.abs(scaled - np.trunc(scaled))
+    if (near_tie := np.abs(fraction - 0.5) < _TIE_TOLERANCE).any():
+        for index in zip(*np.nonzero(near_tie)):
+            result[index] = round(float(values[index]), ndigits)
+    return result
+
+
+def _trunc(values: np.ndarray) -> np.ndarray:
+    """Elementwise ``int(value)`` (truncation toward zero), as int64."""
+    return np.trunc(values).astype(np.int64)
+
+
+def _by_sex(male: np.ndarray, for_male, for_female) -> np.ndarray:
+    """Per-row pick of a sex-indexed constant (``factor[self.sex]``)."""
+    return np.where(male, for_male, for_female)
+
+
+def _inputs(weights, heights, ages, sexes, impedances, athlete):
+    weight, height, age, sex, impedance, athlete = np.broadcast_arrays(
+        np.asarray(weights, dtype=np.float64),
+        np.asarray(heights, dtype=np.float64),
+        np.asarray(ages, dtype=np.int64),
+        np.asarray(sexes, dtype=np.int64),
+        np.asarray(impedances),
+        np.asarray(athlete, dtype=bool),
+    )
+    return weight, height, age, sex == 0, impedance, athlete
+
+
+def body_metrics(
+    weights, heights, ages, sexes, impedances, athlete=False
+) -> dict[str, np.ndarray]:
+    """Columnar :class:`~.body_metrics.BodyMetrics` for every row."""
+    weight, height, age, male, impedance, athlete = _inputs(
+        weights, heights, ages, sexes, impedances, athlete
+    )
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        bmi = np.floor(weight / (height**2) * 100) / 100
+
+        bfp = (
+            _by_sex(male, 0.103, 0.097) * age
+            + _by_sex(male, 1.524, 1.545) * bmi
+            - 500 / impedance
+            - _by_sex(male, 22, 12.7)
+        )
+        bfp = np.where(
+            athlete,
+            bfp / _by_sex(male, 3.5, 3.0) + bmi / _by_sex(male, 3.0, 2.4),
+            bfp,
+        )
+        bfp = np.clip(np.floor(bfp * 10) / 10, 5, 75)
+
+        ffw = _round(weight * (1 - bfp / 100), 2)
+
+        vfv = np.clip(
+            _trunc(
+                _by_sex(male, 0.8666, 0.8895) * bmi
+                + _by_sex(male, 0.0082, 0.0943) * bfp
+                + _by_sex(male, 0.026, -0.0534) * (weight - ffw)
+                - _by_sex(male, 14.2692, 16.215)
+            ),
+            1,
+            30,
+        )
+
+        subcut = _round(
+            _by_sex(male, 0.965, 0.983) * bfp - _by_sex(male, 0.22, 0.303) * vfv, 1
+        )
+
+        ff1 = np.maximum(1, _by_sex(male, 0.05, 0.06) * ffw)
+        bwp = np.clip(
+            _round(_by_sex(male, 0.76, 0.73) * (ffw - ff1) / weight * 100, 1), 10, 80
+        )
+        bmr = np.clip(_trunc(ffw * 21.6 + 370), 900, 2500)
+        smp = _round(_by_sex(male, 0.68, 0.62) * (ffw - ff1) / weight * 100, 1)
+        muscle = _round(ffw - ff1, 2)
+        bone = np.maximum(1, _round(_by_sex(male, 0.05, 0.06) * ffw, 2))
+        protein = np.maximum(
+            5,
+            _round(
+                100 - _by_sex(male, 1, 1.05) * bfp - bone / weight * 100 - bwp,
+                1,
+            ),
+        )
+
+        # weight_score: above / around / well below the ideal weight.
+        ideal = _by_sex(male, 0.7, 0.45) * (
+            _by_sex(male, 100, 137) * height - _by_sex(male, 80, 110)
+        )
+        below = np.zeros_like(age)
+        found = np.zeros_like(male)
+        for x in range(6):
+            hit = ~found & (ideal * x / 10 > weight)
+            below = np.where(hit, x * 10, below)
+            found |= hit
+        weight_score = np.where(
+            ideal <= weight,
+            np.where(
+                ideal * 1.3 < weight,
+                50,
+                _trunc(100 - 50 * (weight - ideal) / (0.3 * ideal)),
+            ),
+            np.where(
+                ideal * 0.7 < weight,
+                _trunc(100 - 50 * (ideal - weight) / (0.3 * ideal)),
+                below,
+            ),
+        )
+
+        fat_ideal = _by_sex(male, 16, 26)
+        fat_score = np.where(
+            fat_ideal < bfp,
+            np.where(
+                bfp >= 45,
+                50,
+                _trunc(100 - 50 * (bfp - fat_ideal) / (45 - fat_ideal)),
+            ),
+            _trunc(100 - 50 * (fat_ideal - bfp) / (fat_ideal - 5)),
+        )
+
+        bmi_score = np.select(
+            [bmi >= 35, bmi >= 22, bmi >= 15, bmi >= 10, bmi >= 5],
+            [
+                50,
+                _trunc(100 - 3.85 * (bmi - 22)),
+                _trunc(100 - 3.85 * (22 - bmi)),
+                40,
+                30,
+            ],
+            20,
+        )
+
+    health = (weight_score + fat_score + bmi_score) // 3
+    adjustment = np.searchsorted(_METABOLIC_AGE_THRESHOLDS, health, side="right")
+    metabolic_age = np.maximum(18, age + 8 - adjustment)
+
+    return {
+        "basal_metabolic_rate": bmr,
+        "bmi_score": bmi_score,
+        "body_fat_percentage": bfp,
+        "body_mass_index": bmi,
+        "body_water_percentage": bwp,
+        "bone_mass": bone,
+        "fat_free_weight": ffw,
+        "fat_score": fat_score,
+        "health_score": health,
+        "metabolic_age": metabolic_age,
+        "muscle_mass": muscle,
+        "protein_percentage": protein,
+        "skeletal_muscle_percentage": smp,
+        "subcutaneous_fat_percentage": subcut,
+        "visceral_fat_value": vfv,
+        "weight_score": weight_score,
+    }
+
+
+def _func1(values: np.ndarray, factor) -> np.ndarray:
+    """Vectorized :func:`.body_metrics._func1`."""
+    return _trunc(values * factor + 0.5)
+
+
+def body_metrics_v2(
+    weights, heights, ages, sexes, impedances, athlete=False
+) -> dict[str, np.ndarray]:
+    """Columnar :class:`~.body_metrics.BodyMetricsV2` for every row."""
+    weight, height, age, male, z, athlete = _inputs(
+        weights, heights, ages, sexes, impedances, athlete
+    )
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        w = _trunc(weight * 10)
+        h = np.rint(height * 100).astype(np.int64)
+        weight_kg = w / 10
+
+        # --- lean body mass, and body fat as the remainder ---
+        lbm_raw = (
+            12.226 + 9.058 * (h / 100.0) ** 2 + 0.032 * w - 0.0068 * z - 0.0542 * age
+        )
+        lbm = lbm_raw - np.where(male, 0.8, np.where(age < 50, 9.25, 7.25))
+        # Male: applied twice, deliberately.
+        lbm = np.where(male & (w < 610), lbm * 0.98, lbm)
+        lbm = np.where(male & (w < 610), lbm * 0.98, lbm)
+        lbm = np.where(~male & (w < 500), lbm * 1.02, lbm)
+        lbm = np.where(~male & (w > 600), lbm * 0.96, lbm)
+        lbm = np.where(~male & (h > 160), lbm * 1.03, lbm)
+
+        fat_mass = weight_kg - lbm
+        fat_mass = np.where(
+            athlete,
+            np.where(male, 0.778 * fat_mass - 0.93, 0.992 * fat_mass - 1.5),
+            fat_mass,
+        )
+        fat_rate = np.clip(_trunc(fat_mass * 10000 / w), 50, 750)
+
+        bmi = np.rint(weight_kg / ((h / 100.0) ** 2) * 10).astype(np.int64)
+        fat_kg = fat_rate * w // 1000
+        ffm = w - fat_kg
+
+        # --- bone, and muscle as what is left of fat-free mass ---
+        bone = _trunc(0.5158 * lbm_raw - np.where(male, 1.802, 2.4569))
+        bone = np.where(bone > 22, bone + 1, bone - 1)
+        bone = np.where(
+            athlete, bone + np.where(bone < 20, 1, np.where(bone < 30, 2, 3)), bone
+        )
+
+        muscle = ffm - bone
+        muscle_rate = muscle * 1000 // w
+
+        # --- water, and skeletal muscle and protein derived from it ---
+        water_rate = (1000 - fat_rate) * 7 // 10
+        water_rate = _func1(water_rate, np.where(water_rate > 500, 0.98, 1.02))
+        water_rate = np.where(
+            athlete,
+            _func1(water_rate, np.where(male, 0.996, 0.985)) + 4,
+            water_rate,
+        )
+        water_rate = np.maximum(350, water_rate)
+
+        water_kg = water_rate * w // 1000
+        skeletal_kg = _trunc(0.832 * water_kg - 27.354)
+        protein_rate = np.clip(
+            _trunc(_func1(water_kg, 0.275) - 1.36) * 1000 // w, 20, 300
+        )
+
+        # --- basal metabolic rate ---
+        bmr = np.where(
+            male,
+            _func1(w, 1.4916) + 878 - _func1(h, 0.726) - _func1(age, 8.976),
+            _func1(w, 1.0204) + 865 - _func1(h, 0.3934) - _func1(age, 6.204),
+        )
+        bmr = np.where(athlete, _trunc(1.16 * bmr - 149), bmr)
+        bmr = np.maximum(500, bmr)
+
+        # --- body age, blended from two BMI-driven estimates ---
+        a1 = np.clip(_trunc(age + 28.428 - 0.1428 * bmi), age - 5, age + 5)
+        a2 = np.clip(_trunc(age + 0.1724 * bmi - 34.931), age - 8, age + 8)
+        body_age = np.clip(_trunc(0.4 * a1 + 0.6 * a2), 6, 99)
+
+        # --- visceral fat, on a different curve above and below a
+        # --- height-for-weight threshold
+        vfal = np.where(
+            male,
+            np.where(
+                h >= 0.16 * w + 63,
+                (-0.0015 * h + 0.765) * w / 10 - 0.143 * h + 0.15 * age - 5,
+                30.5 * w / (0.0826 * h**2 - 0.4 * h + 48) - 2.9 + 0.15 * age,
+            ),
+            np.where(
+                w <= 5 * h - 130,
+                (-0.0024 * h + 0.691) * w / 10 - 0.027 * h + 0.07 * age - 10.5,
+                50 * w / (0.1158 * h**2 + 1.45 * h - 120) - 6 + 0.07 * age,
+            ),
+        )
+        vfal = np.where(
+            athlete,
+            np.select(
+                [vfal < 2, vfal < 10, vfal < 20],
+                [1.0, vfal - 2, vfal * 0.8],
+                vfal * 0.85,
+            ),
+            vfal,
+        )
+        vfal = np.clip(_trunc(vfal), 1, 50)
+
+        # --- subcutaneous fat ---
+        subcut_index = np.clip(
+            _trunc(0.031 * z + 0.94 * bmi + 1.049 * age - 210.772), 10, 300
+        )
+        subcut_kg = fat_kg - 9.4 * subcut_index / 34
+        subcut_kg = np.where(athlete, subcut_kg * 0.85, subcut_kg)
+        subcut_rate = np.clip(_trunc(1000 * subcut_kg / w), 10, 600)
+
+        skeletal_muscle_mass = skeletal_kg / 10
+        skeletal_muscle_percentage = _round(skeletal_muscle_mass / weight * 100, 1)
+
+    return {
+        "basal_metabolic_rate": bmr,
+        "body_fat_mass": fat_kg / 10,
+        "body_fat_percentage": fat_rate / 10,
+        "body_mass_index": bmi / 10,
+        "body_water_percentage": water_rate / 10,
+        "bone_mass": bone / 10,
+        "fat_free_weight": ffm / 10,
+        "metabolic_age": body_age,
+        "muscle_mass": muscle / 10,
+        "muscle_percentage": muscle_rate / 10,
+        "protein_percentage": protein_rate / 10,
+        "skeletal_muscle_mass": skeletal_muscle_mass,
+        "skeletal_muscle_percentage": skeletal_muscle_percentage,
+        "subcutaneous_fat_percentage": subcut_rate / 10,
+        "visceral_fat_value": vfal,
+    }
@@ -0,0 +1,134 @@
+"""
+Admission control for GATT connection attempts.
+
+When many scales wake at once, every client would start connecting on the
+same advertisement burst, and BlueZ serializes (or fails) the pile-up. An
+:class:`AdmissionController` shared by the clients lets at most
+``max_concurrent`` attempts run at a time. The others wait in a queue,
+ordered by :class:`~.scheduler.ConnectionPriority` and then by deadline::
+
+    admission = AdmissionController(max_concurrent=2, max_advertisement_age=8.0)
+    scale = ESF551Scale(address, callback, hub=hub, admission=admission)
+    ...
+    print(admission.admitted, admission.dropped, admission.wait_times.quantile(0.9))
+
+A waiting attempt's deadline is its advertisement's time plus
+``max_advertisement_age``. A scale only accepts connections for a short
+while after advertising, so an attempt still queued past its deadline is
+dropped, not started. The client doesn't arm its cooldown for it, so the
+scale's next advertisement queues a fresh attempt.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import heapq
+import itertools
+import logging
+import time
+from collections.abc import AsyncIterator
+
+from .scheduler import ConnectionPriority
+from .timing import LatencyHistogram
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class AdmissionDropped(Exception):
+    """A queued connection attempt outlived its advertisement's deadline."""
+
+
+class AdmissionController:
+    """
+    Global limit on concurrent connection attempts, with a deadline queue.
+
+    ``wait_times`` holds the queue wait, in seconds, of every admitted
+    attempt. ``admitted`` and ``dropped`` count outcomes. ``active`` and
+    ``waiting`` are the current load.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 1,
+        *,
+        max_advertisement_age: float = 10.0,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be >= 1")
+        self._max = max_concurrent
+        self._max_age = max_advertisement_age
+        self._logger = logger or _LOGGER
+        # (-priority, deadline, sequence, future)
+        self._queue: list[tuple[int, float, int, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+        self.active = 0
+        self.admitted = 0
+        self.dropped = 0
+        self.wait_times = LatencyHistogram()
+
+    @property
+    def waiting(self) -> int:
+        """Attempts queued for admission."""
+        return sum(not entry[3].done() for entry in self._queue)
+
+    @contextlib.asynccontextmanager
+    async def admit(
+        self,
+        priority: ConnectionPriority = ConnectionPriority.NORMAL,
+        advertised_at: float | None = None,
+    ) -> AsyncIterator[None]:
+        """
+        Hold one attempt slot for the duration of the ``async with`` block.
+
+        ``advertised_at`` is the :func:`time.monotonic` time of the
+        advertisement that prompted the attempt (default: now). Raises
+        :class:`AdmissionDropped` once the attempt has waited past
+        ``advertised_at + max_advertisement_age``.
+        """
+        queued_at = time.monotonic()
+        if advertised_at is None:
+            advertised_at = queued_at
+        deadline = advertised_at + self._max_age
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (-priority, deadline, next(self._sequence), future))
+        self._dispatch()
+        try:
+            await asyncio.wait_for(future, max(deadline - time.monotonic(), 0.0))
+        except TimeoutError:
+            self._forget(future)
+            self.dropped += 1
+            self._logger.debug(
+                "Dropped connection attempt after %.1fs in the admission queue",
+                time.monotonic() - queued_at,
+            )
+            raise AdmissionDropped(
+                f"advertisement older than {self._max_age}s before admission"
+            ) from None
+        except asyncio.CancelledError:
+            self._forget(future)
+            raise
+        self.admitted += 1
+        self.wait_times.add(time.monotonic() - queued_at)
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self._dispatch()
+
+    def _forget(self, future: asyncio.Future[None]) -> None:
+        """Remove a waiter that gave up; return its slot if it was granted."""
+        if future.done() and not future.cancelled():
+            self.active -= 1
+        self._queue = [entry for entry in self._queue if entry[3] is not future]
+        heapq.heapify(self._queue)
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        while self._queue and self.active < self._max:
+            future = heapq.heappop(self._queue)[3]
+            if future.done():
+                continue
+            self.active += 1
+            future.set_result(None)
@@ -0,0 +1,149 @@
+"""
+Classify exported advertisement captures offline.
+
+Reads raw advertisements from JSONL or CSV, one per line, streaming (files of
+millions of rows are never loaded whole), and runs them through
+:func:`~.detection.detect_models_bulk`::
+
+    python -m etekcity_esf551_ble.audit adverts.jsonl
+    etekcity-scale-audit --json adverts.csv > report.json
+
+JSONL rows are objects with ``address``, ``local_name`` (may be null) and
+``manufacturer_data``, an object mapping the decimal company ID to the hex
+payload (company ID already stripped, as bleak reports it)::
+
+    {"address": "D0:4D:00:1C:29:62", "local_name": "Etekcity Fitness Scale",
+     "manufacturer_data": {"1744": "0162291c004dd00002"}}
+
+CSV files have a header row with ``address``, ``local_name`` and
+``manufacturer_data`` columns, the last holding space-separated
+``company:hex`` pairs (``1744:0162291c004dd00002``). Empty cells are None.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import sys
+from collections.abc import Iterable, Iterator
+from typing import TextIO
+
+from .detection import BulkDetectionReport, ScaleModel, detect_models_bulk
+
+Advertisement = tuple[str | None, str | None, dict[int, bytes]]
+
+FORMATS = ("jsonl", "csv")
+
+
+def _manufacturer_data(items: Iterable[tuple[str, str]]) -> dict[int, bytes]:
+    return {int(company): bytes.fromhex(payload) for company, payload in items}
+
+
+def read_jsonl(lines: Iterable[str]) -> Iterator[Advertisement]:
+    """Parse JSONL capture rows; blank lines are skipped."""
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+            yield (
+                row.get("address") or None,
+                row.get("local_name") or None,
+                _manufacturer_data((row.get("manufacturer_data") or {}).items()),
+            )
+        except (ValueError, AttributeError, TypeError) as err:
+            raise ValueError(f"line {number}: {err}") from err
+
+
+def read_csv(lines: Iterable[str]) -> Iterator[Advertisement]:
+    """Parse CSV capture rows (header row required)."""
+    reader = csv.DictReader(lines)
+    for row in reader:
+        try:
+            pairs = (
+                field.split(":", 1)
+                for field in (row["manufacturer_data"] or "").split()
+            )
+            yield (
+                row["address"] or None,
+                row["local_name"] or None,
+                _manufacturer_data(pairs),
+            )
+        except (KeyError, ValueError) as err:
+            raise ValueError(f"line {reader.line_num}: {err!r}") from err
+
+
+def read_captures(stream: TextIO, fmt: str) -> Iterator[Advertisement]:
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown capture format {fmt!r}")
+    return read_jsonl(stream) if fmt == "jsonl" else read_csv(stream)
+
+
+def _guess_format(path: str) -> str:
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def format_report(report: BulkDetectionReport) -> str:
+    lines = [f"{report.total} advertisements"]
+    for model in ScaleModel:
+        if report.counts[model]:
+            lines.append(f"  {model.value:<12} {report.counts[model]}")
+    lines.append(f"  {'not a scale':<12} {report.unrecognized}")
+    if report.unregistered:
+        lines.append("Unregistered identifiers (company, code):")
+        lines.extend(
+            f"  {company}, {code} (0x{code:04X})"
+            for company, code in sorted(report.unregistered)
+        )
+    return "\n".join(lines)
+
+
+def report_as_dict(report: BulkDetectionReport) -> dict:
+    return {
+        "total": report.total,
+        "counts": {m.value: report.counts[m] for m in ScaleModel if report.counts[m]},
+        "unrecognized": report.unrecognized,
+        "unregistered": [list(pair) for pair in sorted(report.unregistered)],
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="etekcity-scale-audit",
+        description="Count Etekcity scales and unregistered model identifiers"
+        " in exported advertisement captures.",
+    )
+    parser.add_argument("files", nargs="+", help="capture files ('-' for stdin)")
+    parser.add_argument(
+        "--format",
+        choices=FORMATS,
+        help="capture format (default: from the file extension, else jsonl)",
+    )
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = BulkDetectionReport()
+    for path in args.files:
+        fmt = args.format or _guess_format(path)
+        try:
+            if path == "-":
+                rows = read_captures(sys.stdin, fmt)
+                for _ in detect_models_bulk(rows, report):
+                    pass
+            else:
+                with open(path, newline="", encoding="utf-8") as stream:
+                    for _ in detect_models_bulk(read_captures(stream, fmt), report):
+                        pass
+        except (OSError, ValueError) as err:
+            parser.exit(1, f"{parser.prog}: {path}: {err}\n")
+
+    if args.json:
+        print(json.dumps(report_as_dict(report), indent=2))
+    else:
+        print(format_report(report))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -19,6 +19,8 @@ from datetime import date
 from enum import IntEnum
 from functools import cached_property
 from math import floor
+from types import ModuleType
+from typing import Any
 
 
 class Sex(IntEnum):
@@ -26,6 +28,18 @@ class Sex(IntEnum):
     Female = 1
 
 
+def _batch_module() -> ModuleType:
+    """Import the NumPy-backed batch engine, which is an optional extra."""
+    try:
+        from . import _batch_metrics
+    except ImportError as ex:
+        raise ImportError(
+            "Batch body metrics require NumPy; install it with "
+            "`pip install etekcity_esf551_ble[batch]`"
+        ) from ex
+    return _batch_metrics
+
+
 class BaseBodyMetrics(abc.ABC):
     """Metrics every body-composition implementation provides.
 
@@ -35,6 +49,10 @@ class BaseBodyMetrics(abc.ABC):
     their docstrings.
     """
 
+    # Function of the batch engine (``_batch_metrics``) that reproduces this
+    # class's algorithm over arrays.
+    _batch_engine: str
+
     def __init__(
         self,
         weight_kg: float,
@@ -126,6 +144,33 @@ class BaseBodyMetrics(abc.ABC):
     def metabolic_age(self) -> int:
         """Estimate of the body's metabolic age, in years."""
 
+    @classmethod
+    def batch(
+        cls,
+        weights: Any,
+        heights: Any,
+        ages: Any,
+        sexes: Any,
+        impedances: Any,
+        athlete: Any = False,
+    ) -> dict[str, Any]:
+        """
+        Calculate every metric for many measurements at once.
+
+        Each argument is an array-like (or a scalar, broadcast against the
+        others) holding one value per measurement, in the units the
+        constructor takes. The result is columnar: a NumPy array per metric,
+        keyed like :meth:`as_dict`, whose values equal the scalar class's for
+        the same inputs exactly — truncation, clamping and rounding included.
+
+        Requires NumPy (``pip install etekcity_esf551_ble[batch]``).
+
+        Returns:
+            dict: Metric name -> array with one entry per measurement.
+        """
+        engine = getattr(_batch_module(), cls._batch_engine)
+        return engine(weights, heights, ages, sexes, impedances, athlete)
+
     def as_dict(self) -> dict[str, int | float]:
         """Return every calculated metric, keyed by its property name.
 
@@ -155,6 +200,8 @@ class BodyMetrics(BaseBodyMetrics):
     (see BodyMetricsV2).
     """
 
+    _batch_engine = "body_metrics"
+
     @cached_property
     def body_mass_index(self) -> float:
         """
@@ -498,6 +545,8 @@ class BodyMetricsV2(BaseBodyMetrics):
     Closely matches the algorithm the VeSync app pairs with the EFS-C651.
     """
 
+    _batch_engine = "body_metrics_v2"
+
     @cached_property
     def _raw(self) -> dict[str, int]:
         """Every metric in the algorithm's own fixed-point units.
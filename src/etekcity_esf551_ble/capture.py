@@ -0,0 +1,368 @@
+"""
+Record and replay what a scale sent, without the scale.
+
+:class:`CaptureRecorder` attaches to any scale client and logs, with
+monotonic timestamps, every advertisement the client accepts, every
+notification its GATT session receives and every write it makes, to a
+compact binary file. :class:`CaptureReplayer` feeds such a file back through
+a fresh client of any model, at the recorded pace, faster, or as fast as
+possible — so a field problem can be reproduced, and parsers and session
+logic benchmarked, without a physical weigh-in::
+
+    recorder = CaptureRecorder("weigh-in.etkcap")
+    recorder.attach(scale)
+    ...
+    recorder.close()
+
+    replay_target = ESF551Scale(address, callback, bleak_scanner_backend=Mock())
+    await CaptureReplayer("weigh-in.etkcap").replay(replay_target, speed=10)
+
+File format
+-----------
+An 8-byte header (``b"ETKCAP"``, format version, reserved byte) followed by
+records of ``[kind u8][delta_us u32][length u16][body]``, where ``delta_us`` is
+the time since the previous record. Strings (addresses, names, UUIDs) are
+written once in a ``STRING`` record and referred to by a u16 index after
+that, so a notification costs its data plus nine bytes.
+
+Encrypted models (EFS-A591S, EFS-C651) also log the session key once it is
+established: their frames can't be decrypted on replay otherwise. Treat
+captures of those models as containing key material.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import os
+import struct
+import time
+from collections.abc import Iterator
+from typing import IO, TYPE_CHECKING, Any, NamedTuple
+
+from bleak.backends.device import BLEDevice
+from bleak.backends.scanner import AdvertisementData
+
+if TYPE_CHECKING:
+    from .scale import EtekcitySmartFitnessScale
+
+MAGIC = b"ETKCAP"
+FORMAT_VERSION = 1
+
+# Record kinds
+STRING = 0
+ADVERTISEMENT = 1
+NOTIFICATION = 2
+WRITE = 3
+SESSION_KEY = 4
+
+_HEADER = struct.Struct("<6sBx")
+_RECORD = struct.Struct("<BIH")
+_MAX_DELTA_US = 0xFFFFFFFF
+_NO_TX_POWER = -0x8000
+_WRITE_RESPONSE = {None: 0, False: 1, True: 2}
+
+
+class CaptureRecord(NamedTuple):
+    kind: int
+    time: float  # seconds since the start of the capture
+    address: str
+    name: str | None = None  # device name (advertisements, notifications)
+    char: str | None = None  # characteristic UUID (notifications, writes)
+    data: bytes = b""  # notification / write payload, or key + iv
+    response: bool | None = None  # write-with-response flag as passed
+    advertisement: AdvertisementData | None = None
+
+
+def _char_uuid(char: Any) -> str:
+    return str(getattr(char, "uuid", char))
+
+
+class CaptureRecorder:
+    """
+    Append a scale client's BLE traffic to a capture file.
+
+    ``target`` is a path or a writable binary file object. One recorder can
+    be attached to any number of clients; records carry each client's
+    address. Writes are buffered; call :meth:`close` (or use the recorder as
+    a context manager) to flush.
+    """
+
+    def __init__(self, target: str | os.PathLike | IO[bytes]) -> None:
+        if isinstance(target, (str, os.PathLike)):
+            self._file: IO[bytes] = open(target, "wb")
+            self._owns_file = True
+        else:
+            self._file = target
+            self._owns_file = False
+        self._file.write(_HEADER.pack(MAGIC, FORMAT_VERSION))
+        self._strings: dict[str, int] = {}
+        self._last = time.monotonic_ns()
+        self._scales: list[EtekcitySmartFitnessScale] = []
+
+    def attach(self, scale: EtekcitySmartFitnessScale) -> None:
+        """Start recording ``scale``'s traffic."""
+        scale._recorder = self
+        self._scales.append(scale)
+
+    def detach(self, scale: EtekcitySmartFitnessScale) -> None:
+        """Stop recording ``scale``'s traffic."""
+        if scale._recorder is self:
+            scale._recorder = None
+        if scale in self._scales:
+            self._scales.remove(scale)
+
+    def close(self) -> None:
+        """Detach from every client and flush (closing a file we opened)."""
+        for scale in list(self._scales):
+            self.detach(scale)
+        if self._owns_file:
+            self._file.close()
+        else:
+            self._file.flush()
+
+    def __enter__(self) -> CaptureRecorder:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    # ---- encoding ---------------------------------------------------------
+
+    def _string(self, value: str | None) -> bytes:
+        if value is None:
+            return b"\xff\xff"
+        if (index := self._strings.get(value)) is None:
+            index = self._strings[value] = len(self._strings)
+            self._write(STRING, value.encode())
+        return struct.pack("<H", index)
+
+    def _write(self, kind: int, body: bytes) -> None:
+        now = time.monotonic_ns()
+        delta = min((now - self._last) // 1000, _MAX_DELTA_US)
+        self._last = now
+        self._file.write(_RECORD.pack(kind, delta, len(body)) + body)
+
+    @staticmethod
+    def _blob(data: bytes) -> bytes:
+        return struct.pack("<H", len(data)) + bytes(data)
+
+    def record_advertisement(
+        self, ble_device: BLEDevice, advertisement_data: AdvertisementData
+    ) -> None:
+        ad = advertisement_data
+        body = bytearray(self._string(ble_device.address))
+        body += self._string(ble_device.name)
+        body += self._string(ad.local_name)
+        body += struct.pack(
+            "<hh",
+            ad.rssi,
+            _NO_TX_POWER if ad.tx_power is None else ad.tx_power,
+        )
+        body += struct.pack("<B", len(ad.manufacturer_data))
+        for company_id, payload in ad.manufacturer_data.items():
+            body += struct.pack("<H", company_id) + self._blob(payload)
+        body += struct.pack("<B", len(ad.service_data))
+        for uuid, payload in ad.service_data.items():
+            body += self._string(uuid) + self._blob(payload)
+        body += struct.pack("<B", len(ad.service_uuids))
+        for uuid in ad.service_uuids:
+            body += self._string(uuid)
+        self._write(ADVERTISEMENT, bytes(body))
+
+    def record_notification(
+        self, address: str, name: str | None, char: Any, data: bytes
+    ) -> None:
+        self._write(
+            NOTIFICATION,
+            self._string(address)
+            + self._string(name)
+            + self._string(_char_uuid(char))
+            + bytes(data),
+        )
+
+    def record_write(
+        self, address: str, char: Any, data: bytes, response: bool | None
+    ) -> None:
+        self._write(
+            WRITE,
+            self._string(address)
+            + self._string(_char_uuid(char))
+            + bytes([_WRITE_RESPONSE[response]])
+            + bytes(data),
+        )
+
+    def record_session_key(self, address: str, key: bytes, iv: bytes) -> None:
+        self._write(SESSION_KEY, self._string(address) + key + iv)
+
+
+class _Reader:
+    def __init__(self, body: bytes, strings: list[str]) -> None:
+        self._body = body
+        self._pos = 0
+        self._strings = strings
+
+    def unpack(self, fmt: str) -> tuple:
+        values = struct.unpack_from(fmt, self._body, self._pos)
+        self._pos += struct.calcsize(fmt)
+        return values
+
+    def string(self) -> str | None:
+        (index,) = self.unpack("<H")
+        return None if index == 0xFFFF else self._strings[index]
+
+    def blob(self) -> bytes:
+        (length,) = self.unpack("<H")
+        return self.take(length)
+
+    def take(self, length: int | None = None) -> bytes:
+        end = len(self._body) if length is None else self._pos + length
+        data = self._body[self._pos : end]
+        self._pos = end
+        return data
+
+
+def read_capture(source: str | os.PathLike | IO[bytes]) -> Iterator[CaptureRecord]:
+    """Yield the records of a capture file, in order."""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as fh:
+            yield from read_capture(io.BytesIO(fh.read()))
+        return
+    header = source.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        raise ValueError("Not a capture file: truncated header")
+    magic, version = _HEADER.unpack(header)
+    if magic != MAGIC:
+        raise ValueError("Not a capture file: bad magic")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported capture format version {version}")
+
+    strings: list[str] = []
+    elapsed_us = 0
+    while len(head := source.read(_RECORD.size)) == _RECORD.size:
+        kind, delta, length = _RECORD.unpack(head)
+        body = source.read(length)
+        if len(body) < length:
+            break  # truncated tail, e.g. the recorder was killed mid-write
+        elapsed_us += delta
+        t = elapsed_us / 1e6
+        if kind == STRING:
+            strings.append(body.decode())
+            continue
+        r = _Reader(body, strings)
+        if kind == ADVERTISEMENT:
+            address, name, local_name = r.string(), r.string(), r.string()
+            rssi, tx_power = r.unpack("<hh")
+            manufacturer_data = {}
+            for _ in range(r.unpack("<B")[0]):
+                (company_id,) = r.unpack("<H")
+                manufacturer_data[company_id] = r.blob()
+            service_data = {}
+            for _ in range(r.unpack("<B")[0]):
+                uuid = r.string()
+                service_data[uuid] = r.blob()
+            service_uuids = [r.string() for _ in range(r.unpack("<B")[0])]
+            advertisement = AdvertisementData(
+                local_name=local_name,
+                manufacturer_data=manufacturer_data,
+                service_data=service_data,
+                service_uuids=service_uuids,
+                tx_power=None if tx_power == _NO_TX_POWER else tx_power,
+                rssi=rssi,
+                platform_data=(),
+            )
+            yield CaptureRecord(
+                kind, t, address, name=name, advertisement=advertisement
+            )
+        elif kind == NOTIFICATION:
+            address, name, char = r.string(), r.string(), r.string()
+            yield CaptureRecord(kind, t, address, name=name, char=char, data=r.take())
+        elif kind == WRITE:
+            address, char = r.string(), r.string()
+            (flag,) = r.unpack("<B")
+            response = (None, False, True)[flag]
+            yield CaptureRecord(
+                kind, t, address, char=char, data=r.take(), response=response
+            )
+        elif kind == SESSION_KEY:
+            yield CaptureRecord(kind, t, r.string(), data=r.take())
+        # Unknown kinds are skipped so newer captures stay readable.
+
+
+class CaptureReplayer:
+    """
+    Feed a capture back through a scale client.
+
+    Advertisements go through the client's ``_advertisement_callback`` (so
+    address filtering and the cooldown gate apply as they did live) and
+    notifications straight into ``_notification_handler``; writes are the
+    client's own output and are not replayed. For GATT models the recorded
+    advertisements would start a real connection, so by default they are
+    only replayed into advertisement-based clients (pass ``advertisements``
+    to override).
+    """
+
+    def __init__(self, source: str | os.PathLike | IO[bytes]) -> None:
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, "rb") as fh:
+                source = io.BytesIO(fh.read())
+        self._records = list(read_capture(source))
+
+    @property
+    def records(self) -> list[CaptureRecord]:
+        return self._records
+
+    async def replay(
+        self,
+        scale: EtekcitySmartFitnessScale,
+        speed: float = 1.0,
+        *,
+        advertisements: bool | None = None,
+    ) -> int:
+        """
+        Replay the capture into ``scale``; return the number of records fed.
+
+        Args:
+            scale: Client to feed. Only records for its ``address`` take
+                   effect, so construct it with the captured address.
+            speed: Pace relative to the recording (2.0 = twice as fast).
+                   0 replays as fast as possible, still yielding to the event
+                   loop between records so tasks the client spawns can run.
+            advertisements: Whether to replay advertisements. Defaults to
+                            True for advertisement-based clients only.
+        """
+        from .scale import GattScale
+
+        if speed < 0:
+            raise ValueError("speed must be >= 0")
+        if advertisements is None:
+            advertisements = not isinstance(scale, GattScale)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        fed = 0
+        for record in self._records:
+            if speed:
+                delay = start + record.time / speed - loop.time()
+                await asyncio.sleep(max(delay, 0))
+            else:
+                await asyncio.sleep(0)
+            if record.kind == ADVERTISEMENT:
+                if not advertisements:
+                    continue
+                device = BLEDevice(record.address, record.name, None)
+                await scale._advertisement_callback(device, record.advertisement)
+            elif record.kind == NOTIFICATION:
+                if record.address != scale.address:
+                    continue
+                scale._notification_handler(
+                    record.char, bytearray(record.data), record.name, record.address
+                )
+            elif record.kind == SESSION_KEY:
+                restore = getattr(scale, "_restore_session_key", None)
+                if record.address != scale.address or restore is None:
+                    continue
+                restore(record.data[:16], record.data[16:32])
+            else:
+                continue
+            fed += 1
+        return fed
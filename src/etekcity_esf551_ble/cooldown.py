@@ -0,0 +1,158 @@
+"""
+Cooldown windows sized from each scale's observed advertising tail.
+
+After a session a scale keeps advertising for a while: a GATT scale while it
+spins down (refusing connections), an advertisement-based scale
+re-broadcasting its final frame. A fixed ``cooldown_seconds`` is a guess at
+that tail. If it is too short, each straggler starts a futile connection
+attempt (or yields a duplicate reading). If it is too long, an intentional
+re-weigh is missed.
+
+An :class:`AdaptiveCooldown` attached to a scale client measures the tail
+itself: from the moment the window is armed to the last advertisement
+before the scale goes quiet for ``quiet_gap`` seconds. Each later window is
+the ``percentile`` of the last ``history`` tails plus ``margin``, clamped to
+``minimum``..``maximum``. Until ``min_samples`` tails have been seen the
+client's own ``cooldown_seconds`` applies::
+
+    cooldown = AdaptiveCooldown(percentile=0.9)
+    cooldown.attach(scale)  # one instance can serve several clients
+    ...
+    stats = cooldown.stats[scale.address]
+    print(stats.window, stats.suppressed, stats.early)
+
+``early`` counts the advertisements that got past a closed window while the
+tail was still going — the wasted attempts the adaptive window should
+eliminate. A re-weigh within ``quiet_gap`` of the tail is indistinguishable
+from the tail and lengthens that sample; ``maximum`` bounds the effect.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from collections import deque
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .scale import EtekcitySmartFitnessScale
+
+
+class CooldownStats:
+    """Learned tail lengths and gate outcomes for one address."""
+
+    __slots__ = (
+        "samples",
+        "window",
+        "sessions",
+        "suppressed",
+        "early",
+        "_armed_at",
+        "_last_seen",
+    )
+
+    def __init__(self, history: int) -> None:
+        #: Recent tail lengths in seconds, oldest first.
+        self.samples: deque[float] = deque(maxlen=history)
+        #: Length of the most recently armed window, in seconds.
+        self.window: float | None = None
+        #: Windows armed.
+        self.sessions = 0
+        #: Advertisements ignored because the window was open.
+        self.suppressed = 0
+        #: Advertisements let through while the tail was still going.
+        self.early = 0
+        # monotonic time the open tail started, and of its latest advertisement
+        self._armed_at: float | None = None
+        self._last_seen = 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"CooldownStats(window={self.window}, samples={len(self.samples)},"
+            f" suppressed={self.suppressed}, early={self.early})"
+        )
+
+
+class AdaptiveCooldown:
+    """
+    Learn each address's advertising tail and size its cooldown from it.
+
+    ``stats`` maps each address to its :class:`CooldownStats`.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 0.9,
+        *,
+        history: int = 20,
+        min_samples: int = 3,
+        margin: float = 0.5,
+        minimum: float = 1.0,
+        maximum: float = 30.0,
+        quiet_gap: float = 3.0,
+    ) -> None:
+        if not 0 < percentile <= 1:
+            raise ValueError("percentile must be in (0, 1]")
+        if minimum > maximum:
+            raise ValueError("minimum must not exceed maximum")
+        self.percentile = percentile
+        self._history = history
+        self._min_samples = min_samples
+        self._margin = margin
+        self._minimum = minimum
+        self._maximum = maximum
+        self._quiet_gap = quiet_gap
+        self.stats: dict[str, CooldownStats] = {}
+
+    def attach(self, scale: EtekcitySmartFitnessScale) -> None:
+        """Size ``scale``'s cooldown windows from its learned tail."""
+        scale._adaptive_cooldown = self
+
+    def detach(self, scale: EtekcitySmartFitnessScale) -> None:
+        """Return ``scale`` to its fixed ``cooldown_seconds``."""
+        if scale._adaptive_cooldown is self:
+            scale._adaptive_cooldown = None
+
+    def _stats(self, address: str) -> CooldownStats:
+        if (stats := self.stats.get(address)) is None:
+            stats = self.stats[address] = CooldownStats(self._history)
+        return stats
+
+    def window(self, address: str, fallback: float) -> float:
+        """Current window for ``address``: learned, or ``fallback`` until then."""
+        stats = self.stats.get(address)
+        if stats is None or len(stats.samples) < self._min_samples:
+            return fallback
+        ordered = sorted(stats.samples)
+        tail = ordered[max(math.ceil(self.percentile * len(ordered)) - 1, 0)]
+        return min(max(tail + self._margin, self._minimum), self._maximum)
+
+    def _end_tail(self, stats: CooldownStats) -> None:
+        stats.samples.append(min(stats._last_seen - stats._armed_at, self._maximum))
+        stats._armed_at = None
+
+    def arm(self, address: str, fallback: float, now: float | None = None) -> float:
+        """Start a tail for ``address``; return the window to arm, in seconds."""
+        now = time.monotonic() if now is None else now
+        stats = self._stats(address)
+        if stats._armed_at is not None:
+            # Quiet since, or a new session inside the previous tail (which
+            # then ended with the advertisement that started the session).
+            self._end_tail(stats)
+        stats._armed_at = stats._last_seen = now
+        stats.sessions += 1
+        stats.window = self.window(address, fallback)
+        return stats.window
+
+    def observe(self, address: str, suppressed: bool, now: float | None = None) -> None:
+        """Record an advertisement and whether the open window suppressed it."""
+        now = time.monotonic() if now is None else now
+        stats = self._stats(address)
+        if stats._armed_at is not None and now - stats._last_seen > self._quiet_gap:
+            self._end_tail(stats)
+        if suppressed:
+            stats.suppressed += 1
+        elif stats._armed_at is not None:
+            stats.early += 1
+        if stats._armed_at is not None:
+            stats._last_seen = now
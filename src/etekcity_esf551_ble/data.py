@@ -1,12 +1,20 @@
 from __future__ import annotations
 
 import dataclasses
+from collections.abc import Iterator, Mapping, MutableMapping
 from enum import IntEnum, StrEnum
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .timing import SessionTiming
 
 
 class BluetoothScanningMode(StrEnum):
     PASSIVE = "passive"
     ACTIVE = "active"
+    #: Passive until a watched scale advertises, then active for a while
+    #: (see :class:`~.scanning.HybridScanner`). Linux only; active elsewhere.
+    HYBRID = "hybrid"
 
 
 class WeightUnit(IntEnum):
@@ -17,7 +25,11 @@ class WeightUnit(IntEnum):
     ST = 2  # Stones
 
 
-@dataclasses.dataclass
+# Measurement keys with a typed ScaleData field, in ``measurements`` order.
+_MEASUREMENT_FIELDS = ("weight", "impedance", "impedance_500khz", "heart_rate")
+
+
+@dataclasses.dataclass(slots=True, init=False)
 class ScaleData:
     """
     Response data with information about the scale and measurements.
@@ -28,14 +40,134 @@ class ScaleData:
         hw_version (str): Hardware version of the scale.
         sw_version (str): Software version of the scale.
         display_unit (WeightUnit): Current display unit of the scale.
-        measurements (dict): Dictionary containing measurement data.
+        weight (float | None): Weight in kg.
+        impedance (int | None): Impedance in ohms (50 kHz on dual-frequency
+            scales).
+        impedance_500khz (int | None): 500 kHz impedance in ohms (ESF-24
+            family).
+        heart_rate (int | None): Heart rate in bpm (EFS-A591S).
+        received_at (float | None): ``time.time()`` when the client received
+            the reading (for an ESF-24 stored offline reading, when it was
+            taken).
+        measurements (MutableMapping): The measurements that are not None,
+            keyed by ``WEIGHT_KEY``, ``IMPEDANCE_KEY``, ... — a live view of
+            the fields above, kept for compatibility with the dict this used
+            to be. Keys without a field are kept in ``extra``.
+        extra (dict | None): Measurements without a typed field; None (not
+            an empty dict) when there are none, which is always the case for
+            readings from this library.
+        timing (SessionTiming | None): Phase timestamps of the session that
+            produced this reading, when a :class:`~.timing.LatencyMonitor`
+            is attached to the client.
+    """
+
+    name: str
+    address: str
+    hw_version: str
+    sw_version: str
+    display_unit: WeightUnit
+    weight: float | None
+    impedance: int | None
+    impedance_500khz: int | None
+    heart_rate: int | None
+    received_at: float | None = dataclasses.field(compare=False)
+    timing: SessionTiming | None = dataclasses.field(compare=False)
+    extra: dict[str, str | float | None] | None = dataclasses.field(repr=False)
+
+    def __init__(
+        self,
+        name: str = "",
+        address: str = "",
+        hw_version: str = "",
+        sw_version: str = "",
+        display_unit: WeightUnit = WeightUnit.KG,
+        measurements: Mapping[str, str | float | None] | None = None,
+        timing: SessionTiming | None = None,
+        *,
+        weight: float | None = None,
+        impedance: int | None = None,
+        impedance_500khz: int | None = None,
+        heart_rate: int | None = None,
+        received_at: float | None = None,
+        extra: Mapping[str, str | float | None] | None = None,
+    ) -> None:
+        self.name = name
+        self.address = address
+        self.hw_version = hw_version
+        self.sw_version = sw_version
+        self.display_unit = display_unit
+        self.weight = weight
+        self.impedance = impedance
+        self.impedance_500khz = impedance_500khz
+        self.heart_rate = heart_rate
+        self.received_at = received_at
+        self.timing = timing
+        self.extra = dict(extra) if extra else None
+        if measurements is not None:
+            self.measurements.update(measurements)
+
+    @property
+    def measurements(self) -> MutableMapping[str, str | float | None]:
+        return _MeasurementsView(self)
+
+    @measurements.setter
+    def measurements(self, value: Mapping[str, str | float | None]) -> None:
+        value = dict(value)  # value may be this reading's own view
+        view = _MeasurementsView(self)
+        view.clear()
+        view.update(value)
+
+
+class _MeasurementsView(MutableMapping):
+    """``ScaleData.measurements``: the set measurement fields as a mapping.
+
+    Setting a typed key to None removes it, as a field that is None is not
+    listed.
     """
 
-    name: str = ""
-    address: str = ""
-    hw_version: str = ""
-    sw_version: str = ""
-    display_unit: WeightUnit = WeightUnit.KG
-    measurements: dict[str, str | float | None] = dataclasses.field(
-        default_factory=dict
-    )
+    __slots__ = ("_data",)
+
+    def __init__(self, data: ScaleData) -> None:
+        self._data = data
+
+    def __getitem__(self, key: str) -> str | float | None:
+        if key in _MEASUREMENT_FIELDS:
+            if (value := getattr(self._data, key)) is not None:
+                return value
+        elif self._data.extra is not None and key in self._data.extra:
+            return self._data.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: str | float | None) -> None:
+        if key in _MEASUREMENT_FIELDS:
+            setattr(self._data, key, value)
+        else:
+            if self._data.extra is None:
+                self._data.extra = {}
+            self._data.extra[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key in _MEASUREMENT_FIELDS:
+            if getattr(self._data, key) is None:
+                raise KeyError(key)
+            setattr(self._data, key, None)
+        elif self._data.extra is not None and key in self._data.extra:
+            del self._data.extra[key]
+        else:
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        data = self._data
+        for key in _MEASUREMENT_FIELDS:
+            if getattr(data, key) is not None:
+                yield key
+        if data.extra:
+            yield from list(data.extra)
+
+    def __len__(self) -> int:
+        data = self._data
+        typed = sum(getattr(data, key) is not None for key in _MEASUREMENT_FIELDS)
+        return typed + (len(data.extra) if data.extra else 0)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
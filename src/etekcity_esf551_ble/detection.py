@@ -31,7 +31,11 @@ from __future__ import annotations
 
 import fnmatch
 import logging
-from dataclasses import dataclass
+import re
+import time
+from collections import Counter, OrderedDict
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
 from enum import StrEnum
 
 _LOGGER = logging.getLogger(__name__)
@@ -164,6 +168,10 @@ _reported_identifiers: set[tuple[int, int]] = set()
 # (device name or model-specific address prefix); the retail name shared by
 # several models is handled separately in detect_model.
 #
+# detect_model consults a compiled index of this list, rebuilt on the next
+# lookup whenever the list differs from what was compiled; entries edited in
+# directly therefore apply too, but register_fallback_matcher() is preferred.
+#
 # New entries here usually need a matching "bluetooth" matcher in the HA
 # integration's manifest.json, or the advertisement never reaches discovery.
 FALLBACK_MATCHERS: list[tuple[ScaleModel, int | None, str]] = [
@@ -179,6 +187,118 @@ FALLBACK_MATCHERS: list[tuple[ScaleModel, int | None, str]] = [
 # On its own it cannot identify a model; detect_model combines it with the
 # header generation.
 _SHARED_NAME_PATTERN = "Etekcity *Fitness *Scale*"
+_SHARED_NAME_RE = re.compile(fnmatch.translate(_SHARED_NAME_PATTERN.lower()))
+
+# A pattern that is a literal followed by a single trailing "*" (the address
+# prefixes) is matched by dict lookup instead of a regex.
+_PREFIX_PATTERN_RE = re.compile(r"[^*?\[]+\*")
+
+
+class _MatcherGroup:
+    """The fallback matchers sharing one required manufacturer ID, compiled.
+
+    ``prefixes`` maps prefix length -> lowercased prefix -> matcher
+    positions; every other pattern is one named alternative of ``regex``,
+    whose first fully-matching alternative is the earliest such matcher.
+    """
+
+    __slots__ = ("prefixes", "regex")
+
+    def __init__(self) -> None:
+        self.prefixes: dict[int, dict[str, list[int]]] = {}
+        self.regex: re.Pattern[str] | None = None
+
+    def matches(self, candidate: str) -> int | None:
+        """Lowest matcher position matching the lowercased ``candidate``."""
+        best = None
+        if self.regex is not None and (m := self.regex.match(candidate)):
+            best = int(m.lastgroup[1:])
+        for length, table in self.prefixes.items():
+            positions = table.get(candidate[:length])
+            if positions and (best is None or positions[0] < best):
+                best = positions[0]
+        return best
+
+
+# required_manufacturer_id -> compiled matchers; rebuilt on registration.
+_fallback_index: dict[int | None, _MatcherGroup] = {}
+# Bumped on every rebuild so DetectionCache instances drop stale answers.
+_fallback_generation = 0
+# FALLBACK_MATCHERS as of the last rebuild.
+_indexed_matchers: list[tuple[ScaleModel, int | None, str]] = []
+
+
+def _build_fallback_index() -> None:
+    global _fallback_generation
+    alternatives: dict[int | None, list[str]] = {}
+    index: dict[int | None, _MatcherGroup] = {}
+    for position, (_model, required_mfr_id, pattern) in enumerate(FALLBACK_MATCHERS):
+        group = index.setdefault(required_mfr_id, _MatcherGroup())
+        pattern = pattern.lower()
+        if _PREFIX_PATTERN_RE.fullmatch(pattern):
+            prefix = pattern[:-1]
+            table = group.prefixes.setdefault(len(prefix), {})
+            table.setdefault(prefix, []).append(position)
+        else:
+            alternatives.setdefault(required_mfr_id, []).append(
+                f"(?P<m{position}>{fnmatch.translate(pattern)})"
+            )
+    for required_mfr_id, parts in alternatives.items():
+        index[required_mfr_id].regex = re.compile("|".join(parts))
+    _fallback_index.clear()
+    _fallback_index.update(index)
+    _indexed_matchers[:] = FALLBACK_MATCHERS
+    _fallback_generation += 1
+
+
+def _sync_fallback_index() -> None:
+    """Rebuild the index if ``FALLBACK_MATCHERS`` was edited directly."""
+    # The entries are the same tuple objects until an edit, so this is an
+    # identity check per entry.
+    if FALLBACK_MATCHERS != _indexed_matchers:
+        _build_fallback_index()
+
+
+def register_fallback_matcher(
+    model: ScaleModel, pattern: str, required_manufacturer_id: int | None = None
+) -> None:
+    """Add a fallback matcher at runtime (after the built-in ones).
+
+    ``pattern`` is an fnmatch pattern matched case-insensitively against the
+    local name and the address, as for the entries of ``FALLBACK_MATCHERS``;
+    with ``required_manufacturer_id`` it only applies to advertisements
+    carrying manufacturer data for that company ID. Existing
+    :class:`DetectionCache` entries are invalidated.
+    """
+    FALLBACK_MATCHERS.append((ScaleModel(model), required_manufacturer_id, pattern))
+    _build_fallback_index()
+
+
+def _match_fallback(
+    local_name: str | None,
+    manufacturer_data: dict[int, bytes],
+    address: str | None,
+) -> tuple[ScaleModel, str] | None:
+    """First entry of ``FALLBACK_MATCHERS`` (in list order) that applies."""
+    candidates = [c.lower() for c in (local_name, address) if c]
+    if not candidates:
+        return None
+    _sync_fallback_index()
+    best = None
+    for required_mfr_id, group in _fallback_index.items():
+        if required_mfr_id is not None and required_mfr_id not in manufacturer_data:
+            continue
+        for candidate in candidates:
+            position = group.matches(candidate)
+            if position is not None and (best is None or position < best):
+                best = position
+    if best is None:
+        return None
+    model, _required_mfr_id, pattern = FALLBACK_MATCHERS[best]
+    return model, pattern
+
+
+_build_fallback_index()
 
 
 def _report_unregistered(
@@ -230,8 +350,21 @@ def detect_model(
     For the QN family, the MAC echo is only validated when ``address``
     is a real MAC (colon-separated); pass the address whenever available.
     """
-    manufacturer_data = manufacturer_data or {}
+    return _detect(local_name, manufacturer_data or {}, address, _report_unregistered)
+
+
+# Called as report(etekcity_code, qn_code, context) when a device is
+# identified without a registered identifier.
+_Reporter = Callable[[int | None, int | None, str], None]
+
 
+def _detect(
+    local_name: str | None,
+    manufacturer_data: dict[int, bytes],
+    address: str | None,
+    report: _Reporter,
+) -> ScaleModel | None:
+    """:func:`detect_model`, reporting unregistered identifiers to ``report``."""
     etekcity_code = None
     payload = manufacturer_data.get(ETEKCITY_MANUFACTURER_ID)
     if payload is not None:
@@ -253,18 +386,14 @@ def detect_model(
         if qn_code is not None and qn_code in QN_MODEL_CODES:
             return QN_MODEL_CODES[qn_code]
 
-    for model, required_mfr_id, pattern in FALLBACK_MATCHERS:
-        if required_mfr_id is not None and required_mfr_id not in manufacturer_data:
-            continue
-        for candidate in (local_name, address):
-            if candidate and fnmatch.fnmatch(candidate.lower(), pattern.lower()):
-                _report_unregistered(
-                    etekcity_code,
-                    qn_code,
-                    f"Detected likely {model.value} via fallback matcher"
-                    f" {pattern!r}",
-                )
-                return model
+    if (matched := _match_fallback(local_name, manufacturer_data, address)) is not None:
+        model, pattern = matched
+        report(
+            etekcity_code,
+            qn_code,
+            f"Detected likely {model.value} via fallback matcher {pattern!r}",
+        )
+        return model
 
     # Shared retail name: three models advertise it, so the name alone never
     # decides. The header generation separates the EFS-C651 (the only known
@@ -273,20 +402,16 @@ def detect_model(
     # returned so consumers fall back to a manual model choice instead of
     # risking a misidentified (and silently broken) configuration.
     payload = manufacturer_data.get(ETEKCITY_MANUFACTURER_ID)
-    if (
-        local_name
-        and payload
-        and fnmatch.fnmatch(local_name.lower(), _SHARED_NAME_PATTERN.lower())
-    ):
+    if local_name and payload and _SHARED_NAME_RE.match(local_name.lower()):
         if payload[0] & 0x0F == _EFSC651_GENERATION:
-            _report_unregistered(
+            report(
                 etekcity_code,
                 qn_code,
                 f"Detected likely {ScaleModel.EFSC651.value} via the shared"
                 " scale name on a generation-2 frame",
             )
             return ScaleModel.EFSC651
-        _report_unregistered(
+        report(
             etekcity_code,
             qn_code,
             "Found an Etekcity scale advertising the shared retail name"
@@ -302,6 +427,218 @@ def detect_model(
     return None
 
 
+def _fingerprint(manufacturer_data: dict[int, bytes]) -> tuple:
+    """The parts of the manufacturer data :func:`detect_model` depends on.
+
+    Bytes that vary between advertisements of one device without affecting
+    the classification (Etekcity header flag bits, model-specific payload
+    past the identifier, the QN frame's undecoded and stored-count bytes)
+    are left out, so a device's advertisements share one cache entry.
+    """
+    etekcity = manufacturer_data.get(ETEKCITY_MANUFACTURER_ID)
+    if etekcity is not None:
+        header = etekcity[0] & 0x0F if etekcity else None
+        etekcity = (header, etekcity[1 : _ETEKCITY_MODEL_START + 2])
+    qn = manufacturer_data.get(QN_MANUFACTURER_ID)
+    if qn is not None:
+        qn = (
+            qn[_QN_MODEL_START : _QN_MODEL_START + 2] + qn[_QN_MAC_SLICE]
+            if len(qn) >= _QN_MAC_SLICE.stop
+            else b""
+        )
+    return etekcity, qn
+
+
+_MISSING = object()
+
+
+class DetectionCache:
+    """
+    Memoize :func:`detect_model` for busy radio environments.
+
+    Results — including None for non-scale devices — are cached per
+    ``(address, local_name, manufacturer-data fingerprint)``, where the
+    fingerprint keeps only the bytes classification depends on (see
+    :func:`_fingerprint`), so repeated advertisements from one device hit
+    the same entry. Entries expire ``ttl`` seconds after they were computed
+    and the least recently used are evicted beyond ``maxsize``. A cached
+    answer is exactly what :func:`detect_model` returned for an equivalent
+    advertisement, so the never-guess rules are unchanged, and the
+    unregistered-identifier report still fires once per process (on the
+    miss that first sees the identifier).
+
+    ``hits``, ``misses`` and ``evictions`` help size the cache. Matchers
+    added with :func:`register_fallback_matcher` invalidate the cache
+    automatically; call :meth:`clear` after changing ``MODEL_CODES`` /
+    ``QN_MODEL_CODES`` at runtime.
+    """
+
+    def __init__(self, maxsize: int = 4096, ttl: float | None = 300.0) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[tuple, tuple[ScaleModel | None, float]] = (
+            OrderedDict()
+        )
+        self._generation = _fallback_generation
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def detect(
+        self,
+        local_name: str | None,
+        manufacturer_data: dict[int, bytes] | None,
+        address: str | None = None,
+    ) -> ScaleModel | None:
+        """Same contract as :func:`detect_model`."""
+        manufacturer_data = manufacturer_data or {}
+        _sync_fallback_index()
+        if self._generation != _fallback_generation:
+            self._entries.clear()
+            self._generation = _fallback_generation
+        key = (address, local_name, _fingerprint(manufacturer_data))
+        now = time.monotonic()
+        entry = self._entries.get(key, _MISSING)
+        if entry is not _MISSING:
+            model, expires = entry
+            if expires > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return model
+            del self._entries[key]
+            self.evictions += 1
+        self.misses += 1
+        model = detect_model(local_name, manufacturer_data, address)
+        expires = now + self.ttl if self.ttl is not None else float("inf")
+        self._entries[key] = (model, expires)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return model
+
+    __call__ = detect
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def clear(self) -> None:
+        """Drop every entry (counters are kept)."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+@dataclass
+class BulkDetectionReport:
+    """Running totals of a :func:`detect_models_bulk` pass."""
+
+    total: int = 0
+    #: Advertisements per detected model.
+    counts: Counter[ScaleModel] = field(default_factory=Counter)
+    #: Advertisements that are not a known scale.
+    unrecognized: int = 0
+    #: ``(company_id, identifier)`` pairs seen on devices identified by a
+    #: fallback matcher or the shared name — candidates for
+    #: ``MODEL_CODES`` / ``QN_MODEL_CODES``.
+    unregistered: set[tuple[int, int]] = field(default_factory=set)
+
+
+def detect_models_bulk(
+    advertisements: Iterable[tuple[str | None, str | None, dict[int, bytes] | None]],
+    report: BulkDetectionReport | None = None,
+    *,
+    cache_size: int = 65536,
+) -> Iterator[ScaleModel | None]:
+    """Classify ``(address, local_name, manufacturer_data)`` rows lazily.
+
+    Yields :func:`detect_model`'s answer for each row, in order, while
+    tallying them into ``report``. Unregistered identifiers are collected
+    in ``report.unregistered`` instead of being logged. Rows repeating an
+    already classified advertisement (same address, name and
+    classification-relevant bytes, as in :class:`DetectionCache`) reuse its
+    result; up to ``cache_size`` distinct advertisements are remembered.
+    """
+    if report is None:
+        report = BulkDetectionReport()
+    memo: dict[tuple, tuple[ScaleModel | None, frozenset[tuple[int, int]]]] = {}
+    found: set[tuple[int, int]] = set()
+
+    def collect(etekcity_code: int | None, qn_code: int | None, _context: str) -> None:
+        if etekcity_code is not None:
+            found.add((ETEKCITY_MANUFACTURER_ID, etekcity_code))
+        if qn_code is not None:
+            found.add((QN_MANUFACTURER_ID, qn_code))
+
+    for address, local_name, manufacturer_data in advertisements:
+        manufacturer_data = manufacturer_data or {}
+        key = (address, local_name, _fingerprint(manufacturer_data))
+        if (entry := memo.get(key)) is None:
+            found.clear()
+            model = _detect(local_name, manufacturer_data, address, collect)
+            entry = (model, frozenset(found))
+            if len(memo) >= cache_size:
+                memo.clear()  # cheaper than LRU bookkeeping per row
+            memo[key] = entry
+        model, unregistered = entry
+        report.total += 1
+        if model is None:
+            report.unrecognized += 1
+        else:
+            report.counts[model] += 1
+        report.unregistered |= unregistered
+        yield model
+
+
+# AD types used in advertisement filter patterns (Bluetooth Assigned Numbers).
+_AD_SHORTENED_LOCAL_NAME = 0x08
+_AD_COMPLETE_LOCAL_NAME = 0x09
+_AD_MANUFACTURER_DATA = 0xFF
+
+
+def advertisement_filter_patterns() -> list[tuple[int, int, bytes]]:
+    """Content patterns, any of which a scale's advertisement matches.
+
+    Each pattern is ``(start position, AD type, bytes)``, the shape of a
+    BlueZ advertisement-monitor or-pattern, so the controller-side filter can
+    drop non-scale traffic before it reaches Python.
+
+    The patterns match what :func:`detect_model` can recognize. That is
+    manufacturer data for either company ID, plus the local names of the
+    name-only fallback matchers and the shared retail name. A name
+    pattern matches on its literal prefix. Patterns with none, and
+    address-only fallback matchers, cannot be expressed. Their devices
+    get through only with manufacturer data for a covered company ID.
+
+    There is no narrower per-scale variant: or-patterns are OR'ed, and a
+    scale recognized by name need not embed its MAC, so the company-ID and
+    name patterns must stay whichever scale is wanted. Clients filter by
+    address themselves.
+    """
+    patterns: list[tuple[int, int, bytes]] = []
+    patterns.extend(
+        (0, _AD_MANUFACTURER_DATA, company_id.to_bytes(2, "little"))
+        for company_id in (ETEKCITY_MANUFACTURER_ID, QN_MANUFACTURER_ID)
+    )
+    names = [_SHARED_NAME_PATTERN]
+    names += [
+        p for _, mfr_id, p in FALLBACK_MATCHERS if mfr_id is None and ":" not in p
+    ]
+    for name in names:
+        prefix = re.split(r"[*?\[]", name, maxsplit=1)[0].encode()
+        if not prefix:
+            _LOGGER.debug("Cannot filter on name pattern %r", name)
+            continue
+        for ad_type in (_AD_COMPLETE_LOCAL_NAME, _AD_SHORTENED_LOCAL_NAME):
+            if (pattern := (0, ad_type, prefix)) not in patterns:
+                patterns.append(pattern)
+    return patterns
+
+
 @dataclass(frozen=True)
 class ScaleCapabilities:
     """What a scale model measures and supports."""
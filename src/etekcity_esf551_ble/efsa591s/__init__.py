@@ -1,9 +1,14 @@
 """EFS-A591S-KUS (Apex HR Smart Fitness Scale) support."""
 
 from . import protocol
+from .keystore import CachedSession, FileKeyStore, KeyStore, MemoryKeyStore
 from .scale import EFSA591SScale
 
 __all__ = [
+    "CachedSession",
     "EFSA591SScale",
+    "FileKeyStore",
+    "KeyStore",
+    "MemoryKeyStore",
     "protocol",
 ]
@@ -0,0 +1,152 @@
+"""
+Session-key stores for the encrypted A5 scales (EFS-A591S, EFS-C651).
+
+Every A5 session normally starts with a DH ``KEY_EXCHANGE`` round trip before
+``KEY_VERIFY`` can go out, so each weigh-in pays a full BLE round trip before
+the first frame can be decrypted. A key store remembers, per MAC, the key and
+IV a scale last accepted; a client given one re-sends ``KEY_VERIFY`` under the
+cached key straight away and only falls back to the full handshake when the
+scale's frames no longer decrypt under it (see the scale clients).
+
+Stores are deliberately small and synchronous: entries are a few dozen bytes
+and are read once per connection.
+"""
+
+from __future__ import annotations
+
+import abc
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import NamedTuple
+
+from .protocol import DHParams
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CachedSession(NamedTuple):
+    key: bytes  # AES-128 session key
+    iv: bytes  # session IV delivered in KEY_VERIFY
+    dh: DHParams | None = None  # exchange the key was derived from
+
+
+class KeyStore(abc.ABC):
+    """Where A5 clients keep session keys between connections, keyed by MAC."""
+
+    @abc.abstractmethod
+    def get(self, address: str) -> CachedSession | None:
+        """Return the cached session for ``address``, or None."""
+
+    @abc.abstractmethod
+    def put(self, address: str, session: CachedSession) -> None:
+        """Remember ``session`` as the one ``address`` last accepted."""
+
+    @abc.abstractmethod
+    def discard(self, address: str) -> None:
+        """Forget ``address``; unknown addresses are ignored."""
+
+
+class MemoryKeyStore(KeyStore):
+    """Process-local store; reconnects are fast until the process restarts."""
+
+    def __init__(self) -> None:
+        self._sessions: dict[str, CachedSession] = {}
+
+    def get(self, address: str) -> CachedSession | None:
+        return self._sessions.get(address.upper())
+
+    def put(self, address: str, session: CachedSession) -> None:
+        self._sessions[address.upper()] = session
+
+    def discard(self, address: str) -> None:
+        self._sessions.pop(address.upper(), None)
+
+
+def _default_path() -> Path:
+    cache = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache) / "etekcity_esf551_ble" / "a5_sessions.json"
+
+
+class FileKeyStore(MemoryKeyStore):
+    """
+    JSON-file store that survives restarts (the default choice for gateways).
+
+    The file is read on first use and rewritten atomically (temp file plus
+    rename, mode 0600 — it holds key material) on every change. A missing or
+    unreadable file starts the store empty and a failed write is logged, not
+    raised: losing the cache only costs the next connection a full handshake.
+    """
+
+    def __init__(self, path: str | os.PathLike | None = None) -> None:
+        super().__init__()
+        self._path = Path(path) if path is not None else _default_path()
+        self._loaded = False
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def _load(self) -> None:
+        self._loaded = True
+        try:
+            raw = json.loads(self._path.read_text())
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as ex:
+            _LOGGER.warning("Ignoring unreadable key store %s: %s", self._path, ex)
+            return
+        for address, entry in raw.items():
+            try:
+                dh = DHParams(*entry["dh"]) if entry.get("dh") else None
+                self._sessions[address.upper()] = CachedSession(
+                    bytes.fromhex(entry["key"]), bytes.fromhex(entry["iv"]), dh
+                )
+            except (KeyError, TypeError, ValueError):
+                _LOGGER.debug("Skipping malformed key store entry for %s", address)
+
+    def _save(self) -> None:
+        data = {
+            address: {
+                "key": session.key.hex(),
+                "iv": session.iv.hex(),
+                "dh": list(session.dh) if session.dh else None,
+            }
+            for address, session in self._sessions.items()
+        }
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self._path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w") as fh:
+                    json.dump(data, fh)
+                os.chmod(tmp, 0o600)
+                os.replace(tmp, self._path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+        except OSError as ex:
+            _LOGGER.warning("Could not write key store %s: %s", self._path, ex)
+
+    def get(self, address: str) -> CachedSession | None:
+        if not self._loaded:
+            self._load()
+        return super().get(address)
+
+    def put(self, address: str, session: CachedSession) -> None:
+        if not self._loaded:
+            self._load()
+        if super().get(address) == session:
+            return
+        super().put(address, session)
+        self._save()
+
+    def discard(self, address: str) -> None:
+        if not self._loaded:
+            self._load()
+        if super().get(address) is None:
+            return
+        super().discard(address)
+        self._save()
@@ -26,7 +26,9 @@ against captured frames.
 
 from __future__ import annotations
 
+import functools
 import hashlib
+import math
 import os
 import secrets
 import struct
@@ -58,6 +60,10 @@ OPCODE_RESULT_PLAIN = 0x413C  # final result, no AES
 CHANNEL_PLAINTEXT = 0x00
 CHANNEL_AES = 0x01  # the AES-encrypted measurement channel
 
+# Above any A5 scale's capacity: a heavier decoded weight means the frame was
+# decrypted under the wrong key.
+MAX_PLAUSIBLE_WEIGHT_KG = 250.0
+
 # DH parameter ranges
 DH_MOD_MIN, DH_MOD_MAX = 40000, 46340  # prime modulus d
 DH_BASE_MIN, DH_BASE_MAX = 10, 100  # prime base e
@@ -109,42 +115,161 @@ def parse_frame(data: bytes) -> ParsedFrame | None:
     )
 
 
+# Longest frame the resync mode accepts. Real frames are well under 100 bytes;
+# a length header beyond this is treated as corruption rather than waited for.
+RESYNC_MAX_FRAME_LENGTH = 512
+_HEADER_LENGTH = 5  # magic, flags, seq, len(LE16)
+
+
 class FrameReassembler:
-    """Reassemble A5 frames from BLE notification fragments (total = len + 6)."""
+    """
+    Reassemble A5 frames from BLE notification fragments (total = len + 6).
+
+    Each notification is scanned with ``bytes.find`` for the frame magic and
+    whole frames are sliced out of a memoryview, so a notification carrying
+    complete frames (the common case) is never copied into the carry-over
+    buffer; only a trailing partial frame is kept for the next call.
+
+    With ``resync=True`` a candidate frame must also carry a valid checksum
+    and a plausible length (at most :data:`RESYNC_MAX_FRAME_LENGTH`). When it
+    doesn't — typically a corrupted length field — the magic byte is skipped
+    and scanning resumes at the next one, instead of swallowing the following
+    frames into a bogus one. The default keeps the historical behaviour of
+    trusting the length header.
+    """
 
-    def __init__(self) -> None:
+    def __init__(self, resync: bool = False) -> None:
         self._buf = bytearray()
-        self._expected = 0
+        self._resync = resync
+
+    def _split(self, chunk: bytes) -> list[tuple[memoryview, int, int]]:
+        """Return ``(view, start, total)`` for each complete frame in the
+        carry-over buffer plus ``chunk``; keep any trailing partial frame."""
+        if self._buf:
+            self._buf += chunk
+            data = self._buf
+        else:
+            data = chunk
+        view = memoryview(data)
+        frames: list[tuple[memoryview, int, int]] = []
+        end = len(data)
+        pos = 0
+        while (start := data.find(A5_MAGIC, pos)) >= 0:
+            if end - start < _HEADER_LENGTH:
+                pos = start
+                break
+            total = (data[start + 3] | data[start + 4] << 8) + 6
+            if self._resync and total > RESYNC_MAX_FRAME_LENGTH:
+                pos = start + 1
+                continue
+            if end - start < total:
+                pos = start
+                break
+            if self._resync and sum(view[start : start + total]) & 0xFF != 0xFF:
+                pos = start + 1
+                continue
+            frames.append((view, start, total))
+            pos = start + total
+        else:
+            pos = end
+        self._buf = bytearray(view[pos:])
+        return frames
 
     def feed(self, chunk: bytes):
         """Feed one notification payload; yield each complete frame."""
-        for b in chunk:
-            if not self._buf:
-                if b != A5_MAGIC:
-                    continue
-                self._buf.append(b)
-            else:
-                self._buf.append(b)
-                if len(self._buf) == 5:
-                    self._expected = struct.unpack("<H", bytes(self._buf[3:5]))[0] + 6
-                if self._expected and len(self._buf) == self._expected:
-                    frame = bytes(self._buf)
-                    self._buf = bytearray()
-                    self._expected = 0
-                    yield frame
+        for view, start, total in self._split(chunk):
+            yield bytes(view[start : start + total])
+
+    def feed_parsed(self, chunk: bytes):
+        """Feed one notification payload; yield each complete frame parsed.
+
+        Equivalent to ``parse_frame`` on every frame :meth:`feed` would yield
+        (frames too short to parse are skipped), without materializing the
+        intermediate frame bytes.
+        """
+        for view, start, total in self._split(chunk):
+            if total < 11:
+                continue
+            yield ParsedFrame(
+                flags=view[start + 1],
+                seq=view[start + 2],
+                opcode=view[start + 7] | view[start + 8] << 8,
+                channel=view[start + 10],
+                payload=bytes(view[start + 11 : start + total]),
+            )
 
 
 # ---- AES ------------------------------------------------------------------
 
 
-def _aes_cbc_decrypt(key: bytes, iv: bytes, ciphertext: bytes) -> bytes:
-    dec = Cipher(algorithms.AES(key), modes.CBC(iv)).decryptor()
-    return dec.update(ciphertext) + dec.finalize()
-
+class SessionCipher:
+    """
+    AES-128-CBC for one session's (key, iv), with the key schedule set up once.
+
+    Building a ``Cipher(AES(key), CBC(iv))`` per frame re-expands the key and
+    allocates a fresh backend context every time, which dominates the cost of
+    decrypting a 48-byte result frame. This keeps one ECB encryptor and one
+    ECB decryptor for the session's key and applies the CBC chaining itself
+    (a single XOR over the whole buffer on decrypt), so every frame after key
+    establishment reuses the same contexts.
+
+    ECB contexts carry no state between ``update`` calls as long as the input
+    is block-aligned, which every caller here guarantees, so they can be
+    reused for any number of frames and with any IV.
+    """
 
-def _aes_cbc_encrypt(key: bytes, iv: bytes, plaintext: bytes) -> bytes:
-    enc = Cipher(algorithms.AES(key), modes.CBC(iv)).encryptor()
-    return enc.update(plaintext) + enc.finalize()
+    __slots__ = ("key", "iv", "_encryptor", "_decryptor")
+
+    def __init__(self, key: bytes, iv: bytes) -> None:
+        if len(iv) != 16:
+            raise ValueError(f"iv must be 16 bytes; got {len(iv)}")
+        self.key = key
+        self.iv = iv
+        ecb = Cipher(algorithms.AES(key), modes.ECB())
+        self._encryptor = ecb.encryptor()
+        self._decryptor = ecb.decryptor()
+
+    def decrypt(self, ciphertext: bytes, iv: bytes | None = None) -> bytes:
+        """CBC-decrypt block-aligned ``ciphertext`` (session IV by default)."""
+        if len(ciphertext) % 16:
+            raise ValueError("ciphertext length must be a multiple of 16")
+        if not ciphertext:
+            return b""
+        blocks = self._decryptor.update(ciphertext)
+        chain = (self.iv if iv is None else iv) + ciphertext[:-16]
+        n = len(blocks)
+        return (
+            int.from_bytes(blocks, "big") ^ int.from_bytes(chain, "big")
+        ).to_bytes(n, "big")
+
+    def encrypt(self, plaintext: bytes, iv: bytes | None = None) -> bytes:
+        """CBC-encrypt block-aligned ``plaintext`` (session IV by default)."""
+        if len(plaintext) % 16:
+            raise ValueError("plaintext length must be a multiple of 16")
+        prev = int.from_bytes(self.iv if iv is None else iv, "big")
+        out = bytearray()
+        for i in range(0, len(plaintext), 16):
+            block = (int.from_bytes(plaintext[i : i + 16], "big") ^ prev).to_bytes(
+                16, "big"
+            )
+            block = self._encryptor.update(block)
+            out += block
+            prev = int.from_bytes(block, "big")
+        return bytes(out)
+
+    def decrypt_payload(self, parsed: ParsedFrame, *, strict: bool = False):
+        """
+        Decrypt and unpad the payload of an AES-channel frame.
+
+        With ``strict=True`` a payload whose PKCS7 padding doesn't check out —
+        the usual sign of decrypting under the wrong key — yields None instead
+        of the raw plaintext.
+        """
+        ct = parsed.payload
+        plaintext = self.decrypt(ct[: len(ct) // 16 * 16])
+        if strict and not _pkcs7_is_valid(plaintext):
+            return None
+        return _pkcs7_unpad(plaintext)
 
 
 def _pkcs7_pad(data: bytes, block: int = 16) -> bytes:
@@ -152,6 +277,13 @@ def _pkcs7_pad(data: bytes, block: int = 16) -> bytes:
     return data + bytes([pad]) * pad
 
 
+def _pkcs7_is_valid(data: bytes) -> bool:
+    if not data:
+        return False
+    pad = data[-1]
+    return 1 <= pad <= 16 and data[-pad:] == bytes([pad]) * pad
+
+
 def _pkcs7_unpad(data: bytes) -> bytes:
     if not data:
         return data
@@ -170,24 +302,25 @@ def reversed_mac_bytes(mac: str) -> bytes:
     return octets[::-1]
 
 
-def _is_prime(n: int) -> bool:
-    if n < 2:
-        return False
-    if n % 2 == 0:
-        return n == 2
-    i = 3
-    while i * i <= n:
-        if n % i == 0:
-            return False
-        i += 2
-    return True
+@functools.cache
+def _primes_between(lo: int, hi: int) -> tuple[int, ...]:
+    """
+    All primes in ``[lo, hi]``, sieved once per range and cached.
+
+    ``generate_dh`` runs inside session setup on the event loop; drawing random
+    candidates and trial-dividing each one made its cost unbounded (and
+    noticeable on slow gateways). With the table it is a single choice.
+    """
+    sieve = bytearray([1]) * (hi + 1)
+    sieve[:2] = b"\x00\x00"
+    for i in range(2, math.isqrt(hi) + 1):
+        if sieve[i]:
+            sieve[i * i :: i] = bytes(len(range(i * i, hi + 1, i)))
+    return tuple(n for n in range(max(lo, 2), hi + 1) if sieve[n])
 
 
 def _rand_prime(lo: int, hi: int) -> int:
-    while True:
-        n = secrets.randbelow(hi - lo + 1) + lo
-        if _is_prime(n):
-            return n
+    return secrets.choice(_primes_between(lo, hi))
 
 
 class DHParams(NamedTuple):
@@ -242,7 +375,14 @@ def build_key_exchange(seq: int, mac: str, dh: DHParams) -> bytes:
 def parse_key_exchange_response(frame: bytes) -> int | None:
     """Extract the scale's public value h from a 0x4201 response frame."""
     parsed = parse_frame(frame)
-    if parsed is None or parsed.opcode != OPCODE_KEY_EXCHANGE:
+    if parsed is None:
+        return None
+    return key_exchange_public_value(parsed)
+
+
+def key_exchange_public_value(parsed: ParsedFrame) -> int | None:
+    """Extract the scale's public value h from a parsed 0x4201 response."""
+    if parsed.opcode != OPCODE_KEY_EXCHANGE:
         return None
     r = parsed.payload
     if len(r) < 2:
@@ -253,31 +393,44 @@ def parse_key_exchange_response(frame: bytes) -> int | None:
     return struct.unpack("<H", r[p + 2 : p + 4])[0]
 
 
-def build_key_verify(seq: int, mac: str, iv: bytes, key: bytes) -> bytes:
+def build_key_verify(
+    seq: int, mac: str, iv: bytes, key: bytes | SessionCipher
+) -> bytes:
     """
     OP_HIGH_SECURITY_KEY_VERIFY (0x4202): deliver our random IV to the scale.
 
     Inner payload = [0x0c][reversed_mac(6)][0x10][iv(16)], AES-CBC encrypted with
-    (key, zero-IV), sent on the AES channel.
+    (key, zero-IV), sent on the AES channel. ``key`` may be the session's
+    :class:`SessionCipher` so the verify reuses its key schedule.
     """
     rmac = reversed_mac_bytes(mac)
     inner = bytes([0x0C]) + rmac + bytes([len(iv)]) + iv
-    ciphertext = _aes_cbc_encrypt(key, bytes(16), _pkcs7_pad(inner))
+    cipher = key if isinstance(key, SessionCipher) else SessionCipher(key, iv)
+    ciphertext = cipher.encrypt(_pkcs7_pad(inner), iv=bytes(16))
     return build_frame(seq, OPCODE_KEY_VERIFY, ciphertext, CHANNEL_AES)
 
 
-def build_set_unit(seq: int, unit: int, key: bytes, iv: bytes) -> bytes:
+def build_set_unit(
+    seq: int, unit: int, key: bytes | SessionCipher, iv: bytes | None = None
+) -> bytes:
     """
     Build a display-unit change command (resource 0xa163).
 
     The plaintext payload is a single byte = the desired unit (0=kg, 1=lb, 2=st),
     AES-CBC/PKCS7 encrypted with the session (key, iv) and sent on the AES channel
     to FFF2 — captured from the app, which writes exactly this on connect and on
-    any unit toggle.
+    any unit toggle. Pass the session's :class:`SessionCipher` as ``key`` (and
+    no ``iv``) to reuse its key schedule.
     """
     if unit not in (0, 1, 2):
         raise ValueError(f"unit must be 0 (kg), 1 (lb) or 2 (st); got {unit}")
-    ciphertext = _aes_cbc_encrypt(key, iv, _pkcs7_pad(bytes([unit])))
+    if isinstance(key, SessionCipher):
+        cipher = key
+    elif iv is None:
+        raise ValueError("iv is required when key is given as bytes")
+    else:
+        cipher = SessionCipher(key, iv)
+    ciphertext = cipher.encrypt(_pkcs7_pad(bytes([unit])))
     return build_frame(seq, OPCODE_SET_UNIT, ciphertext, CHANNEL_AES)
 
 
@@ -299,9 +452,8 @@ class Measurement(NamedTuple):
 
 
 def decrypt_frame_payload(key: bytes, iv: bytes, parsed: ParsedFrame) -> bytes:
-    ct = parsed.payload
-    ct = ct[: len(ct) // 16 * 16]
-    return _pkcs7_unpad(_aes_cbc_decrypt(key, iv, ct))
+    """One-off decrypt; a live session uses ``SessionCipher.decrypt_payload``."""
+    return SessionCipher(key, iv).decrypt_payload(parsed)
 
 
 def plain_payload(parsed: ParsedFrame) -> bytes:
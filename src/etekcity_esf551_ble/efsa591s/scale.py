@@ -5,17 +5,12 @@ from __future__ import annotations
 from bleak.backends.characteristic import BleakGATTCharacteristic
 from bleak.backends.device import BLEDevice
 
-from ..const import (
-    ALIRO_CHARACTERISTIC_UUID,
-    HEART_RATE_KEY,
-    IMPEDANCE_KEY,
-    WEIGHT_CHARACTERISTIC_UUID_NOTIFY,
-    WEIGHT_KEY,
-)
+from ..const import ALIRO_CHARACTERISTIC_UUID, WEIGHT_CHARACTERISTIC_UUID_NOTIFY
 
 from ..scale import GattScale, ScaleSessionError
 from ..data import ScaleData, WeightUnit
 from . import protocol as a5
+from .session import A5SessionResume
 
 # Frames the scale emits that carry no data we use (status/flag/ack frames).
 # Ignored silently so they don't spam the debug log.
@@ -24,7 +19,7 @@ from . import protocol as a5
 _STATUS_OPCODES = frozenset({0x4202, 0x4420, 0x413B, 0x413D, 0x4434, 0x4436})
 
 
-class EFSA591SScale(GattScale):
+class EFSA591SScale(A5SessionResume, GattScale):
     """
     EFS-A591S-KUS (Apex HR Smart Fitness Scale).
 
@@ -39,14 +34,19 @@ class EFSA591SScale(GattScale):
     of a MAC (i.e. macOS without ``use_bdaddr``).
     """
 
+    _MODEL = "EFS-A591S"
+    _RESULT_OPCODE = a5.OPCODE_RESULT
+    _parse_result = staticmethod(a5.parse_result)
+
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
         self._write_char = None
         self._reasm = a5.FrameReassembler()
         self._seq = 0x0A
         self._dh: a5.DHParams | None = None
-        self._key: bytes | None = None
-        self._iv: bytes | None = None
+        # Built once per session at key establishment; every result frame and
+        # the unit command reuse its key schedule.
+        self._cipher: a5.SessionCipher | None = None
 
     def _next_seq(self) -> int:
         self._seq = (self._seq + 1) & 0xFF
@@ -79,25 +79,39 @@ class EFSA591SScale(GattScale):
 
         # Reset per-session crypto state
         self._reasm = a5.FrameReassembler()
-        self._key = None
-        self._iv = None
-
-        await self._client.start_notify(
-            notify_char,
-            lambda char, data: self._notification_handler(
-                char, data, ble_device.name, ble_device.address
-            ),
-        )
+        self._cipher = None
+        self._begin_session()
+
+        await self._start_notify(notify_char, ble_device)
 
-        # Kick off the DH key exchange
+        await self._establish_session_key()
+
+    async def _send_key_exchange(self) -> None:
         self._dh = a5.generate_dh()
         frame = a5.build_key_exchange(self._next_seq(), self.address, self._dh)
         self._logger.debug("EFS-A591S sending key exchange: %s", frame.hex())
         await self._send_frame(frame)
 
+    def _send_verify(self) -> None:
+        verify = a5.build_key_verify(
+            self._next_seq(), self.address, self._cipher.iv, self._cipher
+        )
+        # Push the configured display unit right after VERIFY, the same way
+        # the app does on connect (resource 0xa163, encrypted with the session
+        # key/iv). Skipped when no unit is configured.
+        unit_frame = None
+        if self._display_unit is not None:
+            unit_frame = a5.build_set_unit(
+                self._next_seq(), int(self._display_unit), self._cipher
+            )
+        self._spawn_task(
+            self._send_verify_then_unit(verify, unit_frame),
+            name="efsa591s-verify",
+        )
+
     async def _send_frame(self, frame: bytes) -> None:
         if self._client and self._write_char:
-            await self._client.write_gatt_char(self._write_char, frame, response=False)
+            await self._write_gatt_char(self._write_char, frame, response=False)
 
     async def _send_verify_then_unit(
         self, verify: bytes, unit_frame: bytes | None
@@ -115,41 +129,34 @@ class EFSA591SScale(GattScale):
         name: str,
         address: str,
     ) -> None:
-        # data is a bytearray; FrameReassembler.feed iterates it, so no copy needed.
-        for frame in self._reasm.feed(data):
+        # data is a bytearray; the reassembler slices frames straight out of it.
+        for parsed in self._reasm.feed_parsed(data):
             try:
-                self._handle_frame(frame, name, address)
+                self._handle_parsed(parsed, name, address)
             except Exception as ex:  # pragma: no cover - defensive
                 self._logger.debug("EFS-A591S frame handling error: %s", ex)
 
     def _handle_frame(self, frame: bytes, name: str, address: str) -> None:
-        parsed = a5.parse_frame(frame)
-        if parsed is None:
-            return
+        if (parsed := a5.parse_frame(frame)) is not None:
+            self._handle_parsed(parsed, name, address)
 
+    def _handle_parsed(self, parsed: a5.ParsedFrame, name: str, address: str) -> None:
         if parsed.opcode == a5.OPCODE_KEY_EXCHANGE:
-            h = a5.parse_key_exchange_response(frame)
+            h = a5.key_exchange_public_value(parsed)
             if h is None or self._dh is None:
                 return
             shared = a5.compute_shared(h, self._dh.g, self._dh.d)
-            self._key = a5.derive_key(shared, self.address)
-            self._iv = a5.random_iv()
-            self._logger.debug("EFS-A591S key established (h=%d), sending verify", h)
-            verify = a5.build_key_verify(
-                self._next_seq(), self.address, self._iv, self._key
+            self._cipher = a5.SessionCipher(
+                a5.derive_key(shared, self.address), a5.random_iv()
             )
-            # Push the configured display unit right after VERIFY, the same way
-            # the app does on connect (resource 0xa163, encrypted with the session
-            # key/iv). Skipped when no unit is configured.
-            unit_frame = None
-            if self._display_unit is not None:
-                unit_frame = a5.build_set_unit(
-                    self._next_seq(), int(self._display_unit), self._key, self._iv
+            self._resume_pending = False
+            self._resumed = False
+            if self._recorder is not None:
+                self._recorder.record_session_key(
+                    self.address, self._cipher.key, self._cipher.iv
                 )
-            self._spawn_task(
-                self._send_verify_then_unit(verify, unit_frame),
-                name="efsa591s-verify",
-            )
+            self._logger.debug("EFS-A591S key established (h=%d), sending verify", h)
+            self._send_verify()
 
         elif parsed.opcode == a5.OPCODE_RESULT:
             # Only the final result frame carries the stabilized weight plus
@@ -159,9 +166,8 @@ class EFSA591SScale(GattScale):
             # history and overwrite the final body-composition values (a live
             # frame arriving after the result frame resets impedance to
             # "unavailable").
-            if not self._key or not self._iv:
+            if (pt := self._decrypt(parsed)) is None:
                 return
-            pt = a5.decrypt_frame_payload(self._key, self._iv, parsed)
             meas = a5.parse_result(pt)
             if meas is None or meas.weight_kg <= 0:
                 return
@@ -188,11 +194,20 @@ class EFSA591SScale(GattScale):
         elif parsed.opcode in (a5.OPCODE_MEASUREMENT, a5.OPCODE_MEASUREMENT_PLAIN):
             # Live, pre-stabilization weight stream (AES 0x4421 or plain 0x4121)
             # — intentionally ignored so only the finalized measurement is
-            # delivered to Home Assistant.
+            # delivered to Home Assistant. The session's first AES frame is
+            # still decrypted once: it confirms (or rejects) the session key
+            # long before the result frame arrives.
+            if (
+                parsed.opcode == a5.OPCODE_MEASUREMENT
+                and self._time_to_first_decrypt is None
+            ):
+                self._decrypt(parsed)
             return
         elif parsed.opcode not in _STATUS_OPCODES:
             self._logger.debug(
-                "EFS-A591S unhandled opcode 0x%04x: %s", parsed.opcode, frame.hex()
+                "EFS-A591S unhandled opcode 0x%04x, payload %s",
+                parsed.opcode,
+                parsed.payload.hex(),
             )
 
     def _emit(self, meas: a5.Measurement, name: str, address: str) -> None:
@@ -208,10 +223,7 @@ class EFSA591SScale(GattScale):
             if meas.display_unit is not None
             else self._display_unit
         )
-        measurements: dict[str, float | int] = {WEIGHT_KEY: meas.weight_kg}
-        if meas.impedance:
-            measurements[IMPEDANCE_KEY] = meas.impedance
-        if meas.heart_rate:
-            measurements[HEART_RATE_KEY] = meas.heart_rate
-        scale_data.measurements = measurements
-        self._notification_callback(scale_data)
+        scale_data.weight = meas.weight_kg
+        scale_data.impedance = meas.impedance or None
+        scale_data.heart_rate = meas.heart_rate or None
+        self._deliver(scale_data)
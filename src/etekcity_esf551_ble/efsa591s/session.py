@@ -0,0 +1,199 @@
+"""
+Cached-key session resume shared by the encrypted A5 clients.
+
+Both the EFS-A591S and the EFS-C651 can skip the DH ``KEY_EXCHANGE`` by
+re-sending ``KEY_VERIFY`` under the key the scale last accepted (see
+:mod:`.keystore`). :class:`A5SessionResume` holds the logic for that: looking
+the key up, confirming it on the session's first AES frame, and falling back
+to the full handshake when that frame shows the scale no longer accepts it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Callable
+
+from ..timing import SessionPhase
+from . import protocol as a5
+from .keystore import CachedSession, KeyStore
+
+
+class A5SessionResume:
+    """
+    Mixin for :class:`~etekcity_esf551_ble.scale.GattScale` subclasses that
+    speak the A5 protocol; it must come before ``GattScale`` in the bases.
+
+    The client provides ``_cipher``, ``_dh``, ``_send_key_exchange()`` and
+    ``_send_verify()``, calls :meth:`_begin_session` before enabling
+    notifications and :meth:`_establish_session_key` after, and decrypts AES
+    frames through :meth:`_decrypt`. ``_RESULT_OPCODE`` and ``_parse_result``
+    name its final result frame, which together with the live measurement
+    frame is what a cached key has to decode sanely.
+    """
+
+    #: Seconds a session resumed from the key store may go without a frame
+    #: decrypting under the cached key before falling back to the handshake.
+    CACHED_SESSION_TIMEOUT = 3.0
+
+    #: Model name used in log messages.
+    _MODEL: str
+    _RESULT_OPCODE: int
+    _parse_result: Callable[[bytes], a5.Measurement | None]
+
+    def __init__(self, *args, key_store: KeyStore | None = None, **kwargs) -> None:
+        """
+        Initialize the scale client.
+
+        Args:
+            key_store: Optional :class:`~.keystore.KeyStore` (e.g.
+                       :class:`~.keystore.FileKeyStore`). When given, the
+                       session key the scale last accepted is reused on the
+                       next connection instead of running the key exchange.
+
+        See :class:`~etekcity_esf551_ble.scale.GattScale` for the remaining args.
+        """
+        super().__init__(*args, **kwargs)
+        self._key_store = key_store
+        # Set while the session runs on a key from the store that no frame
+        # has confirmed yet; cleared on the first frame that decrypts.
+        self._resume_pending = False
+        # Set once the scale rejected a cached key: later sessions run the
+        # key exchange without trying (or storing) one.
+        self._resume_rejected = False
+        self._resumed = False
+        self._session_started_at: float | None = None
+        self._time_to_first_decrypt: float | None = None
+
+    @property
+    def time_to_first_decrypted_frame(self) -> float | None:
+        """Seconds from session setup to the first frame decrypted in it.
+
+        None until a frame has decrypted. Compare sessions with
+        :attr:`session_resumed` set and unset to see what the key store saves.
+        """
+        return self._time_to_first_decrypt
+
+    @property
+    def session_resumed(self) -> bool:
+        """Whether the current session reused a key from the key store."""
+        return self._resumed
+
+    def _begin_session(self) -> None:
+        self._resume_pending = False
+        self._resumed = False
+        self._session_started_at = time.monotonic()
+        self._time_to_first_decrypt = None
+
+    async def _establish_session_key(self) -> None:
+        """Resume the session on a cached key if there is one, else run the
+        key exchange."""
+        cached = None
+        if self._key_store is not None and not self._resume_rejected:
+            cached = self._key_store.get(self.address)
+        if cached is not None:
+            self._resume_cached_session(cached)
+            return
+        await self._send_key_exchange()
+
+    def _resume_cached_session(self, cached: CachedSession) -> None:
+        # Skip KEY_EXCHANGE and re-send VERIFY under the key the scale last
+        # accepted. Nothing acknowledges it explicitly, so the first AES frame
+        # decides: it either decrypts (confirmed) or it doesn't, in which case
+        # the entry is dropped and the full handshake runs after all.
+        self._logger.debug(
+            "%s reusing cached session key for %s", self._MODEL, self.address
+        )
+        self._dh = cached.dh
+        self._cipher = a5.SessionCipher(cached.key, cached.iv)
+        self._resume_pending = True
+        self._resumed = True
+        if self._recorder is not None:
+            self._recorder.record_session_key(self.address, cached.key, cached.iv)
+        self._send_verify()
+        self._spawn_task(
+            self._expire_cached_session(self._cipher),
+            name="a5-cached-key-timeout",
+        )
+
+    async def _expire_cached_session(self, cipher: a5.SessionCipher) -> None:
+        await asyncio.sleep(self.CACHED_SESSION_TIMEOUT)
+        if self._resume_pending and self._cipher is cipher and self._client:
+            self._reject_cached_session(
+                f"no frame decrypted within {self.CACHED_SESSION_TIMEOUT}s"
+            )
+
+    def _reject_cached_session(self, reason: str) -> None:
+        self._logger.debug(
+            "%s cached session key rejected (%s); running key exchange and "
+            "not resuming sessions of %s again",
+            self._MODEL,
+            reason,
+            self.address,
+        )
+        if self._key_store is not None:
+            self._key_store.discard(self.address)
+        self._resume_rejected = True
+        self._cipher = None
+        self._resume_pending = False
+        self._resumed = False
+        self._spawn_task(self._send_key_exchange(), name="a5-key-exchange")
+
+    def _restore_session_key(self, key: bytes, iv: bytes) -> None:
+        """Install a recorded session key (used by
+        :class:`~etekcity_esf551_ble.capture.CaptureReplayer`)."""
+        self._cipher = a5.SessionCipher(key, iv)
+        self._resume_pending = False
+
+    def _decrypt(self, parsed: a5.ParsedFrame) -> bytes | None:
+        """Decrypt an AES frame; the session's first one also settles the key."""
+        if self._cipher is None:
+            return None
+        if self._time_to_first_decrypt is not None:
+            return self._cipher.decrypt_payload(parsed)
+        plaintext = self._cipher.decrypt_payload(parsed, strict=True)
+        if self._resume_pending:
+            # Valid padding alone lets about one wrong key in 256 through, so
+            # a cached key is only confirmed by a frame that decodes sanely.
+            if plaintext is None:
+                self._reject_cached_session("frame did not decrypt")
+                return None
+            if not self._decodes_sanely(parsed, plaintext):
+                self._reject_cached_session("frame decrypted to an implausible reading")
+                return None
+        elif plaintext is None:
+            return self._cipher.decrypt_payload(parsed)
+        self._resume_pending = False
+        self._mark(SessionPhase.HANDSHAKE)
+        now = time.monotonic()
+        self._time_to_first_decrypt = now - (self._session_started_at or now)
+        self._logger.debug(
+            "%s first frame decrypted %.3fs into the session (%s)",
+            self._MODEL,
+            self._time_to_first_decrypt,
+            "cached key" if self._resumed else "key exchange",
+        )
+        if (
+            self._key_store is not None
+            and not self._resumed
+            and not self._resume_rejected
+        ):
+            self._key_store.put(
+                self.address,
+                CachedSession(self._cipher.key, self._cipher.iv, self._dh),
+            )
+        return plaintext
+
+    @classmethod
+    def _decodes_sanely(cls, parsed: a5.ParsedFrame, plaintext: bytes) -> bool:
+        """Whether a decrypted result or live frame holds a plausible weight."""
+        parse = (
+            cls._parse_result
+            if parsed.opcode == cls._RESULT_OPCODE
+            else a5.parse_measurement
+        )
+        measurement = parse(plaintext)
+        return (
+            measurement is not None
+            and 0 <= measurement.weight_kg <= a5.MAX_PLAUSIBLE_WEIGHT_KG
+        )
@@ -5,22 +5,17 @@ from __future__ import annotations
 from bleak.backends.characteristic import BleakGATTCharacteristic
 from bleak.backends.device import BLEDevice
 
-from ..const import (
-    ALIRO_CHARACTERISTIC_UUID,
-    IMPEDANCE_KEY,
-    WEIGHT_CHARACTERISTIC_UUID_NOTIFY,
-    WEIGHT_KEY,
-)
+from ..const import ALIRO_CHARACTERISTIC_UUID, WEIGHT_CHARACTERISTIC_UUID_NOTIFY
 from ..data import ScaleData, WeightUnit
 from ..efsa591s import protocol as a5
+from ..efsa591s.session import A5SessionResume
 from ..scale import GattScale, ScaleSessionError
 from . import protocol
 
 _STATUS_OPCODES = frozenset({0x4202, 0x4420, 0x413B, 0x413D, 0x4434, 0x4436})
-_RESULT_OPCODE = 0x4422
 
 
-class EFSC651Scale(GattScale):
+class EFSC651Scale(A5SessionResume, GattScale):
     """
     EFS-C651 Smart Fitness Scale.
 
@@ -38,14 +33,19 @@ class EFSC651Scale(GattScale):
     of a MAC (i.e. macOS without ``use_bdaddr``).
     """
 
+    _MODEL = "EFS-C651"
+    _RESULT_OPCODE = 0x4422
+    _parse_result = staticmethod(protocol.parse_result)
+
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
         self._write_char = None
         self._reasm = a5.FrameReassembler()
         self._seq = 0x0A
         self._dh: a5.DHParams | None = None
-        self._key: bytes | None = None
-        self._iv: bytes | None = None
+        # Built once per session at key establishment; every result frame and
+        # the unit command reuse its key schedule.
+        self._cipher: a5.SessionCipher | None = None
 
     def _next_seq(self) -> int:
         self._seq = (self._seq + 1) & 0xFF
@@ -76,23 +76,38 @@ class EFSC651Scale(GattScale):
         self._write_char = write_char
 
         self._reasm = a5.FrameReassembler()
-        self._key = None
-        self._iv = None
-        await self._client.start_notify(
-            notify_char,
-            lambda char, data: self._notification_handler(
-                char, data, ble_device.name, ble_device.address
-            ),
-        )
+        self._cipher = None
+        self._begin_session()
+        await self._start_notify(notify_char, ble_device)
+
+        await self._establish_session_key()
 
+    async def _send_key_exchange(self) -> None:
         self._dh = a5.generate_dh()
         frame = a5.build_key_exchange(self._next_seq(), self.address, self._dh)
         self._logger.debug("EFS-C651 sending key exchange: %s", frame.hex())
         await self._send_frame(frame)
 
+    def _send_verify(self) -> None:
+        verify = a5.build_key_verify(
+            self._next_seq(), self.address, self._cipher.iv, self._cipher
+        )
+        # Push the configured display unit right after VERIFY, the same way
+        # the app does on connect (resource 0xa163, encrypted with the session
+        # key/iv). Skipped when no unit is configured.
+        unit_frame = None
+        if self._display_unit is not None:
+            unit_frame = a5.build_set_unit(
+                self._next_seq(), int(self._display_unit), self._cipher
+            )
+        self._spawn_task(
+            self._send_verify_then_unit(verify, unit_frame),
+            name="efsc651-verify",
+        )
+
     async def _send_frame(self, frame: bytes) -> None:
         if self._client and self._write_char:
-            await self._client.write_gatt_char(self._write_char, frame, response=False)
+            await self._write_gatt_char(self._write_char, frame, response=False)
 
     async def _send_verify_then_unit(
         self, verify: bytes, unit_frame: bytes | None
@@ -108,51 +123,50 @@ class EFSC651Scale(GattScale):
         name: str,
         address: str,
     ) -> None:
-        for frame in self._reasm.feed(data):
+        for parsed in self._reasm.feed_parsed(data):
             try:
-                self._handle_frame(frame, name, address)
+                self._handle_parsed(parsed, name, address)
             except Exception as ex:  # pragma: no cover - defensive
                 self._logger.debug("EFS-C651 frame handling error: %s", ex)
 
     def _handle_frame(self, frame: bytes, name: str, address: str) -> None:
-        parsed = a5.parse_frame(frame)
-        if parsed is None:
-            return
+        if (parsed := a5.parse_frame(frame)) is not None:
+            self._handle_parsed(parsed, name, address)
 
+    def _handle_parsed(self, parsed: a5.ParsedFrame, name: str, address: str) -> None:
         if parsed.opcode == a5.OPCODE_KEY_EXCHANGE:
-            h = a5.parse_key_exchange_response(frame)
+            h = a5.key_exchange_public_value(parsed)
             if h is None or self._dh is None:
                 return
             shared = a5.compute_shared(h, self._dh.g, self._dh.d)
-            self._key = a5.derive_key(shared, self.address)
-            self._iv = a5.random_iv()
-            verify = a5.build_key_verify(
-                self._next_seq(), self.address, self._iv, self._key
+            self._cipher = a5.SessionCipher(
+                a5.derive_key(shared, self.address), a5.random_iv()
             )
-            unit_frame = None
-            if self._display_unit is not None:
-                unit_frame = a5.build_set_unit(
-                    self._next_seq(), int(self._display_unit), self._key, self._iv
+            self._resume_pending = False
+            self._resumed = False
+            if self._recorder is not None:
+                self._recorder.record_session_key(
+                    self.address, self._cipher.key, self._cipher.iv
                 )
-            self._spawn_task(
-                self._send_verify_then_unit(verify, unit_frame),
-                name="efsc651-verify",
-            )
-        elif parsed.opcode == _RESULT_OPCODE:
-            if not self._key or not self._iv:
+            self._send_verify()
+        elif parsed.opcode == self._RESULT_OPCODE:
+            if (plaintext := self._decrypt(parsed)) is None:
                 return
-            plaintext = a5.decrypt_frame_payload(self._key, self._iv, parsed)
             measurement = protocol.parse_result(plaintext)
             if measurement is None or measurement.weight_kg <= 0:
                 return
             self._emit(measurement, name, address)
         elif parsed.opcode == a5.OPCODE_MEASUREMENT:
+            # Ignored, except that the session's first one confirms (or
+            # rejects) the session key well before the result frame arrives.
+            if self._time_to_first_decrypt is None:
+                self._decrypt(parsed)
             return
         elif parsed.opcode not in _STATUS_OPCODES:
             self._logger.debug(
-                "EFS-C651 unhandled opcode 0x%04x: %s",
+                "EFS-C651 unhandled opcode 0x%04x, payload %s",
                 parsed.opcode,
-                frame.hex(),
+                parsed.payload.hex(),
             )
 
     def _emit(self, measurement: a5.Measurement, name: str, address: str) -> None:
@@ -166,7 +180,6 @@ class EFSC651Scale(GattScale):
             if measurement.display_unit is not None
             else self._display_unit
         )
-        scale_data.measurements = {WEIGHT_KEY: measurement.weight_kg}
-        if measurement.impedance:
-            scale_data.measurements[IMPEDANCE_KEY] = measurement.impedance
-        self._notification_callback(scale_data)
+        scale_data.weight = measurement.weight_kg
+        scale_data.impedance = measurement.impedance or None
+        self._deliver(scale_data)
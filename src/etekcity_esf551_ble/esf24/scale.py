@@ -1,7 +1,12 @@
 """ESF-24 scale implementation (experimental)."""
 
+import asyncio
 import logging
+import time
+from collections import deque
+from collections.abc import Callable
 
+from bleak import BleakClient
 from bleak.backends.characteristic import BleakGATTCharacteristic
 from bleak.backends.device import BLEDevice
 
@@ -9,7 +14,12 @@ from ..const import (
     ALIRO_CHARACTERISTIC_UUID,
     WEIGHT_CHARACTERISTIC_UUID_NOTIFY,
 )
-from ..scale import GattScale, ScaleSessionError
+from ..admission import AdmissionController
+from ..hub import ScaleHub
+from ..scheduler import ConnectionScheduler
+from ..scale import ClientFactory, GattScale, ScaleSessionError
+from ..service_cache import ServiceCache
+from ..timing import LatencyHistogram, SessionPhase
 from ..data import (
     BluetoothScanningMode,
     ScaleData,
@@ -31,6 +41,8 @@ _STATE_MEASUREMENT_INIT = 2
 _STATE_SETTLING_LOGGED = 4
 # Set once the stored-measurement query has been sent this session.
 _STATE_STORED_QUERY = 8
+# Set while fast-start commands await the set-time ack; prompts are held.
+_STATE_FAST_START = 16
 
 # Ack of our set-time (0x20) command, capture-verified: 21 05 15 01 3c.
 _SET_TIME_ACK_FRAME_PREFIX = b"\x21\x05\x15"
@@ -40,6 +52,52 @@ _SET_TIME_ACK_FRAME_LENGTH = 5
 # record whose shape the parser rejects still reaches the handler's warning.
 _STORED_MEASUREMENT_OPCODE = b"\x23"
 
+# Stored records remembered for deduplication, per client.
+_MAX_SEEN_STORED = 1024
+
+# Commands the client sends. Each but end-measurement is answered by a
+# frame (the time prompt, the set-time ack, the first stored record), which
+# confirms delivery and times the round trip, so those go out as
+# write-without-response when the characteristic allows it. End-measurement
+# has no answer before the scale disconnects: it keeps the write response.
+_CMD_UNIT_UPDATE = "unit_update"
+_CMD_SET_TIME = "set_time"
+_CMD_STORED_QUERY = "stored_query"
+_CMD_END_MEASUREMENT = "end_measurement"
+_ANSWERED_COMMANDS = frozenset({_CMD_UNIT_UPDATE, _CMD_SET_TIME, _CMD_STORED_QUERY})
+
+# Prompted command -> (state bit set once it is sent, debug message).
+_PROMPTS = {
+    _CMD_UNIT_UPDATE: (
+        _STATE_UNIT_SET,
+        "ESF-24 unit negotiation frame received from %s. Scheduling update.",
+    ),
+    _CMD_SET_TIME: (
+        _STATE_MEASUREMENT_INIT,
+        "ESF-24 measurement initiation requested by %s. Sending timestamp.",
+    ),
+}
+
+
+class CommandStats:
+    """Queueing and round-trip latency of one ESF-24 command."""
+
+    __slots__ = ("sent", "failed", "queued", "round_trip")
+
+    def __init__(self) -> None:
+        #: Writes that went out.
+        self.sent = 0
+        #: Writes that did not go out (no client, or the write raised).
+        self.failed = 0
+        #: Seconds from being queued to being written.
+        self.queued = LatencyHistogram()
+        #: Seconds from the write to the scale's answer, or to the write
+        #: response for a command the scale does not answer.
+        self.round_trip = LatencyHistogram()
+
+    def __repr__(self) -> str:
+        return f"CommandStats(sent={self.sent}, failed={self.failed})"
+
 
 class ESF24Scale(GattScale):
     """
@@ -56,12 +114,38 @@ class ESF24Scale(GattScale):
     scale (there is no separate delete command), so enabling this hides
     those readings from any other client: leave it off if the official
     VeSync app should still import them. Drained records are logged at
-    debug level and discarded for now.
+    debug level and discarded, unless ``stored_measurements_callback`` is
+    given: then the drain is enabled and the records of each drain are
+    delivered to it in one call, as a list of :class:`ScaleData` in record
+    order whose ``received_at`` is when the reading was taken. Records the
+    client already delivered (a drain repeated after a dropped connection)
+    are left out, and an incomplete drain is delivered when the connection
+    ends. The live ``notification_callback`` never sees stored records.
+
+    Commands go out through a per-session queue, in the order the
+    notification handler issues them, on the command characteristic
+    resolved at session start. ``command_stats`` maps each command
+    (``"unit_update"``, ``"set_time"``, ``"stored_query"``,
+    ``"end_measurement"``) to its :class:`CommandStats`.
+
+    ``fast_start`` (default ``False``) sends the unit and time commands
+    right after subscribing instead of waiting for the scale to prompt for
+    each, saving those round trips. Prompts that arrive meanwhile are held.
+    If the set-time ack does not arrive within ``_FAST_START_TIMEOUT``
+    seconds, the held prompts are answered as in a normal session
+    (``fast_start_fallbacks``); after ``_MAX_FAST_START_MISSES`` such
+    sessions in a row the client waits for the prompts from then on.
 
     Limitations:
     - No hardware/software version reading
     """
 
+    # Seconds to wait for the set-time ack after fast-start commands.
+    _FAST_START_TIMEOUT = 1.0
+    # Consecutive unacknowledged fast starts before the client stops trying:
+    # one can be a crossed prompt or a slow link rather than the firmware.
+    _MAX_FAST_START_MISSES = 3
+
     def __init__(
         self,
         address: str,
@@ -74,6 +158,13 @@ class ESF24Scale(GattScale):
         logger: logging.Logger | None = None,
         *,
         clear_stored_measurements: bool = False,
+        stored_measurements_callback: Callable[[list[ScaleData]], None] | None = None,
+        hub: ScaleHub | None = None,
+        client_factory: ClientFactory | None = None,
+        scheduler: ConnectionScheduler | None = None,
+        admission: AdmissionController | None = None,
+        service_cache: ServiceCache | None = None,
+        fast_start: bool = False,
     ) -> None:
         enforced_unit = (
             WeightUnit(display_unit) if display_unit is not None else WeightUnit.KG
@@ -87,9 +178,41 @@ class ESF24Scale(GattScale):
             bleak_scanner_backend,
             cooldown_seconds,
             logger,
+            hub=hub,
+            client_factory=client_factory,
+            scheduler=scheduler,
+            admission=admission,
+            service_cache=service_cache,
         )
         self._state_mask = 0
-        self._clear_stored_measurements = clear_stored_measurements
+        self._stored_callback = stored_measurements_callback
+        self._clear_stored_measurements = (
+            clear_stored_measurements or stored_measurements_callback is not None
+        )
+        # Records of the drain in progress, by 1-based index.
+        self._stored_batch: dict[int, ScaleData] = {}
+        # (timestamp, weight, r1, r2) of delivered records, oldest first.
+        self._seen_stored: dict[tuple[int, float, int, int], None] = {}
+        self._command_char: BleakGATTCharacteristic | None = None
+        self._write_without_response = False
+        # (command, data, monotonic time queued), oldest first, and the task
+        # writing them.
+        self._commands: deque[tuple[str, bytearray, float]] = deque()
+        self._writer: asyncio.Task | None = None
+        # Answered command -> monotonic time it was written.
+        self._awaiting: dict[str, float] = {}
+        self.command_stats: dict[str, CommandStats] = {}
+        self._fast_start = fast_start
+        # Sessions in a row whose fast-start commands went unacknowledged;
+        # at _MAX_FAST_START_MISSES, _fast_start_rejected is set and later
+        # sessions wait for the prompts.
+        self._fast_start_misses = 0
+        self._fast_start_rejected = False
+        self._fast_start_timer: asyncio.TimerHandle | None = None
+        # Prompts that arrived while fast-starting, answered on fallback.
+        self._held_prompts: list[str] = []
+        #: Sessions whose fast-start commands were not acknowledged in time.
+        self.fast_start_fallbacks = 0
 
     @GattScale.display_unit.setter
     def display_unit(self, value):
@@ -100,27 +223,36 @@ class ESF24Scale(GattScale):
     async def _start_scale_session(self, ble_device: BLEDevice) -> None:
         """Handle post-connection setup and start notifications."""
         self._state_mask = 0
+        self._flush_stored_batch()
+        # Cleared up front so a failed session never writes through a
+        # characteristic of a previous (now disconnected) client.
+        self._command_char = None
+        self._commands.clear()
+        self._awaiting.clear()
+        self._cancel_fast_start()
         self._logger.debug(
             "ESF-24 starting session for device %s (%s)",
             ble_device.name,
             ble_device.address,
         )
-        if weight_char := self._client.services.get_characteristic(
+        weight_char = self._client.services.get_characteristic(
             WEIGHT_CHARACTERISTIC_UUID_NOTIFY
-        ):
-            await self._client.start_notify(
-                weight_char,
-                lambda char, data: self._notification_handler(
-                    char, data, ble_device.name, ble_device.address
-                ),
-            )
-        else:
-            # Service discovery can transiently come back without the notify
-            # characteristic; raising lets the base disconnect and retry on the next
-            # advertisement instead of parking a dead client.
-            raise ScaleSessionError(
-                "ESF-24 weight notification characteristic not found"
-            )
+        )
+        command_char = self._client.services.get_characteristic(
+            ALIRO_CHARACTERISTIC_UUID
+        )
+        if not weight_char or not command_char:
+            # Service discovery can transiently come back incomplete; raising
+            # lets the base disconnect and retry on the next advertisement
+            # instead of parking a dead client.
+            raise ScaleSessionError("ESF-24 required characteristics not found")
+        self._command_char = command_char
+        self._write_without_response = (
+            "write-without-response" in command_char.properties
+        )
+        await self._start_notify(weight_char, ble_device)
+        if self._fast_start and not self._fast_start_rejected:
+            self._start_fast()
 
     def _notification_handler(
         self, _: BleakGATTCharacteristic, payload: bytearray, name: str, address: str
@@ -133,9 +265,7 @@ class ESF24Scale(GattScale):
                 "ESF-24 stable weight received (%s). Scheduling measurement end command.",
                 address,
             )
-            self._spawn_task(
-                self._safe_write(CMD_END_MEASUREMENT), name="esf24-end-measurement"
-            )
+            self._send_command(_CMD_END_MEASUREMENT, CMD_END_MEASUREMENT)
 
             scale_data = ScaleData()
             scale_data.name = name
@@ -143,7 +273,7 @@ class ESF24Scale(GattScale):
             scale_data.display_unit = self.display_unit
             scale_data.measurements = data
 
-            self._notification_callback(scale_data)
+            self._deliver(scale_data)
         elif is_measurement_frame(payload):
             # Measurement frames stream continuously while the weight settles,
             # dozens per weigh-in, and only the final one carries a reading.
@@ -155,23 +285,11 @@ class ESF24Scale(GattScale):
                     address,
                 )
         elif len(payload) == 15 and payload[0:3] == b"\x12\x0f\x15":
-            if not self._state_mask & _STATE_UNIT_SET:
-                self._state_mask |= _STATE_UNIT_SET
-                self._logger.debug(
-                    "ESF-24 unit negotiation frame received from %s. Scheduling update.",
-                    address,
-                )
-                cmd = build_unit_update_command(self.display_unit)
-                self._spawn_task(self._safe_write(cmd), name="esf24-unit-update")
+            self._answer_prompt(_CMD_UNIT_UPDATE, address)
         elif len(payload) == 11 and payload[0:3] == b"\x14\x0b\x15":
-            if not self._state_mask & _STATE_MEASUREMENT_INIT:
-                self._state_mask |= _STATE_MEASUREMENT_INIT
-                self._logger.debug(
-                    "ESF-24 measurement initiation requested by %s. Sending timestamp.",
-                    address,
-                )
-                cmd = build_measurement_initiation_command()
-                self._spawn_task(self._safe_write(cmd), name="esf24-measurement-init")
+            # The time prompt answers our unit update.
+            self._command_answered(_CMD_UNIT_UPDATE)
+            self._answer_prompt(_CMD_SET_TIME, address)
         elif (
             len(payload) == _SET_TIME_ACK_FRAME_LENGTH
             and payload[0:3] == _SET_TIME_ACK_FRAME_PREFIX
@@ -181,17 +299,101 @@ class ESF24Scale(GattScale):
             # the trigger for the stored-measurement query because that is
             # where the vendor app sends it (before end-measurement).
             self._logger.debug("ESF-24 set-time acknowledged by %s.", address)
+            self._command_answered(_CMD_SET_TIME)
+            self._fast_start_confirmed()
+            self._mark(SessionPhase.HANDSHAKE)
             self._query_stored_measurements(address)
         elif payload[0:1] == _STORED_MEASUREMENT_OPCODE:
             # Dispatched on the opcode alone, not the full frame shape: a
             # 0x23 the parser rejects is a protocol anomaly the handler
             # should warn about, not an unknown payload to pass over.
-            self._handle_stored_measurement(payload, address)
+            self._command_answered(_CMD_STORED_QUERY)
+            self._handle_stored_measurement(payload, name, address)
         else:
             self._logger.debug(
                 "ESF-24 ignoring unrecognized payload: %s", payload.hex()
             )
 
+    def _answer_prompt(self, command: str, address: str) -> None:
+        """Send ``command`` once per session, when the scale prompts for it."""
+        if self._state_mask & _STATE_FAST_START:
+            # Our speculative commands crossed the prompt, or the scale
+            # dropped them; the fallback answers it if no ack arrives.
+            self._logger.debug(
+                "ESF-24 %s prompt from %s while fast-starting; holding it.",
+                command,
+                address,
+            )
+            if command not in self._held_prompts:
+                self._held_prompts.append(command)
+            return
+        state, message = _PROMPTS[command]
+        if self._state_mask & state:
+            return
+        self._state_mask |= state
+        self._logger.debug(message, address)
+        self._send_command(command, self._build_command(command))
+
+    def _build_command(self, command: str) -> bytearray:
+        if command == _CMD_UNIT_UPDATE:
+            return build_unit_update_command(self.display_unit)
+        return build_measurement_initiation_command()
+
+    def _start_fast(self) -> None:
+        """Send the unit and time commands without waiting for the prompts."""
+        self._state_mask |= _STATE_FAST_START
+        self._held_prompts.clear()
+        self._logger.debug("ESF-24 fast start: sending unit and time up front")
+        for command in (_CMD_UNIT_UPDATE, _CMD_SET_TIME):
+            self._send_command(command, self._build_command(command))
+        self._fast_start_timer = asyncio.get_running_loop().call_later(
+            self._FAST_START_TIMEOUT, self._fast_start_fallback
+        )
+
+    def _fast_start_confirmed(self) -> None:
+        """The set-time ack arrived: the scale took the speculative commands."""
+        if self._fast_start_timer is None:
+            return
+        self._cancel_fast_start()
+        self._fast_start_misses = 0
+        # Prompts still on their way ask for what the scale already has.
+        self._state_mask |= _STATE_UNIT_SET | _STATE_MEASUREMENT_INIT
+
+    def _fast_start_fallback(self) -> None:
+        """No set-time ack in time: answer the held prompts like a normal session."""
+        self._fast_start_timer = None
+        self.fast_start_fallbacks += 1
+        self._fast_start_misses += 1
+        if self._fast_start_misses >= self._MAX_FAST_START_MISSES:
+            self._fast_start_rejected = True
+            self._logger.info(
+                "ESF-24 %s did not acknowledge the fast-start commands %d "
+                "sessions in a row; waiting for its prompts from now on",
+                self.address,
+                self._fast_start_misses,
+            )
+        else:
+            self._logger.debug(
+                "ESF-24 %s did not acknowledge the fast-start commands; "
+                "answering its prompts",
+                self.address,
+            )
+        self._answer_held_prompts()
+
+    def _answer_held_prompts(self) -> None:
+        """Leave fast start and answer the prompts held meanwhile."""
+        self._state_mask &= ~_STATE_FAST_START
+        prompts, self._held_prompts = self._held_prompts, []
+        for command in prompts:
+            self._answer_prompt(command, self.address)
+
+    def _cancel_fast_start(self) -> None:
+        if self._fast_start_timer is not None:
+            self._fast_start_timer.cancel()
+            self._fast_start_timer = None
+        self._state_mask &= ~_STATE_FAST_START
+        self._held_prompts.clear()
+
     def _query_stored_measurements(self, address: str) -> None:
         """Send the stored-measurement query once per session (if enabled).
 
@@ -208,19 +410,19 @@ class ESF24Scale(GattScale):
             "ESF-24 querying stored offline measurements on %s to clear them.",
             address,
         )
-        self._spawn_task(
-            self._safe_write(build_stored_measurement_query()),
-            name="esf24-stored-query",
-        )
+        self._send_command(_CMD_STORED_QUERY, build_stored_measurement_query())
 
-    def _handle_stored_measurement(self, payload: bytearray, address: str) -> None:
+    def _handle_stored_measurement(
+        self, payload: bytearray, name: str, address: str
+    ) -> None:
         """Handle a stored offline-measurement record.
 
         Sent by the scale only in response to our stored-measurement
         query, one frame per offline reading (``count=0`` when the store
         is empty). Delivery deletes the record from the scale, so simply
-        receiving and discarding it here is what clears the store. Never
-        fires the measurement callback.
+        receiving it here is what clears the store. Never fires the
+        measurement callback; with a stored-measurements callback, the
+        record joins the batch delivered once record ``count`` arrives.
         """
         if not is_stored_measurement_frame(payload):
             self._logger.warning(
@@ -245,9 +447,10 @@ class ESF24Scale(GattScale):
             )
             return
         self._logger.debug(
-            "ESF-24 discarding stored offline measurement %d/%d from %s: "
+            "ESF-24 %s stored offline measurement %d/%d from %s: "
             "weight=%.2f kg, r1=%d, r2=%d, timestamp=%d (delivery clears it "
             "from the scale).",
+            "collecting" if self._stored_callback else "discarding",
             frame.index,
             frame.count,
             address,
@@ -256,27 +459,113 @@ class ESF24Scale(GattScale):
             frame.resistance_2,
             frame.timestamp,
         )
+        if self._stored_callback is None:
+            return
+        key = (
+            frame.timestamp,
+            frame.weight_kg,
+            frame.resistance_1,
+            frame.resistance_2,
+        )
+        if key in self._seen_stored:
+            self._logger.debug("ESF-24 stored measurement already delivered")
+        else:
+            scale_data = ScaleData(
+                name=name,
+                address=address,
+                display_unit=self.display_unit,
+                measurements=frame.measurements,
+                received_at=float(frame.timestamp),
+            )
+            self._stored_batch[frame.index] = scale_data
+            self._seen_stored[key] = None
+            if len(self._seen_stored) > _MAX_SEEN_STORED:
+                del self._seen_stored[next(iter(self._seen_stored))]
+        if frame.index >= frame.count:
+            self._flush_stored_batch()
+
+    def _flush_stored_batch(self) -> None:
+        """Deliver the collected stored records, in record order."""
+        if not self._stored_batch:
+            return
+        batch = [data for _, data in sorted(self._stored_batch.items())]
+        self._stored_batch.clear()
+        if self._store is not None:
+            for scale_data in batch:
+                self._store.record(self, scale_data)
+        self._stored_callback(batch)
+
+    def _unavailable_callback(self, client: BleakClient) -> None:
+        # Delivered records are gone from the scale: hand over what arrived
+        # of an interrupted drain rather than dropping it.
+        self._flush_stored_batch()
+        self._commands.clear()
+        self._awaiting.clear()
+        self._cancel_fast_start()
+        super()._unavailable_callback(client)
+
+    def _stats(self, command: str) -> CommandStats:
+        if (stats := self.command_stats.get(command)) is None:
+            stats = self.command_stats[command] = CommandStats()
+        return stats
 
-    async def _safe_write(self, data: bytearray) -> None:
-        """Write GATT char safely with error handling."""
+    def _send_command(self, command: str, data: bytearray) -> None:
+        """Queue ``data`` behind the session's earlier commands."""
+        self._commands.append((command, data, time.monotonic()))
+        if self._writer is None or self._writer.done():
+            self._writer = self._spawn_task(
+                self._write_commands(), name="esf24-command-writer"
+            )
+
+    async def _write_commands(self) -> None:
+        """Write the queued commands one at a time, oldest first."""
+        while self._commands:
+            command, data, queued_at = self._commands.popleft()
+            stats = self._stats(command)
+            sent_at = time.monotonic()
+            stats.queued.add(sent_at - queued_at)
+            answered = command in _ANSWERED_COMMANDS
+            if answered:
+                self._awaiting[command] = sent_at
+            if not await self._safe_write(
+                data, response=not (answered and self._write_without_response)
+            ):
+                self._awaiting.pop(command, None)
+                stats.failed += 1
+                continue
+            stats.sent += 1
+            if not answered:
+                stats.round_trip.add(time.monotonic() - sent_at)
+
+    def _command_answered(self, command: str) -> None:
+        """Record ``command``'s round trip: the scale's answer arrived."""
+        if (sent_at := self._awaiting.pop(command, None)) is not None:
+            self._stats(command).round_trip.add(time.monotonic() - sent_at)
+
+    async def _safe_write(self, data: bytearray, response: bool = True) -> bool:
+        """Write a command safely with error handling; True if it went out."""
         if not self._client:
-            # Benign: writes are scheduled from the notification handler while
+            # Benign: writes are queued from the notification handler while
             # the connection is live, so this only fires when a disconnect wins
             # the race to the next event-loop tick. Nothing to act on.
             self._logger.debug("ESF-24 cannot send command; no active client")
-            return
-        if not (
-            command_char := self._client.services.get_characteristic(
-                ALIRO_CHARACTERISTIC_UUID
-            )
-        ):
+            return False
+        if self._command_char is None:
             self._logger.warning(
-                "ESF-24 command characteristic not found, skipping write"
+                "ESF-24 command characteristic not resolved, skipping write"
             )
-            return
+            return False
         try:
-            await self._client.write_gatt_char(command_char, data)
+            await self._write_gatt_char(self._command_char, data, response)
             self._logger.debug("ESF-24 command sent: %s", data.hex())
         except Exception as ex:
             self._logger.error("ESF-24 failed to send command %s: %s", data.hex(), ex)
             self._state_mask = 0
+            if self._fast_start_timer is not None:
+                # Not the scale ignoring fast start: stop waiting for the ack
+                # (without counting a miss) and let the prompts drive.
+                self._fast_start_timer.cancel()
+                self._fast_start_timer = None
+                self._answer_held_prompts()
+            return False
+        return True
@@ -40,12 +40,7 @@ class ESF551Scale(GattScale):
         if weight_char := self._client.services.get_characteristic(
             WEIGHT_CHARACTERISTIC_UUID_NOTIFY
         ):
-            await self._client.start_notify(
-                weight_char,
-                lambda char, data: self._notification_handler(
-                    char, data, ble_device.name, ble_device.address
-                ),
-            )
+            await self._start_notify(weight_char, ble_device)
         else:
             # Service discovery can transiently come back without the notify
             # characteristic; raising lets the base disconnect and retry on the
@@ -84,7 +79,7 @@ class ESF551Scale(GattScale):
             scale_data.measurements = parsed_data
 
             # Call user's callback
-            self._notification_callback(scale_data)
+            self._deliver(scale_data)
 
     async def _setup_after_connection(self) -> None:
         """
@@ -125,7 +120,7 @@ class ESF551Scale(GattScale):
                     ALIRO_CHARACTERISTIC_UUID
                 ):
                     payload = build_unit_update_payload(self._display_unit)
-                    await self._client.write_gatt_char(unit_char, payload, False)
+                    await self._write_gatt_char(unit_char, payload, False)
                     self._logger.debug(
                         "ESF-551 unit change request sent: %s (payload: %s)",
                         self._display_unit,
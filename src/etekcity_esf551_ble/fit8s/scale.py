@@ -6,6 +6,7 @@ from collections.abc import Callable
 from bleak.backends.scanner import BaseBleakScanner
 
 from ..const import DISPLAY_UNIT_KEY
+from ..hub import ScaleHub
 from ..scale import AdvertisementScale
 from ..data import BluetoothScanningMode, ScaleData, WeightUnit
 from .protocol import parse
@@ -24,7 +25,7 @@ class FIT8SScale(AdvertisementScale):
     def __init__(
         self,
         address: str,
-        notification_callback: Callable[[ScaleData], None],
+        notification_callback: Callable[[ScaleData], None] | None,
         display_unit: WeightUnit = None,
         scanning_mode: BluetoothScanningMode = BluetoothScanningMode.ACTIVE,
         adapter: str | None = None,
@@ -32,6 +33,7 @@ class FIT8SScale(AdvertisementScale):
         logger: logging.Logger | None = None,
         *,
         cooldown_seconds: int = 10,
+        hub: ScaleHub | None = None,
     ) -> None:
         super().__init__(
             address,
@@ -42,6 +44,7 @@ class FIT8SScale(AdvertisementScale):
             bleak_scanner_backend,
             logger,
             cooldown_seconds=cooldown_seconds,
+            hub=hub,
         )
 
     def _parse(self, payload: bytearray) -> dict[str, float | int] | None:
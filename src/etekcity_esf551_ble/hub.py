@@ -0,0 +1,151 @@
+"""One BLE scanner shared by any number of scale clients."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import TYPE_CHECKING
+
+from bleak.backends.device import BLEDevice
+from bleak.backends.scanner import AdvertisementData, BaseBleakScanner
+
+from .data import BluetoothScanningMode
+from .scale import create_platform_scanner
+
+if TYPE_CHECKING:
+    from .scale import EtekcitySmartFitnessScale
+    from .scanning import HybridScanner
+    from .scheduler import ConnectionScheduler
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ScaleHub:
+    """
+    Shared scanner for gateways that watch many scales at once.
+
+    A standalone scale client runs its own scanner and discards every
+    advertisement that isn't from its address, so N clients mean N discovery
+    sessions on the adapter, each seeing every advertisement in range. A hub
+    runs a single scanner and hands each advertisement to the one client
+    registered for its address (a dict lookup), so the work per advertisement
+    no longer grows with the number of scales.
+
+    Construct the clients with ``hub=...``; their ``async_start`` /
+    ``async_stop`` then register and unregister them here, which can happen
+    at any time without restarting discovery. The hub's own scanner is
+    started and stopped by its owner via :meth:`async_start` /
+    :meth:`async_stop`::
+
+        hub = ScaleHub()
+        await hub.async_start()
+        scale = ESF551Scale(address, callback, hub=hub)
+        await scale.async_start()  # registered; no second scanner
+
+    Cooldown, connection and parsing stay per client: the hub only routes.
+    With several adapters, run one hub per adapter and share a
+    :class:`~.scheduler.ConnectionScheduler` between the hubs and clients;
+    each hub then tells the scheduler which scales its adapter can reach.
+    """
+
+    def __init__(
+        self,
+        scanning_mode: BluetoothScanningMode = BluetoothScanningMode.ACTIVE,
+        adapter: str | None = None,
+        bleak_scanner_backend: BaseBleakScanner = None,
+        logger: logging.Logger | None = None,
+        *,
+        scheduler: ConnectionScheduler | None = None,
+    ) -> None:
+        """
+        Initialize the hub.
+
+        Args:
+            scanning_mode: Mode for BLE scanning (ACTIVE, PASSIVE or HYBRID)
+            adapter: Bluetooth adapter to use (Linux only)
+            bleak_scanner_backend: Optional custom BLE scanner backend
+            logger: Optional logger instance. If not provided, uses the
+                    module's logger.
+            scheduler: Optional :class:`~.scheduler.ConnectionScheduler` to
+                       report sightings to, as seen through ``adapter``.
+        """
+        self._logger = logger or _LOGGER
+        self._adapter = adapter
+        self._scheduler = scheduler
+        self._scales: dict[str, EtekcitySmartFitnessScale] = {}
+        if bleak_scanner_backend is None:
+            self._scanner = create_platform_scanner(
+                self._advertisement_callback,
+                scanning_mode,
+                adapter,
+                escalate_for=lambda device, _: device.address in self._scales,
+            )
+        else:
+            self._scanner = bleak_scanner_backend
+            self._scanner.register_detection_callback(self._advertisement_callback)
+        self._lock = asyncio.Lock()
+
+    @property
+    def scanner(self) -> BaseBleakScanner | HybridScanner:
+        """The shared scanner backend."""
+        return self._scanner
+
+    @property
+    def scales(self) -> Mapping[str, EtekcitySmartFitnessScale]:
+        """Registered clients, keyed by address (read-only view)."""
+        return MappingProxyType(self._scales)
+
+    def add(self, scale: EtekcitySmartFitnessScale) -> None:
+        """
+        Route advertisements from ``scale.address`` to ``scale``.
+
+        Raises ValueError if a different client is already registered for
+        that address; registering the same client again is a no-op.
+        """
+        registered = self._scales.get(scale.address)
+        if registered is scale:
+            return
+        if registered is not None:
+            raise ValueError(
+                f"A scale is already registered for address {scale.address}"
+            )
+        self._scales[scale.address] = scale
+        self._logger.debug("Registered scale %s with the hub", scale.address)
+
+    def remove(self, scale: EtekcitySmartFitnessScale) -> None:
+        """Stop routing advertisements to ``scale``. Unknown clients are ignored."""
+        if self._scales.get(scale.address) is scale:
+            del self._scales[scale.address]
+            self._logger.debug("Unregistered scale %s from the hub", scale.address)
+
+    async def _advertisement_callback(
+        self, ble_device: BLEDevice, advertisement_data: AdvertisementData
+    ) -> None:
+        """Dispatch an advertisement to the client registered for its address."""
+        if self._scheduler is not None:
+            self._scheduler.observe(ble_device, self._adapter)
+        if (scale := self._scales.get(ble_device.address)) is None:
+            return
+        await scale._advertisement_callback(ble_device, advertisement_data)
+
+    async def async_start(self) -> None:
+        """Start the shared scanner."""
+        self._logger.debug("Starting ScaleHub")
+        try:
+            async with self._lock:
+                await self._scanner.start()
+        except Exception as ex:
+            self._logger.error("Failed to start scanner: %s", ex)
+            raise
+
+    async def async_stop(self) -> None:
+        """Stop the shared scanner. Registered clients stay registered."""
+        self._logger.debug("Stopping ScaleHub")
+        try:
+            async with self._lock:
+                await self._scanner.stop()
+        except Exception as ex:
+            self._logger.error("Failed to stop scanner: %s", ex)
+            raise
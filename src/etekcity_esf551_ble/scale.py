@@ -5,8 +5,8 @@ import asyncio
 import logging
 import time
 import platform
-from collections.abc import Callable
-from typing import Any
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING, Any
 
 from bleak import BleakClient
 from bleak.assigned_numbers import AdvertisementDataType
@@ -19,8 +19,22 @@ from bleak.backends.scanner import (
 )
 from bleak_retry_connector import establish_connection
 
+from .admission import AdmissionController, AdmissionDropped
 from .data import BluetoothScanningMode, ScaleData, WeightUnit
-
+from .detection import advertisement_filter_patterns
+from .scanning import AdvertisementPredicate, HybridScanner
+from .scheduler import ConnectionPriority
+from .stream import MeasurementStream, OverflowPolicy
+from .timing import SessionPhase, SessionTiming
+
+if TYPE_CHECKING:
+    from .capture import CaptureRecorder
+    from .cooldown import AdaptiveCooldown
+    from .hub import ScaleHub
+    from .scheduler import ConnectionScheduler
+    from .service_cache import ServiceCache
+    from .store import MeasurementStore
+    from .timing import LatencyMonitor
 
 SYSTEM = platform.system()
 IS_LINUX = SYSTEM == "Linux"
@@ -41,14 +55,93 @@ class ScaleSessionError(Exception):
 if IS_LINUX:
     from bleak.args.bluez import BlueZScannerArgs, OrPattern
 
+    # The BlueZ advertisement monitor only lets scale advertisements
+    # through; see advertisement_filter_patterns().
     PASSIVE_OR_PATTERNS = [
-        OrPattern(0, AdvertisementDataType.FLAGS, b"\x02"),
-        OrPattern(0, AdvertisementDataType.FLAGS, b"\x06"),
-        OrPattern(0, AdvertisementDataType.FLAGS, b"\x1a"),
+        OrPattern(start, AdvertisementDataType(ad_type), content)
+        for start, ad_type, content in advertisement_filter_patterns()
     ]
     PASSIVE_SCANNER_ARGS = BlueZScannerArgs(or_patterns=PASSIVE_OR_PATTERNS)
 
 
+def create_platform_scanner(
+    detection_callback: Callable[[BLEDevice, AdvertisementData], Any],
+    scanning_mode: BluetoothScanningMode = BluetoothScanningMode.ACTIVE,
+    adapter: str | None = None,
+    *,
+    escalate_for: AdvertisementPredicate | None = None,
+) -> BaseBleakScanner | HybridScanner:
+    """
+    Build the platform's bleak scanner backend, configured the way every
+    scale (and :class:`~.hub.ScaleHub`) scans.
+
+    Passive scanning and adapter selection only exist on Linux; elsewhere
+    the scanner is active, and on macOS it reports real MAC addresses
+    instead of CoreBluetooth UUIDs. ``HYBRID`` mode builds a
+    :class:`~.scanning.HybridScanner` over a passive and an active scanner,
+    going active for advertisements ``escalate_for`` accepts.
+
+    A passive scanner only receives advertisements from scales, filtered by
+    BlueZ to those of any scale :func:`~.detection.detect_model` recognizes
+    (:func:`~.detection.advertisement_filter_patterns`).
+    """
+    if scanning_mode == BluetoothScanningMode.HYBRID:
+        if IS_LINUX and escalate_for is not None:
+            scanner = HybridScanner(
+                create_platform_scanner(None, BluetoothScanningMode.PASSIVE, adapter),
+                create_platform_scanner(None, BluetoothScanningMode.ACTIVE, adapter),
+                escalate_for,
+            )
+            scanner.register_detection_callback(detection_callback)
+            return scanner
+        scanning_mode = BluetoothScanningMode.ACTIVE
+
+    scanner_kwargs: dict[str, Any] = {
+        "detection_callback": detection_callback,
+        "service_uuids": None,
+        "scanning_mode": BluetoothScanningMode.ACTIVE,
+        "bluez": {},
+        "cb": {},
+    }
+
+    if IS_LINUX:
+        # Only Linux supports multiple adapters
+        if adapter:
+            scanner_kwargs["adapter"] = adapter
+        if scanning_mode == BluetoothScanningMode.PASSIVE:
+            scanner_kwargs["bluez"] = PASSIVE_SCANNER_ARGS
+            scanner_kwargs["scanning_mode"] = BluetoothScanningMode.PASSIVE
+    elif IS_MACOS:
+        # We want mac address on macOS
+        scanner_kwargs["cb"] = {"use_bdaddr": True}
+
+    PlatformBleakScanner, _ = get_platform_scanner_backend_type()
+    return PlatformBleakScanner(**scanner_kwargs)
+
+
+#: Opens the GATT connection for a :class:`GattScale`:
+#: ``await factory(ble_device, name, disconnected_callback)`` returns a
+#: connected client offering the parts of the ``BleakClient`` API the scale
+#: classes use (``is_connected``, ``services``, ``start_notify``,
+#: ``read_gatt_char``, ``write_gatt_char``, ``disconnect``) and calls
+#: ``disconnected_callback(client)`` when the link drops.
+ClientFactory = Callable[
+    [BLEDevice, str, Callable[[BleakClient], None]], Awaitable[BleakClient]
+]
+
+
+async def connect_bleak_client(
+    ble_device: BLEDevice,
+    name: str,
+    disconnected_callback: Callable[[BleakClient], None],
+) -> BleakClient:
+    """Default :data:`ClientFactory`: a real ``BleakClient``, connected with
+    bleak-retry-connector's retries."""
+    return await establish_connection(
+        BleakClient, ble_device, name, disconnected_callback
+    )
+
+
 class EtekcitySmartFitnessScale(abc.ABC):
     """
     Abstract base class for Etekcity Smart Fitness Scale implementations.
@@ -74,7 +167,7 @@ class EtekcitySmartFitnessScale(abc.ABC):
     def __init__(
         self,
         address: str,
-        notification_callback: Callable[[ScaleData], None],
+        notification_callback: Callable[[ScaleData], None] | None,
         display_unit: WeightUnit = None,
         scanning_mode: BluetoothScanningMode = BluetoothScanningMode.ACTIVE,
         adapter: str | None = None,
@@ -82,23 +175,34 @@ class EtekcitySmartFitnessScale(abc.ABC):
         logger: logging.Logger | None = None,
         *,
         cooldown_seconds: int = 0,
+        hub: ScaleHub | None = None,
     ) -> None:
         """
         Initialize the scale interface.
 
         Args:
             address: Bluetooth address of the scale
-            notification_callback: Function to call when weight data is received
+            notification_callback: Function to call when weight data is received.
+                                   May be None when readings are consumed
+                                   through :meth:`measurements` instead.
             display_unit: Preferred weight unit (KG, LB, or ST). Where the model
                           supports it, the scale is instructed to change its
                           display unit to this value.
-            scanning_mode: Mode for BLE scanning (ACTIVE or PASSIVE)
+            scanning_mode: Mode for BLE scanning (ACTIVE, PASSIVE or HYBRID)
             adapter: Bluetooth adapter to use (Linux only)
             bleak_scanner_backend: Optional custom BLE scanner backend
             logger: Optional logger instance. If not provided, uses the library's
                     internal logger.
             cooldown_seconds: Length of the cooldown window during which
                               advertisements are ignored. 0 disables the window.
+                              An attached :class:`~.cooldown.AdaptiveCooldown`
+                              replaces it once it has learned the scale's tail.
+            hub: Optional :class:`~.hub.ScaleHub` whose shared scanner
+                 delivers this scale's advertisements. The scale then builds
+                 no scanner of its own (``scanning_mode``, ``adapter`` and
+                 ``bleak_scanner_backend`` are the hub's business), and
+                 :meth:`async_start` / :meth:`async_stop` register and
+                 unregister it with the hub instead of driving a scanner.
         """
         # Default to the concrete model's own module logger so callers can keep
         # filtering per model (etekcity_esf551_ble.esf24.scale and friends); an
@@ -113,35 +217,36 @@ class EtekcitySmartFitnessScale(abc.ABC):
         self._sw_version: str | None = None
         self._display_unit: WeightUnit | None = None
         self._notification_callback = notification_callback
+        self._streams: set[MeasurementStream] = set()
         self._cooldown_seconds = cooldown_seconds
         self._cooldown_end_time: float = 0
 
-        if bleak_scanner_backend is None:
-            scanner_kwargs: dict[str, Any] = {
-                "detection_callback": self._advertisement_callback,
-                "service_uuids": None,
-                "scanning_mode": BluetoothScanningMode.ACTIVE,
-                "bluez": {},
-                "cb": {},
-            }
-
-            if IS_LINUX:
-                # Only Linux supports multiple adapters
-                if adapter:
-                    scanner_kwargs["adapter"] = adapter
-                if scanning_mode == BluetoothScanningMode.PASSIVE:
-                    scanner_kwargs["bluez"] = PASSIVE_SCANNER_ARGS
-                    scanner_kwargs["scanning_mode"] = BluetoothScanningMode.PASSIVE
-            elif IS_MACOS:
-                # We want mac address on macOS
-                scanner_kwargs["cb"] = {"use_bdaddr": True}
-
-            PlatformBleakScanner, _ = get_platform_scanner_backend_type()
-            self._scanner = PlatformBleakScanner(**scanner_kwargs)
+        self._hub = hub
+        if hub is not None:
+            # Advertisements arrive through the hub's shared scanner once
+            # async_start registers this scale with it.
+            self._scanner = None
+        elif bleak_scanner_backend is None:
+            self._scanner = create_platform_scanner(
+                self._advertisement_callback,
+                scanning_mode,
+                adapter,
+                escalate_for=lambda device, _: device.address == self.address,
+            )
         else:
             self._scanner = bleak_scanner_backend
             self._scanner.register_detection_callback(self._advertisement_callback)
         self._lock = asyncio.Lock()
+        # Set by CaptureRecorder.attach(); None keeps the hot paths to a
+        # single attribute check.
+        self._recorder: CaptureRecorder | None = None
+        # Set by LatencyMonitor.attach(); _timing is the session in progress.
+        self._latency_monitor: LatencyMonitor | None = None
+        self._timing: SessionTiming | None = None
+        # Set by MeasurementStore.attach().
+        self._store: MeasurementStore | None = None
+        # Set by AdaptiveCooldown.attach().
+        self._adaptive_cooldown: AdaptiveCooldown | None = None
         if display_unit is not None:
             self.display_unit = display_unit
 
@@ -149,6 +254,11 @@ class EtekcitySmartFitnessScale(abc.ABC):
     def hw_version(self) -> str:
         return self._hw_version
 
+    @property
+    def scanner(self) -> BaseBleakScanner | HybridScanner | None:
+        """This client's scanner backend (None when a hub scans for it)."""
+        return self._scanner
+
     @property
     def sw_version(self) -> str:
         return self._sw_version
@@ -178,19 +288,94 @@ class EtekcitySmartFitnessScale(abc.ABC):
         """
         if ble_device.address != self.address:
             return
+        advertised_at = time.monotonic()
+
+        if self._recorder is not None:
+            self._recorder.record_advertisement(ble_device, advertisement_data)
 
-        if self._cooldown_seconds > 0 and time.time() < self._cooldown_end_time:
+        in_cooldown = (
+            self._cooldown_seconds > 0 or self._adaptive_cooldown is not None
+        ) and time.time() < self._cooldown_end_time
+        if self._adaptive_cooldown is not None:
+            self._adaptive_cooldown.observe(self.address, in_cooldown)
+        if in_cooldown:
             self._logger.debug(
                 "Ignoring advertisement during cooldown period (cooldown ends at %s)",
                 self._cooldown_end_time,
             )
             return
 
-        await self._handle_advertisement(ble_device, advertisement_data)
+        await self._handle_advertisement(ble_device, advertisement_data, advertised_at)
+
+    def _arm_cooldown(self) -> float:
+        """Open the cooldown window at the end of a session; return its length."""
+        seconds = self._cooldown_seconds
+        if self._adaptive_cooldown is not None:
+            seconds = self._adaptive_cooldown.arm(self.address, seconds)
+        self._cooldown_end_time = time.time() + seconds
+        return seconds
+
+    def _start_timing(self, advertised_at: float, cooldown_passed_at: float) -> None:
+        """Open the timing of a session attempt (if a monitor is attached)."""
+        if self._latency_monitor is not None and self._timing is None:
+            self._timing = SessionTiming(self.address, type(self).__name__)
+            self._timing.mark(SessionPhase.ADVERTISEMENT, advertised_at)
+            self._timing.mark(SessionPhase.COOLDOWN_PASSED, cooldown_passed_at)
+
+    def _mark(self, phase: SessionPhase) -> None:
+        """Timestamp ``phase`` of the current session (if a monitor is attached)."""
+        if self._timing is not None:
+            self._timing.mark(phase)
+
+    def _end_timing(self) -> None:
+        """Report the current session, if any, as ended without a measurement."""
+        timing, self._timing = self._timing, None
+        if timing is not None and self._latency_monitor is not None:
+            self._latency_monitor.report(timing)
+
+    def _deliver(self, scale_data: ScaleData) -> None:
+        """Hand a parsed measurement to the notification callback."""
+        if scale_data.received_at is None:
+            scale_data.received_at = time.time()
+        if (timing := self._timing) is not None:
+            timing.mark(SessionPhase.FINAL_FRAME)
+            timing.completed = True
+            scale_data.timing = timing
+            self._end_timing()
+        if self._store is not None:
+            self._store.record(self, scale_data)
+        for stream in self._streams:
+            stream.put(scale_data)
+        if self._notification_callback is not None:
+            self._notification_callback(scale_data)
+
+    def measurements(
+        self,
+        maxsize: int = 16,
+        overflow: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+    ) -> MeasurementStream:
+        """
+        Open a stream of this client's readings, for ``async for``.
+
+        Readings are queued without ever making the BLE path wait; a slow
+        consumer loses readings (or builds a backlog) per ``overflow``. Each
+        call opens an independent stream; close it (or use ``async with``)
+        when done. :meth:`async_stop` ends every open stream.
+
+        Args:
+            maxsize: Readings the stream holds before ``overflow`` applies.
+            overflow: What to do with a reading when the stream is full.
+        """
+        stream = MeasurementStream(self, maxsize, overflow)
+        self._streams.add(stream)
+        return stream
 
     @abc.abstractmethod
     async def _handle_advertisement(
-        self, ble_device: BLEDevice, advertisement_data: AdvertisementData
+        self,
+        ble_device: BLEDevice,
+        advertisement_data: AdvertisementData,
+        advertised_at: float,
     ) -> None:
         """
         Handle an advertisement from the target scale (already filtered by
@@ -198,11 +383,13 @@ class EtekcitySmartFitnessScale(abc.ABC):
 
         Implementations decide what to do with it: connect over GATT
         (:class:`GattScale`) or parse the advertisement payload directly
-        (:class:`AdvertisementScale`).
+        (:class:`AdvertisementScale`). Only an advertisement that starts a
+        session attempt opens its timing, with :meth:`_start_timing`.
 
         Args:
             ble_device: The detected Bluetooth device
             advertisement_data: Advertisement data for the detected device
+            advertised_at: :func:`time.monotonic` time it was received
         """
 
     async def async_start(self) -> None:
@@ -210,6 +397,9 @@ class EtekcitySmartFitnessScale(abc.ABC):
         self._logger.debug(
             "Starting EtekcitySmartFitnessScale for address: %s", self.address
         )
+        if self._hub is not None:
+            self._hub.add(self)
+            return
         try:
             async with self._lock:
                 await self._scanner.start()
@@ -222,6 +412,11 @@ class EtekcitySmartFitnessScale(abc.ABC):
         self._logger.debug(
             "Stopping EtekcitySmartFitnessScale for address: %s", self.address
         )
+        for stream in list(self._streams):
+            stream.close()
+        if self._hub is not None:
+            self._hub.remove(self)
+            return
         try:
             async with self._lock:
                 await self._scanner.stop()
@@ -263,16 +458,26 @@ class GattScale(EtekcitySmartFitnessScale, abc.ABC):
     # instead of retrying on the next advertisement.
     _MAX_CONSECUTIVE_SETUP_FAILURES = 3
 
+    # A session that produced notifications but no reading, this recently
+    # (seconds), makes the reconnect a weigh-in for the connection scheduler.
+    _WEIGH_IN_WINDOW = 60.0
+
     def __init__(
         self,
         address: str,
-        notification_callback: Callable[[ScaleData], None],
+        notification_callback: Callable[[ScaleData], None] | None,
         display_unit: WeightUnit = None,
         scanning_mode: BluetoothScanningMode = BluetoothScanningMode.ACTIVE,
         adapter: str | None = None,
         bleak_scanner_backend: BaseBleakScanner = None,
         cooldown_seconds: int = DEFAULT_COOLDOWN_SECONDS,
         logger: logging.Logger | None = None,
+        *,
+        hub: ScaleHub | None = None,
+        client_factory: ClientFactory | None = None,
+        scheduler: ConnectionScheduler | None = None,
+        admission: AdmissionController | None = None,
+        service_cache: ServiceCache | None = None,
     ) -> None:
         """
         Initialize the GATT scale interface.
@@ -282,6 +487,24 @@ class GattScale(EtekcitySmartFitnessScale, abc.ABC):
                               advertisements are ignored after a disconnection.
                               Defaults to :data:`DEFAULT_COOLDOWN_SECONDS`;
                               0 disables the window.
+            client_factory: Optional :data:`ClientFactory` used to connect
+                            instead of :func:`connect_bleak_client`, e.g.
+                            :meth:`~.simulator.ScaleSimulator.connect` to
+                            talk to simulated scales.
+            scheduler: Optional :class:`~.scheduler.ConnectionScheduler`
+                       shared with other clients, which picks the adapter
+                       and queues the attempt while the adapters are busy.
+                       It then connects with its own connector, and
+                       ``client_factory`` is unused.
+            admission: Optional :class:`~.admission.AdmissionController`
+                       shared with other clients, which bounds how many
+                       connection attempts run at once.
+            service_cache: Optional :class:`~.service_cache.ServiceCache`
+                           that clears the address's cached services
+                           whenever session setup raises
+                           :class:`ScaleSessionError`, and records
+                           connect-to-notify latency. It connects unless
+                           ``client_factory`` or ``scheduler`` is given.
 
         See :meth:`EtekcitySmartFitnessScale.__init__` for the remaining args.
         """
@@ -294,7 +517,21 @@ class GattScale(EtekcitySmartFitnessScale, abc.ABC):
             bleak_scanner_backend,
             logger,
             cooldown_seconds=cooldown_seconds,
+            hub=hub,
         )
+        if client_factory is None:
+            client_factory = (
+                connect_bleak_client if service_cache is None else service_cache.connect
+            )
+        self._client_factory = client_factory
+        self._service_cache = service_cache
+        self._scheduler = scheduler
+        self._admission = admission
+        if scheduler is not None:
+            scheduler.watch(address)
+        # monotonic time of the current session's first notification, cleared
+        # when a reading is delivered.
+        self._weigh_in_started: float | None = None
         self._client: BleakClient | None = None
         self._initializing: bool = False
         self._background_tasks: set[asyncio.Task] = set()
@@ -322,6 +559,76 @@ class GattScale(EtekcitySmartFitnessScale, abc.ABC):
         if (exc := task.exception()) is not None:
             self._logger.error("Background task %s failed: %s", task.get_name(), exc)
 
+    async def _start_notify(
+        self, char: BleakGATTCharacteristic, ble_device: BLEDevice
+    ) -> None:
+        """
+        Subscribe to ``char``, routing its notifications to
+        :meth:`_notification_handler` (via an attached capture recorder).
+        """
+        name, address = ble_device.name, ble_device.address
+
+        def callback(sender: BleakGATTCharacteristic, data: bytearray) -> None:
+            if self._recorder is not None:
+                self._recorder.record_notification(address, name, sender, data)
+            if self._timing is not None:
+                self._timing.mark(SessionPhase.FIRST_FRAME)
+            if self._weigh_in_started is None:
+                self._weigh_in_started = time.monotonic()
+            self._notification_handler(sender, data, name, address)
+
+        await self._client.start_notify(char, callback)
+
+    def _deliver(self, scale_data: ScaleData) -> None:
+        self._weigh_in_started = None
+        super()._deliver(scale_data)
+
+    def _connection_priority(self) -> ConnectionPriority:
+        """Scheduler priority of the next connection attempt."""
+        started = self._weigh_in_started
+        if started is not None and time.monotonic() - started < self._WEIGH_IN_WINDOW:
+            return ConnectionPriority.WEIGH_IN
+        return ConnectionPriority.NORMAL
+
+    async def _connect(
+        self, ble_device: BLEDevice, advertised_at: float
+    ) -> BleakClient:
+        """
+        Open the GATT connection, once admitted if there is an admission
+        controller. Raises :class:`~.admission.AdmissionDropped` if the
+        advertisement went stale in its queue.
+        """
+        if self._admission is None:
+            self._mark(SessionPhase.CONNECTING)
+            return await self._open_client(ble_device)
+        async with self._admission.admit(self._connection_priority(), advertised_at):
+            self._mark(SessionPhase.CONNECTING)
+            return await self._open_client(ble_device)
+
+    async def _open_client(self, ble_device: BLEDevice) -> BleakClient:
+        """Connect, through the scheduler if there is one."""
+        if self._scheduler is None:
+            return await self._client_factory(
+                ble_device, self.address, self._unavailable_callback
+            )
+        return await self._scheduler.connect(
+            ble_device,
+            self.address,
+            self._unavailable_callback,
+            self._connection_priority(),
+        )
+
+    async def _write_gatt_char(
+        self,
+        char: BleakGATTCharacteristic,
+        data: bytes,
+        response: bool | None = None,
+    ) -> None:
+        """Write ``data`` to ``char`` on the current client (recorded if capturing)."""
+        if self._recorder is not None:
+            self._recorder.record_write(self.address, char, data, response)
+        await self._client.write_gatt_char(char, data, response)
+
     @abc.abstractmethod
     def _notification_handler(
         self, _: BleakGATTCharacteristic, payload: bytearray, name: str, address: str
@@ -371,8 +678,8 @@ class GattScale(EtekcitySmartFitnessScale, abc.ABC):
             self._logger.debug("Scale disconnected (torn down after setup failure)")
             return
         self._logger.debug("Scale disconnected")
-        disconnect_time = time.time()
-        self._cooldown_end_time = disconnect_time + self._cooldown_seconds
+        self._end_timing()
+        self._arm_cooldown()
         self._client = None
 
     async def _teardown_client(self) -> None:
@@ -389,16 +696,17 @@ class GattScale(EtekcitySmartFitnessScale, abc.ABC):
             self._logger.debug("Error disconnecting during teardown", exc_info=True)
 
     def _register_setup_failure(self, reason: str) -> None:
+        self._end_timing()
         self._consecutive_setup_failures += 1
         if self._consecutive_setup_failures >= self._MAX_CONSECUTIVE_SETUP_FAILURES:
             self._consecutive_setup_failures = 0
-            self._cooldown_end_time = time.time() + self._cooldown_seconds
+            seconds = self._arm_cooldown()
             self._logger.error(
                 "Session setup failed %d consecutive times (%s); giving up "
                 "until the cooldown window (%ss) closes",
                 self._MAX_CONSECUTIVE_SETUP_FAILURES,
                 reason,
-                self._cooldown_seconds,
+                seconds,
             )
         else:
             self._logger.warning(
@@ -410,7 +718,7 @@ class GattScale(EtekcitySmartFitnessScale, abc.ABC):
             )
 
     async def _handle_advertisement(
-        self, ble_device: BLEDevice, _: AdvertisementData
+        self, ble_device: BLEDevice, _: AdvertisementData, advertised_at: float
     ) -> None:
         """
         Handle an advertisement from the target scale.
@@ -421,38 +729,44 @@ class GattScale(EtekcitySmartFitnessScale, abc.ABC):
         Args:
             ble_device: The detected Bluetooth device
             _: Advertisement data (unused)
+            advertised_at: :func:`time.monotonic` time it was received
         """
+        cooldown_passed_at = time.monotonic()
         async with self._lock:
             if self._client is not None or self._initializing:
                 return
 
             self._initializing = True
+        self._start_timing(advertised_at, cooldown_passed_at)
 
         try:
             try:
                 self._logger.debug("Connecting to scale: %s", self.address)
-                self._client = await establish_connection(
-                    BleakClient,
-                    ble_device,
-                    self.address,
-                    self._unavailable_callback,
-                )
+                self._client = await self._connect(ble_device, advertised_at)
                 self._logger.debug("Connected to scale: %s", self.address)
+            except AdmissionDropped as ex:
+                self._logger.debug("Not connecting to scale %s: %s", self.address, ex)
+                self._end_timing()
+                return
             except Exception as ex:
                 self._logger.exception(
                     "Could not connect to scale: %s(%s)", type(ex), ex.args
                 )
                 self._client = None
+                self._end_timing()
                 return
 
             if not self._client or not self._client.is_connected:
                 await self._teardown_client()
                 self._register_setup_failure("client not connected")
                 return
+            self._mark(SessionPhase.CONNECTED)
 
             try:
                 await self._start_scale_session(ble_device)
             except ScaleSessionError as ex:
+                if self._service_cache is not None:
+                    await self._service_cache.invalidate(self.address, self._client)
                 await self._teardown_client()
                 self._register_setup_failure(str(ex))
                 return
@@ -463,6 +777,9 @@ class GattScale(EtekcitySmartFitnessScale, abc.ABC):
                 await self._teardown_client()
                 self._register_setup_failure(type(ex).__name__)
                 return
+            self._mark(SessionPhase.SESSION_STARTED)
+            if self._service_cache is not None:
+                self._service_cache.session_started(self.address)
             self._consecutive_setup_failures = 0
         finally:
             self._initializing = False
@@ -519,8 +836,12 @@ class AdvertisementScale(EtekcitySmartFitnessScale, abc.ABC):
         return None
 
     async def _handle_advertisement(
-        self, ble_device: BLEDevice, advertisement_data: AdvertisementData
+        self,
+        ble_device: BLEDevice,
+        advertisement_data: AdvertisementData,
+        advertised_at: float,
     ) -> None:
+        cooldown_passed_at = time.monotonic()
         for mfr_bytes in advertisement_data.manufacturer_data.values():
             payload = bytearray(mfr_bytes)
             self._logger.debug(
@@ -543,6 +864,8 @@ class AdvertisementScale(EtekcitySmartFitnessScale, abc.ABC):
                 scale_data.measurements = parsed
                 if display_unit is not None:
                     self._display_unit = display_unit
-                self._notification_callback(scale_data)
-                self._cooldown_end_time = time.time() + self._cooldown_seconds
+                self._start_timing(advertised_at, cooldown_passed_at)
+                self._mark(SessionPhase.FIRST_FRAME)
+                self._deliver(scale_data)
+                self._arm_cooldown()
                 return
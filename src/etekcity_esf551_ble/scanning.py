@@ -0,0 +1,188 @@
+"""
+Passive-first scanning that turns active only around weigh-ins.
+
+Active scanning sends a scan request to every advertiser in range, around
+the clock, although the scales sit idle most of the day. A
+:class:`HybridScanner` (``scanning_mode=BluetoothScanningMode.HYBRID``)
+runs a passive scanner until an advertisement the owner cares about
+arrives, typically from a registered scale. It then swaps to an active
+scanner for ``active_seconds``, extended by every further relevant
+advertisement, and drops back to passive. Either scanner's advertisements go
+to the registered callbacks::
+
+    scale = ESF551Scale(address, callback, scanning_mode="hybrid")
+    ...
+    print(scale.scanner.mode_seconds(), scale.scanner.escalations)
+
+Passive scanning exists only on Linux (BlueZ advertisement monitors), so
+:func:`~.scale.create_platform_scanner` builds a hybrid scanner there and a
+plain active scanner elsewhere.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+import time
+from collections.abc import Callable
+from typing import Any
+
+from bleak.backends.device import BLEDevice
+from bleak.backends.scanner import AdvertisementData
+
+from .data import BluetoothScanningMode
+
+_LOGGER = logging.getLogger(__name__)
+
+AdvertisementPredicate = Callable[[BLEDevice, AdvertisementData], bool]
+
+
+class HybridScanner:
+    """
+    Scanner backend that runs ``passive`` and escalates to ``active``.
+
+    ``escalate_for(device, advertisement)`` decides which advertisements
+    start (or extend) an active window. Offers the scanner-backend methods
+    the scale clients and :class:`~.hub.ScaleHub` use:
+    :meth:`register_detection_callback`, :meth:`start` and :meth:`stop`.
+    """
+
+    def __init__(
+        self,
+        passive: Any,
+        active: Any,
+        escalate_for: AdvertisementPredicate,
+        *,
+        active_seconds: float = 30.0,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        self._scanners = {
+            BluetoothScanningMode.PASSIVE: passive,
+            BluetoothScanningMode.ACTIVE: active,
+        }
+        self._escalate_for = escalate_for
+        self._active_seconds = active_seconds
+        self._logger = logger or _LOGGER
+        self._callbacks: list[Callable[[BLEDevice, AdvertisementData], Any]] = []
+        for scanner in self._scanners.values():
+            scanner.register_detection_callback(self._on_detection)
+        self._mode = BluetoothScanningMode.PASSIVE
+        self._running = False
+        self._lock = asyncio.Lock()
+        self._active_until = 0.0
+        self._timer: asyncio.TimerHandle | None = None
+        self._switch_task: asyncio.Task | None = None
+        self._seconds = dict.fromkeys(self._scanners, 0.0)
+        self._mode_since = 0.0
+        #: Times the scanner went active.
+        self.escalations = 0
+
+    @property
+    def mode(self) -> BluetoothScanningMode:
+        """The scanner currently running (or that would run)."""
+        return self._mode
+
+    def mode_seconds(self) -> dict[BluetoothScanningMode, float]:
+        """Seconds spent scanning in each mode since the first start."""
+        seconds = dict(self._seconds)
+        if self._running:
+            seconds[self._mode] += time.monotonic() - self._mode_since
+        return seconds
+
+    def register_detection_callback(
+        self, callback: Callable[[BLEDevice, AdvertisementData], Any] | None
+    ) -> None:
+        if callback is not None:
+            self._callbacks.append(callback)
+
+    async def start(self) -> None:
+        async with self._lock:
+            if self._running:
+                return
+            await self._scanners[self._mode].start()
+            self._running = True
+            self._mode_since = time.monotonic()
+
+    async def stop(self) -> None:
+        async with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._running:
+                return
+            await self._scanners[self._mode].stop()
+            self._account()
+            self._running = False
+
+    def _account(self) -> None:
+        now = time.monotonic()
+        self._seconds[self._mode] += now - self._mode_since
+        self._mode_since = now
+
+    async def _on_detection(
+        self, device: BLEDevice, advertisement_data: AdvertisementData
+    ) -> None:
+        if self._running and self._escalate_for(device, advertisement_data):
+            self._active_until = time.monotonic() + self._active_seconds
+            if self._mode is BluetoothScanningMode.PASSIVE:
+                self._spawn_switch(BluetoothScanningMode.ACTIVE)
+        for callback in self._callbacks:
+            if inspect.isawaitable(result := callback(device, advertisement_data)):
+                await result
+
+    def _spawn_switch(self, mode: BluetoothScanningMode) -> None:
+        if self._switch_task is None or self._switch_task.done():
+            self._switch_task = asyncio.create_task(self._switch(mode))
+
+    async def _switch(self, mode: BluetoothScanningMode) -> None:
+        async with self._lock:
+            if not self._running or mode is self._mode:
+                return
+            self._logger.debug("Switching to %s scanning", mode)
+            previous = self._mode
+            try:
+                await self._scanners[previous].stop()
+            except Exception as ex:
+                self._logger.error(
+                    "Failed to stop %s scanning, staying on it: %s", previous, ex
+                )
+                return
+            self._account()
+            try:
+                await self._scanners[mode].start()
+            except Exception as ex:
+                self._logger.error(
+                    "Failed to switch to %s scanning, resuming %s scanning: %s",
+                    mode,
+                    previous,
+                    ex,
+                )
+                try:
+                    await self._scanners[previous].start()
+                except Exception as ex:
+                    self._logger.error(
+                        "Failed to resume %s scanning; scanning stopped: %s",
+                        previous,
+                        ex,
+                    )
+                    self._running = False
+                return
+            self._mode = mode
+            if mode is BluetoothScanningMode.ACTIVE:
+                self.escalations += 1
+                self._schedule_check()
+
+    def _schedule_check(self) -> None:
+        delay = max(self._active_until - time.monotonic(), 0.0)
+        self._timer = asyncio.get_running_loop().call_later(delay, self._check)
+
+    def _check(self) -> None:
+        """Drop back to passive once the active window has run out."""
+        self._timer = None
+        if not self._running or self._mode is not BluetoothScanningMode.ACTIVE:
+            return
+        if time.monotonic() >= self._active_until:
+            self._spawn_switch(BluetoothScanningMode.PASSIVE)
+        else:
+            self._schedule_check()
@@ -0,0 +1,286 @@
+"""
+Spread GATT connections over several Bluetooth adapters.
+
+A BlueZ controller handles only a few connections at a time, and attempts
+beyond that serialize or fail. A :class:`ConnectionScheduler` shared by the
+clients of a gateway with several adapters gives each connection attempt a
+slot on the least-loaded adapter that can reach the scale, holds the slot
+until that connection ends, and queues attempts when every suitable adapter
+is at ``max_connections_per_adapter`` — serving scales in a weigh-in first::
+
+    scheduler = ConnectionScheduler(["hci0", "hci1", "hci2"])
+    hubs = [ScaleHub(adapter=a, scheduler=scheduler) for a in scheduler.adapters]
+    scale = ESF551Scale(address, callback, hub=hubs[0], scheduler=scheduler)
+    ...
+    for adapter, stats in scheduler.stats.items():
+        print(adapter, stats.active, stats.queued, stats.success_rate)
+
+On BlueZ a device is only reachable through an adapter that has discovered
+it, so the scheduler tracks which adapters see each scale: every
+advertisement a client handles is recorded (the adapter is read off BlueZ's
+device path), and a :class:`~.hub.ScaleHub` constructed with
+``scheduler=...`` records what its adapter sees for every scheduled scale.
+An attempt only goes to adapters that saw the scale within
+``sighting_ttl`` seconds, through the ``BLEDevice`` that adapter reported;
+with no sighting attributable to an adapter (other platforms, simulated
+scales), every adapter is a candidate.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from enum import IntEnum
+
+from bleak import BleakClient
+from bleak.backends.device import BLEDevice
+from bleak_retry_connector import establish_connection
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ConnectionPriority(IntEnum):
+    """Order in which queued connection attempts get a free slot."""
+
+    BACKGROUND = 0
+    NORMAL = 1
+    #: The scale's previous session ended mid-weigh-in (notifications, but
+    #: no reading): someone is standing on it.
+    WEIGH_IN = 2
+
+
+#: Opens a connection through a given adapter:
+#: ``await connector(ble_device, name, disconnected_callback, adapter)``.
+#: Otherwise the contract of :data:`~.scale.ClientFactory`.
+AdapterConnector = Callable[
+    [BLEDevice, str, Callable[[BleakClient], None], str], Awaitable[BleakClient]
+]
+
+
+async def connect_on_adapter(
+    ble_device: BLEDevice,
+    name: str,
+    disconnected_callback: Callable[[BleakClient], None],
+    adapter: str,
+) -> BleakClient:
+    """Default :data:`AdapterConnector`. ``ble_device`` is the one ``adapter``
+    reported, which already routes the BlueZ connection through it."""
+    return await establish_connection(
+        BleakClient, ble_device, name, disconnected_callback
+    )
+
+
+def _adapter_of(ble_device: BLEDevice) -> str | None:
+    """The adapter a BlueZ device was discovered on (``/org/bluez/hci0/...``)."""
+    details = ble_device.details
+    path = details.get("path") if isinstance(details, dict) else None
+    if isinstance(path, str) and path.startswith("/org/bluez/"):
+        return path.split("/")[3]
+    return None
+
+
+class AdapterStats:
+    """Load and outcomes of one adapter's connection attempts."""
+
+    __slots__ = ("adapter", "active", "queued", "attempts", "successes", "failures")
+
+    def __init__(self, adapter: str) -> None:
+        self.adapter = adapter
+        #: Connections holding a slot (attempts in progress plus live links).
+        self.active = 0
+        #: Waiting attempts this adapter could serve.
+        self.queued = 0
+        self.attempts = 0
+        self.successes = 0
+        self.failures = 0
+
+    @property
+    def success_rate(self) -> float | None:
+        """Fraction of finished attempts that connected, None before any."""
+        finished = self.successes + self.failures
+        return self.successes / finished if finished else None
+
+    def __repr__(self) -> str:
+        return (
+            f"AdapterStats({self.adapter}: active={self.active},"
+            f" queued={self.queued}, attempts={self.attempts},"
+            f" success_rate={self.success_rate})"
+        )
+
+
+class _Request:
+    __slots__ = ("address", "candidates", "future")
+
+    def __init__(
+        self, address: str, candidates: list[str], future: asyncio.Future[str]
+    ) -> None:
+        self.address = address
+        self.candidates = candidates
+        self.future = future
+
+
+class ConnectionScheduler:
+    """
+    Assign GATT connection attempts to adapters.
+
+    ``adapters`` are the adapter names (``"hci0"``, ...). Each adapter runs
+    at most ``max_connections_per_adapter`` connections — counting an
+    attempt from its start until the resulting connection drops. A free
+    slot goes to the waiting attempt with the highest
+    :class:`ConnectionPriority` (oldest first within a priority) that the
+    adapter can serve; among the adapters an attempt can use, it gets the
+    one with the fewest active connections. ``connector`` opens the
+    connection (default :func:`connect_on_adapter`).
+    """
+
+    def __init__(
+        self,
+        adapters: Sequence[str],
+        max_connections_per_adapter: int = 2,
+        *,
+        connector: AdapterConnector | None = None,
+        sighting_ttl: float = 30.0,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        if not adapters:
+            raise ValueError("at least one adapter is required")
+        if max_connections_per_adapter < 1:
+            raise ValueError("max_connections_per_adapter must be >= 1")
+        self._adapters = tuple(adapters)
+        self._max = max_connections_per_adapter
+        self._connector = connector or connect_on_adapter
+        self._sighting_ttl = sighting_ttl
+        self._logger = logger or _LOGGER
+        self._stats = {adapter: AdapterStats(adapter) for adapter in self._adapters}
+        # address -> adapter -> (BLEDevice it reported, monotonic time)
+        self._sightings: dict[str, dict[str, tuple[BLEDevice, float]]] = {}
+        # (-priority, sequence, request)
+        self._queue: list[tuple[int, int, _Request]] = []
+        self._sequence = itertools.count()
+
+    @property
+    def adapters(self) -> tuple[str, ...]:
+        return self._adapters
+
+    @property
+    def stats(self) -> dict[str, AdapterStats]:
+        """Per-adapter :class:`AdapterStats` (live objects)."""
+        return self._stats
+
+    @property
+    def waiting(self) -> int:
+        """Attempts waiting for a slot."""
+        return len(self._queue)
+
+    def watch(self, address: str) -> None:
+        """Track which adapters see ``address`` (done by each client)."""
+        self._sightings.setdefault(address, {})
+
+    def observe(self, ble_device: BLEDevice, adapter: str | None = None) -> None:
+        """Record that ``adapter`` (default: from the device path) sees a scale."""
+        if (sightings := self._sightings.get(ble_device.address)) is None:
+            return
+        adapter = adapter or _adapter_of(ble_device)
+        if adapter in self._stats:
+            sightings[adapter] = (ble_device, time.monotonic())
+
+    def _candidates(self, address: str) -> list[str]:
+        cutoff = time.monotonic() - self._sighting_ttl
+        seen = [
+            adapter
+            for adapter, (_, at) in self._sightings.get(address, {}).items()
+            if at >= cutoff
+        ]
+        return seen or list(self._adapters)
+
+    async def connect(
+        self,
+        ble_device: BLEDevice,
+        name: str,
+        disconnected_callback: Callable[[BleakClient], None],
+        priority: ConnectionPriority = ConnectionPriority.NORMAL,
+    ) -> BleakClient:
+        """
+        Connect through the best adapter once it has a free slot.
+
+        Waits (in priority order) while every candidate adapter is full. The
+        slot is released when the attempt fails or, once connected, when
+        the connection drops.
+        """
+        self.observe(ble_device)
+        adapter = await self._acquire(ble_device.address, priority)
+        stats = self._stats[adapter]
+        stats.attempts += 1
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if not released:
+                released = True
+                stats.active -= 1
+                self._dispatch()
+
+        def on_disconnect(client: BleakClient) -> None:
+            release()
+            disconnected_callback(client)
+
+        device = self._sightings.get(ble_device.address, {}).get(adapter)
+        try:
+            client = await self._connector(
+                device[0] if device else ble_device, name, on_disconnect, adapter
+            )
+        except BaseException:
+            stats.failures += 1
+            release()
+            raise
+        stats.successes += 1
+        if not client.is_connected:
+            release()  # no disconnect callback will come
+        self._logger.debug("Connected %s through %s", ble_device.address, adapter)
+        return client
+
+    async def _acquire(self, address: str, priority: ConnectionPriority) -> str:
+        request = _Request(
+            address,
+            self._candidates(address),
+            asyncio.get_running_loop().create_future(),
+        )
+        heapq.heappush(self._queue, (-priority, next(self._sequence), request))
+        self._dispatch()
+        try:
+            return await request.future
+        except asyncio.CancelledError:
+            if request.future.done() and not request.future.cancelled():
+                # Granted just as we were cancelled: give the slot back.
+                self._stats[request.future.result()].active -= 1
+            self._queue = [entry for entry in self._queue if entry[2] is not request]
+            heapq.heapify(self._queue)
+            self._dispatch()
+            raise
+
+    def _dispatch(self) -> None:
+        """Grant free slots to waiting attempts, highest priority first."""
+        waiting = []
+        while self._queue:
+            entry = heapq.heappop(self._queue)
+            request = entry[2]
+            if request.future.done():
+                continue
+            free = [a for a in request.candidates if self._stats[a].active < self._max]
+            if not free:
+                waiting.append(entry)
+                continue
+            adapter = min(free, key=lambda a: self._stats[a].active)
+            self._stats[adapter].active += 1
+            request.future.set_result(adapter)
+        for entry in waiting:
+            heapq.heappush(self._queue, entry)
+        for stats in self._stats.values():
+            stats.queued = 0
+        for _, _, request in self._queue:
+            for adapter in request.candidates:
+                self._stats[adapter].queued += 1
@@ -0,0 +1,156 @@
+"""
+Keep each scale's cached GATT services usable across reconnects.
+
+A weigh-in is a fresh connection, and service discovery is a large share of
+the time between connecting and the first notification. BlueZ keeps the
+services of devices it has seen, and bleak-retry-connector connects on that
+cache whenever it still matches what BlueZ has on the bus; the scale's GATT
+database does not change between weigh-ins, so reconnects normally skip
+discovery. A :class:`ServiceCache`
+(``GattScale(..., service_cache=ServiceCache())``) connects with
+``BleakClientWithServiceCache`` and clears that cache when it goes stale::
+
+    cache = ServiceCache()
+    scale = ESF551Scale(address, callback, service_cache=cache)
+    ...
+    stats = cache.stats[scale.address]
+    print(stats.sessions, stats.invalidations, stats.connect_to_notify.mean)
+
+A stale cache shows up as missing characteristics: the model raises
+:class:`~.scale.ScaleSessionError`, and the client has the address's cached
+services cleared before disconnecting, so the retry on the next
+advertisement discovers afresh. Whether a given connection discovered is up
+to BlueZ and not reported back, so ``connect_to_notify`` holds the
+connect-to-notify latency (connection attempt started to notifications
+enabled) of every session; an attached :class:`~.timing.LatencyMonitor`
+reports the same span for any client under ``"connect_to_notify"``.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+from bleak import BleakClient
+from bleak.backends.device import BLEDevice
+from bleak_retry_connector import (
+    BleakClientWithServiceCache,
+    clear_cache,
+    establish_connection,
+)
+
+from .timing import LatencyHistogram
+
+if TYPE_CHECKING:
+    from .scale import ClientFactory
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def connect_with_service_cache(
+    ble_device: BLEDevice,
+    name: str,
+    disconnected_callback: Callable[[BleakClient], None],
+) -> BleakClient:
+    """Default connector of a :class:`ServiceCache`: a
+    ``BleakClientWithServiceCache`` on BlueZ's services cache, connected with
+    bleak-retry-connector's retries."""
+    return await establish_connection(
+        BleakClientWithServiceCache,
+        ble_device,
+        name,
+        disconnected_callback,
+        use_services_cache=True,
+    )
+
+
+class ServiceCacheStats:
+    """Session outcomes and connect-to-notify latency for one address."""
+
+    __slots__ = ("sessions", "invalidations", "connect_to_notify")
+
+    def __init__(self) -> None:
+        #: Sessions that got as far as notifications enabled.
+        self.sessions = 0
+        #: Cache clears because a session found characteristics missing.
+        self.invalidations = 0
+        #: Connect-to-notify seconds of those sessions.
+        self.connect_to_notify = LatencyHistogram()
+
+    def __repr__(self) -> str:
+        return (
+            f"ServiceCacheStats(sessions={self.sessions},"
+            f" invalidations={self.invalidations})"
+        )
+
+
+class ServiceCache:
+    """
+    Connections on cached GATT services, cleared when they go stale.
+
+    :meth:`connect` is a :data:`~.scale.ClientFactory`; one instance can serve
+    several clients. ``connector`` replaces :func:`connect_with_service_cache`,
+    e.g. :meth:`~.simulator.ScaleSimulator.connect`. ``stats`` maps each
+    upper-case address to its :class:`ServiceCacheStats`.
+    """
+
+    def __init__(
+        self,
+        *,
+        connector: ClientFactory | None = None,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        self._connector = connector or connect_with_service_cache
+        self._logger = logger or _LOGGER
+        # address -> monotonic time the connection attempt started
+        self._pending: dict[str, float] = {}
+        self.stats: dict[str, ServiceCacheStats] = {}
+
+    def _stats(self, address: str) -> ServiceCacheStats:
+        if (stats := self.stats.get(address)) is None:
+            stats = self.stats[address] = ServiceCacheStats()
+        return stats
+
+    async def connect(
+        self,
+        ble_device: BLEDevice,
+        name: str,
+        disconnected_callback: Callable[[BleakClient], None],
+    ) -> BleakClient:
+        """Connect to ``ble_device`` on its cached services, if still valid."""
+        started = time.monotonic()
+        client = await self._connector(ble_device, name, disconnected_callback)
+        self._pending[ble_device.address.upper()] = started
+        return client
+
+    def session_started(self, address: str) -> None:
+        """Record connect-to-notify latency: ``address``'s session is up."""
+        address = address.upper()
+        if (started := self._pending.pop(address, None)) is None:
+            return
+        stats = self._stats(address)
+        stats.sessions += 1
+        stats.connect_to_notify.add(time.monotonic() - started)
+
+    async def invalidate(self, address: str, client: Any = None) -> None:
+        """
+        Clear ``address``'s cached services so the next connection discovers
+        them: through ``client.clear_cache()`` where the client has one,
+        else bleak-retry-connector's ``clear_cache(address)``.
+        """
+        address = address.upper()
+        self._pending.pop(address, None)
+        self._stats(address).invalidations += 1
+        try:
+            if (clear := getattr(client, "clear_cache", None)) is not None:
+                cleared = await clear()
+            else:
+                cleared = await clear_cache(address)
+        except Exception as ex:
+            self._logger.debug("Could not clear cached services of %s: %s", address, ex)
+            return
+        self._logger.debug(
+            "Cleared cached services of %s: %s", address, "done" if cleared else "none"
+        )
@@ -0,0 +1,477 @@
+"""
+Keep a history of readings, in memory and optionally on disk.
+
+A :class:`MeasurementStore` attached to scale clients appends every reading
+they deliver to array-backed columns — timestamp, address, model, weight,
+impedance, 500 kHz impedance and heart rate — and, when given a path, to an
+append-only file it reloads on the next start::
+
+    store = MeasurementStore("weights.etkms")
+    store.attach(scale)
+    ...
+    last_week = store.query(start=time.time() - 7 * 86400, address=address)
+    print(last_week.weight)  # array('d', [...])
+    metrics = store.body_metrics(height_m=1.75, age=30, sex=Sex.Male)
+
+Missing measurements are NaN in the float columns. Queries bisect a
+timestamp-sorted index (per address, too), so they cost the size of the
+result rather than of the history; readings may arrive out of order (stored
+offline measurements do) and the index is re-sorted on the next query.
+
+File format
+-----------
+An 8-byte header (``b"ETKMST"``, format version, reserved byte) followed by
+records of ``[kind u8][length u16][body]``. Addresses and model names are
+written once in a ``STRING`` record and referred to by index after that; a
+``READING`` record is a fixed 46-byte body. :meth:`MeasurementStore.compact`
+rewrites the file in timestamp order without duplicate readings or pruned
+rows, which the store also does by itself every ``compact_every`` appends.
+A record cut short by a crash is dropped on load.
+"""
+
+from __future__ import annotations
+
+import bisect
+import math
+import os
+import struct
+import time
+from array import array
+from collections.abc import Iterator
+from typing import IO, TYPE_CHECKING, Any, NamedTuple
+
+from .body_metrics import BaseBodyMetrics, BodyMetrics
+from .data import ScaleData
+
+if TYPE_CHECKING:
+    from .scale import EtekcitySmartFitnessScale
+
+MAGIC = b"ETKMST"
+FORMAT_VERSION = 1
+
+STRING = 0
+READING = 1
+
+_HEADER = struct.Struct("<6sBx")
+_RECORD = struct.Struct("<BH")
+# timestamp, address index, model index, weight, impedance, 500 kHz
+# impedance, heart rate (NaN when missing)
+_READING = struct.Struct("<dIHdddd")
+
+_NAN = math.nan
+
+
+class MeasurementColumns(NamedTuple):
+    """Query result: one entry per reading, in timestamp order."""
+
+    timestamp: array  # 'd', time.time() seconds
+    address: list[str]
+    model: list[str]
+    weight: array  # 'd', kg
+    impedance: array  # 'd', ohms
+    impedance_500khz: array  # 'd', ohms
+    heart_rate: array  # 'd', bpm
+
+
+def _value(value: float | None) -> float:
+    return _NAN if value is None else float(value)
+
+
+def _optional_int(value: float) -> int | None:
+    return None if math.isnan(value) else int(value)
+
+
+def _model_of(scale: EtekcitySmartFitnessScale) -> str:
+    from . import SCALE_CLASSES
+
+    for model, cls in SCALE_CLASSES.items():
+        if type(scale) is cls:
+            return model.value
+    return type(scale).__name__
+
+
+class MeasurementStore:
+    """
+    Columnar, append-only history of scale readings.
+
+    ``path`` is where the history is persisted (created if missing, loaded
+    if not); None keeps it in memory only. One store can be attached to any
+    number of clients; :meth:`append` adds readings from elsewhere (a
+    replayed capture, an import).
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike | None = None,
+        *,
+        compact_every: int | None = 10_000,
+    ) -> None:
+        self._path = os.fspath(path) if path is not None else None
+        self._compact_every = compact_every
+        self._scale_models: dict[EtekcitySmartFitnessScale, str] = {}
+        self._appended = 0
+        self._file: IO[bytes] | None = None
+        self._reset()
+        if self._path is not None:
+            self._open()
+
+    def _reset(self) -> None:
+        self._strings: list[str] = []
+        self._string_index: dict[str, int] = {}
+        self._timestamp = array("d")
+        self._address = array("I")
+        self._model = array("H")
+        self._weight = array("d")
+        self._impedance = array("d")
+        self._impedance_500khz = array("d")
+        self._heart_rate = array("d")
+        # Row numbers in timestamp order (with their timestamps, for bisect),
+        # overall and per address index; rebuilt lazily after an
+        # out-of-order append.
+        self._order = array("L")
+        self._order_ts = array("d")
+        self._by_address: dict[int, tuple[array, array]] = {}
+        self._sorted = True
+
+    # ---- clients ----------------------------------------------------------
+
+    def attach(
+        self, scale: EtekcitySmartFitnessScale, model: str | None = None
+    ) -> None:
+        """
+        Store ``scale``'s readings.
+
+        ``model`` is recorded with each reading; it defaults to the
+        :class:`~.detection.ScaleModel` value of the client's class (an
+        ``ESF24Scale`` records "ESF-24" — pass the model for an ESF-17/18).
+        """
+        scale._store = self
+        self._scale_models[scale] = str(model) if model else _model_of(scale)
+
+    def detach(self, scale: EtekcitySmartFitnessScale) -> None:
+        """Stop storing ``scale``'s readings."""
+        if scale._store is self:
+            scale._store = None
+        self._scale_models.pop(scale, None)
+
+    def record(self, scale: EtekcitySmartFitnessScale, data: ScaleData) -> None:
+        """Append a reading delivered by an attached client."""
+        self.append(data, self._scale_models.get(scale) or _model_of(scale))
+
+    # ---- writing ----------------------------------------------------------
+
+    def append(self, data: ScaleData, model: str = "") -> None:
+        """Append one reading, timestamped by ``data.received_at`` (or now)."""
+        timestamp = data.received_at if data.received_at is not None else time.time()
+        row = (
+            timestamp,
+            self._intern(data.address),
+            self._intern(model),
+            _value(data.weight),
+            _value(data.impedance),
+            _value(data.impedance_500khz),
+            _value(data.heart_rate),
+        )
+        self._add_row(*row)
+        if self._file is not None:
+            self._write(READING, _READING.pack(*row))
+            self._file.flush()
+            self._appended += 1
+            if self._compact_every and self._appended >= self._compact_every:
+                self.compact()
+
+    def _intern(self, value: str) -> int:
+        if (index := self._string_index.get(value)) is None:
+            index = self._string_index[value] = len(self._strings)
+            self._strings.append(value)
+            if self._file is not None:
+                self._write(STRING, value.encode())
+        return index
+
+    def _add_row(
+        self,
+        timestamp: float,
+        address: int,
+        model: int,
+        weight: float,
+        impedance: float,
+        impedance_500khz: float,
+        heart_rate: float,
+    ) -> None:
+        row = len(self._timestamp)
+        self._timestamp.append(timestamp)
+        self._address.append(address)
+        self._model.append(model)
+        self._weight.append(weight)
+        self._impedance.append(impedance)
+        self._impedance_500khz.append(impedance_500khz)
+        self._heart_rate.append(heart_rate)
+        if not self._sorted:
+            return
+        if self._order_ts and timestamp < self._order_ts[-1]:
+            self._sorted = False
+            return
+        self._order.append(row)
+        self._order_ts.append(timestamp)
+        rows, stamps = self._by_address.setdefault(address, (array("L"), array("d")))
+        rows.append(row)
+        stamps.append(timestamp)
+
+    def _write(self, kind: int, body: bytes) -> None:
+        self._file.write(_RECORD.pack(kind, len(body)) + body)
+
+    # ---- persistence ------------------------------------------------------
+
+    def _open(self) -> None:
+        if os.path.exists(self._path) and os.path.getsize(self._path) > 0:
+            valid = self._load()
+            self._file = open(self._path, "r+b")
+            self._file.truncate(valid)  # drop a record cut short by a crash
+            self._file.seek(valid)
+        else:
+            self._file = open(self._path, "wb")
+            self._file.write(_HEADER.pack(MAGIC, FORMAT_VERSION))
+            self._file.flush()
+
+    def _load(self) -> int:
+        """Read the file into the columns; return the length of its valid part."""
+        with open(self._path, "rb") as f:
+            buffer = f.read()
+        if len(buffer) < _HEADER.size:
+            raise ValueError(f"{self._path}: not a measurement store")
+        magic, version = _HEADER.unpack_from(buffer)
+        if magic != MAGIC:
+            raise ValueError(f"{self._path}: not a measurement store")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"{self._path}: unsupported format version {version}")
+        offset = _HEADER.size
+        while offset + _RECORD.size <= len(buffer):
+            kind, length = _RECORD.unpack_from(buffer, offset)
+            end = offset + _RECORD.size + length
+            if end > len(buffer):
+                break
+            body = buffer[offset + _RECORD.size : end]
+            if kind == STRING:
+                value = body.decode()
+                self._string_index[value] = len(self._strings)
+                self._strings.append(value)
+            elif kind == READING and length == _READING.size:
+                self._add_row(*_READING.unpack(body))
+            offset = end
+        return offset
+
+    def compact(self) -> None:
+        """
+        Rewrite the file in timestamp order, without duplicates.
+
+        Readings identical in every column (the same stored measurement
+        delivered twice, say) are kept once, in memory too. The new file
+        replaces the old one atomically.
+        """
+        self._ensure_sorted()
+        seen: set[tuple] = set()
+        rows = []
+        for row in self._order:
+            values = self._row(row)
+            key = tuple("nan" if v != v else v for v in values)  # NaN != NaN
+            if key not in seen:
+                seen.add(key)
+                rows.append(values)
+        self._rebuild(rows)
+
+    def prune(self, before: float) -> int:
+        """Drop readings timestamped before ``before``; return how many."""
+        self._ensure_sorted()
+        keep = bisect.bisect_left(self._order_ts, before)
+        removed = keep
+        self._rebuild([self._row(row) for row in self._order[keep:]])
+        return removed
+
+    def _row(self, row: int) -> tuple:
+        return (
+            self._timestamp[row],
+            self._strings[self._address[row]],
+            self._strings[self._model[row]],
+            self._weight[row],
+            self._impedance[row],
+            self._impedance_500khz[row],
+            self._heart_rate[row],
+        )
+
+    def _rebuild(self, rows: list[tuple]) -> None:
+        """Replace the columns (and the file) with ``rows``, in order."""
+        file, self._file = self._file, None
+        self._reset()
+        for timestamp, address, model, *values in rows:
+            self._add_row(
+                timestamp, self._intern(address), self._intern(model), *values
+            )
+        self._appended = 0
+        if file is None:
+            return
+        file.close()
+        tmp = f"{self._path}.tmp"
+        with open(tmp, "wb") as f:
+            self._file = f
+            f.write(_HEADER.pack(MAGIC, FORMAT_VERSION))
+            for value in self._strings:
+                self._write(STRING, value.encode())
+            for row in range(len(self)):
+                self._write(
+                    READING,
+                    _READING.pack(
+                        self._timestamp[row],
+                        self._address[row],
+                        self._model[row],
+                        self._weight[row],
+                        self._impedance[row],
+                        self._impedance_500khz[row],
+                        self._heart_rate[row],
+                    ),
+                )
+        os.replace(tmp, self._path)
+        self._file = open(self._path, "ab")
+
+    def close(self) -> None:
+        """Detach from every client and close the file."""
+        for scale in list(self._scale_models):
+            self.detach(scale)
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> MeasurementStore:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    # ---- queries ----------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._timestamp)
+
+    @property
+    def addresses(self) -> list[str]:
+        """Addresses with at least one reading."""
+        self._ensure_sorted()
+        return [self._strings[a] for a in self._by_address]
+
+    def _ensure_sorted(self) -> None:
+        if self._sorted:
+            return
+        timestamps = self._timestamp
+        order = sorted(range(len(timestamps)), key=timestamps.__getitem__)
+        self._order = array("L", order)
+        self._order_ts = array("d", (timestamps[row] for row in order))
+        self._by_address = {}
+        for row in order:
+            rows, stamps = self._by_address.setdefault(
+                self._address[row], (array("L"), array("d"))
+            )
+            rows.append(row)
+            stamps.append(timestamps[row])
+        self._sorted = True
+
+    def _rows(
+        self, start: float | None, end: float | None, address: str | None
+    ) -> array:
+        self._ensure_sorted()
+        if address is None:
+            rows, stamps = self._order, self._order_ts
+        else:
+            index = self._string_index.get(address)
+            if index is None or index not in self._by_address:
+                return array("L")
+            rows, stamps = self._by_address[index]
+        lo = 0 if start is None else bisect.bisect_left(stamps, start)
+        hi = len(stamps) if end is None else bisect.bisect_left(stamps, end)
+        return rows[lo:hi]
+
+    def query(
+        self,
+        start: float | None = None,
+        end: float | None = None,
+        address: str | None = None,
+    ) -> MeasurementColumns:
+        """Readings with ``start <= timestamp < end``, optionally for one address."""
+        rows = self._rows(start, end, address)
+        strings = self._strings
+        return MeasurementColumns(
+            timestamp=array("d", (self._timestamp[r] for r in rows)),
+            address=[strings[self._address[r]] for r in rows],
+            model=[strings[self._model[r]] for r in rows],
+            weight=array("d", (self._weight[r] for r in rows)),
+            impedance=array("d", (self._impedance[r] for r in rows)),
+            impedance_500khz=array("d", (self._impedance_500khz[r] for r in rows)),
+            heart_rate=array("d", (self._heart_rate[r] for r in rows)),
+        )
+
+    def readings(
+        self,
+        start: float | None = None,
+        end: float | None = None,
+        address: str | None = None,
+    ) -> Iterator[ScaleData]:
+        """The same readings as :meth:`query`, as :class:`~.data.ScaleData`."""
+        for row in self._rows(start, end, address):
+            weight = self._weight[row]
+            yield ScaleData(
+                address=self._strings[self._address[row]],
+                weight=None if math.isnan(weight) else weight,
+                impedance=_optional_int(self._impedance[row]),
+                impedance_500khz=_optional_int(self._impedance_500khz[row]),
+                heart_rate=_optional_int(self._heart_rate[row]),
+                received_at=self._timestamp[row],
+            )
+
+    def body_metrics(
+        self,
+        height_m: Any,
+        age: Any,
+        sex: Any,
+        *,
+        start: float | None = None,
+        end: float | None = None,
+        address: str | None = None,
+        athlete: Any = False,
+        metrics: type[BaseBodyMetrics] = BodyMetrics,
+    ) -> dict[str, Any]:
+        """
+        Body metrics for every stored reading that has an impedance.
+
+        Feeds the weight and impedance columns of the selected readings to
+        ``metrics.batch`` (:meth:`.BodyMetrics.batch` by default; pass
+        :class:`~.body_metrics.BodyMetricsV2` for an EFS-C651). The profile
+        arguments are scalars or arrays with one entry per selected reading
+        (those without an impedance included, in :meth:`query` order). The
+        result has ``batch``'s metric columns plus ``"timestamp"``.
+
+        Requires NumPy (``pip install etekcity_esf551_ble[batch]``).
+        """
+        try:
+            import numpy as np
+        except ImportError as ex:
+            raise ImportError(
+                "Batch body metrics require NumPy; install it with "
+                "`pip install etekcity_esf551_ble[batch]`"
+            ) from ex
+
+        columns = self.query(start, end, address)
+        impedance = np.frombuffer(columns.impedance, dtype=np.float64)
+        weight = np.frombuffer(columns.weight, dtype=np.float64)
+        mask = ~(np.isnan(impedance) | np.isnan(weight))
+
+        def rows(values: Any) -> Any:
+            return np.broadcast_to(np.asarray(values), weight.shape)[mask]
+
+        result = metrics.batch(
+            weight[mask],
+            rows(height_m),
+            rows(age),
+            rows(sex),
+            impedance[mask].astype(np.int64),
+            rows(athlete),
+        )
+        result["timestamp"] = np.frombuffer(columns.timestamp, dtype=np.float64)[mask]
+        return result
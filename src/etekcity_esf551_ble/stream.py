@@ -0,0 +1,130 @@
+"""Async-iterator delivery of measurements, decoupled from the BLE path."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from enum import StrEnum
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .data import ScaleData
+    from .scale import EtekcitySmartFitnessScale
+
+
+class OverflowPolicy(StrEnum):
+    """What a full :class:`MeasurementStream` does with a new reading."""
+
+    #: Discard the oldest queued reading to make room (the default: a
+    #: consumer that falls behind still sees the latest readings).
+    DROP_OLDEST = "drop_oldest"
+    #: Discard the new reading.
+    DROP_NEWEST = "drop_newest"
+    #: Keep the new reading waiting, in order, until the consumer makes room.
+    #: The BLE path still never waits, so the waiting readings pile up in a
+    #: backlog; past :attr:`MeasurementStream.MAX_BACKLOG` of them, new
+    #: readings are discarded.
+    BLOCK = "block"
+
+
+class MeasurementStream:
+    """
+    A bounded queue of one client's readings, consumed with ``async for``.
+
+    Created by :meth:`~.scale.EtekcitySmartFitnessScale.measurements`. The
+    client puts each reading into every open stream without waiting (the
+    notification handler runs inside bleak's callback), applying the
+    stream's :class:`OverflowPolicy` when it is full; ``dropped`` counts the
+    readings discarded that way. Iteration ends once the stream is closed —
+    by :meth:`close`, by leaving an ``async with`` block, or by the client's
+    ``async_stop`` — and the readings already queued have been consumed.
+    """
+
+    # Readings a BLOCK stream keeps waiting beyond ``maxsize`` before it
+    # discards new ones: a consumer that stopped must not grow memory forever.
+    MAX_BACKLOG = 1024
+
+    def __init__(
+        self,
+        scale: EtekcitySmartFitnessScale,
+        maxsize: int = 16,
+        overflow: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+    ) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+        self._scale = scale
+        self._queue: asyncio.Queue[ScaleData | None] = asyncio.Queue(maxsize)
+        self._overflow = OverflowPolicy(overflow)
+        self._backlog: deque[ScaleData] = deque()
+        self._closed = False
+        self.dropped = 0
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def qsize(self) -> int:
+        """Readings waiting to be consumed (including any BLOCK backlog)."""
+        return self._queue.qsize() + len(self._backlog)
+
+    def put(self, data: ScaleData) -> None:
+        """Queue ``data`` without waiting, per the overflow policy."""
+        if self._closed:
+            return
+        if self._backlog:
+            self._hold(data)  # BLOCK: keep arrival order
+            return
+        try:
+            self._queue.put_nowait(data)
+            return
+        except asyncio.QueueFull:
+            pass
+        if self._overflow is OverflowPolicy.BLOCK:
+            self._hold(data)
+        elif self._overflow is OverflowPolicy.DROP_NEWEST:
+            self.dropped += 1
+        else:
+            self._queue.get_nowait()
+            self._queue.put_nowait(data)
+            self.dropped += 1
+
+    def _hold(self, data: ScaleData) -> None:
+        """Add ``data`` to the BLOCK backlog, or discard it once that is full."""
+        if len(self._backlog) < self.MAX_BACKLOG:
+            self._backlog.append(data)
+            return
+        if not self.dropped:
+            self._scale._logger.warning(
+                "Measurement stream backlog full (%d readings); discarding new "
+                "readings until the consumer catches up",
+                self.MAX_BACKLOG,
+            )
+        self.dropped += 1
+
+    def close(self) -> None:
+        """End iteration once the queued readings have been consumed."""
+        if self._closed:
+            return
+        self._closed = True
+        self._scale._streams.discard(self)
+        if self._queue.empty():
+            self._queue.put_nowait(None)  # wake a waiting consumer
+
+    def __aiter__(self) -> MeasurementStream:
+        return self
+
+    async def __anext__(self) -> ScaleData:
+        if self._closed and self._queue.empty() and not self._backlog:
+            raise StopAsyncIteration
+        data = await self._queue.get()
+        if self._backlog:
+            self._queue.put_nowait(self._backlog.popleft())
+        if data is None:
+            raise StopAsyncIteration
+        return data
+
+    async def __aenter__(self) -> MeasurementStream:
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        self.close()
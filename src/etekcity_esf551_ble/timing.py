@@ -0,0 +1,246 @@
+"""
+Where a weigh-in's seconds go, from advertisement to notification callback.
+
+A :class:`LatencyMonitor` attached to a scale client stamps each session's
+phases with :func:`time.monotonic` as the client passes them
+(:class:`SessionPhase`) and, when the session delivers its measurement, hands
+the resulting :class:`SessionTiming` to its listeners and folds it into
+per-phase :class:`LatencyHistogram` aggregates::
+
+    monitor = LatencyMonitor(listener=lambda t: print(t.durations()))
+    monitor.attach(scale)
+    ...
+    for phase, hist in monitor.histograms.items():
+        print(phase, hist.count, hist.quantile(0.5), hist.quantile(0.99))
+
+The delivered :class:`~.data.ScaleData` also carries its session's timing in
+``ScaleData.timing``. Sessions that end without a measurement (failed
+connection or setup, disconnect before the final frame) are reported too,
+with ``completed`` False. With no monitor attached the clients skip all of
+this behind a single attribute check.
+"""
+
+from __future__ import annotations
+
+import bisect
+import time
+from collections.abc import Callable
+from enum import StrEnum
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .scale import EtekcitySmartFitnessScale
+
+
+class SessionPhase(StrEnum):
+    """Milestones of one session, in the order a client passes them."""
+
+    #: The target scale's advertisement passed the address filter.
+    ADVERTISEMENT = "advertisement"
+    #: ... and the cooldown gate.
+    COOLDOWN_PASSED = "cooldown_passed"
+    #: GATT only: connection attempt started.
+    CONNECTING = "connecting"
+    #: GATT only: connected with services resolved (bleak discovers services
+    #: before ``connect`` returns, so discovery is part of this phase).
+    CONNECTED = "connected"
+    #: GATT only: model setup done and notifications enabled.
+    SESSION_STARTED = "session_started"
+    #: First notification received (or, for advertisement-based scales, the
+    #: first advertisement carrying a reading).
+    FIRST_FRAME = "first_frame"
+    #: Protocol handshake complete, where the model has one: the EFS-A591S /
+    #: EFS-C651 session key confirmed, the ESF-24's set-time acknowledged.
+    HANDSHAKE = "handshake"
+    #: Final reading parsed, just before the notification callback.
+    FINAL_FRAME = "final_frame"
+
+
+_PHASE_ORDER = {phase: i for i, phase in enumerate(SessionPhase)}
+
+
+class SessionTiming:
+    """Monotonic timestamps of one session's phases (first occurrence wins)."""
+
+    __slots__ = ("address", "model", "marks", "completed")
+
+    def __init__(self, address: str, model: str) -> None:
+        self.address = address
+        self.model = model
+        #: Phase -> ``time.monotonic()`` when the session first reached it.
+        self.marks: dict[SessionPhase, float] = {}
+        #: True once the session delivered its measurement.
+        self.completed = False
+
+    def mark(self, phase: SessionPhase, at: float | None = None) -> None:
+        if phase not in self.marks:
+            self.marks[phase] = time.monotonic() if at is None else at
+
+    @property
+    def started_at(self) -> float | None:
+        return min(self.marks.values(), default=None)
+
+    @property
+    def total(self) -> float | None:
+        """Seconds from the first mark to the last."""
+        if not self.marks:
+            return None
+        return max(self.marks.values()) - min(self.marks.values())
+
+    def elapsed(self, phase: SessionPhase) -> float | None:
+        """Seconds from the session's first mark to ``phase``, if reached."""
+        if (at := self.marks.get(phase)) is None:
+            return None
+        return at - self.started_at
+
+    def between(self, start: SessionPhase, end: SessionPhase) -> float | None:
+        """Seconds from ``start`` to ``end``, if the session reached both."""
+        if start not in self.marks or end not in self.marks:
+            return None
+        return self.marks[end] - self.marks[start]
+
+    def durations(self) -> dict[SessionPhase, float]:
+        """Seconds spent reaching each phase reached, from the one before it."""
+        ordered = sorted(self.marks.items(), key=lambda kv: _PHASE_ORDER[kv[0]])
+        result: dict[SessionPhase, float] = {}
+        previous = None
+        for phase, at in ordered:
+            result[phase] = 0.0 if previous is None else max(at - previous, 0.0)
+            previous = at
+        return result
+
+    def __repr__(self) -> str:
+        phases = ", ".join(f"{p}={d * 1e3:.1f}ms" for p, d in self.durations().items())
+        state = "completed" if self.completed else "incomplete"
+        return f"SessionTiming({self.address}, {state}: {phases})"
+
+
+# Bucket upper bounds: 100 µs to ~3.5 min, four buckets per doubling.
+_BOUNDS = tuple(1e-4 * 2 ** (i / 4) for i in range(85))
+
+
+class LatencyHistogram:
+    """
+    Fixed log-bucket histogram of durations in seconds.
+
+    Buckets grow by 2**(1/4) (about 19 %), so :meth:`quantile` is accurate to
+    within one bucket; memory is constant however many sessions are added.
+    """
+
+    __slots__ = ("_counts", "count", "sum", "min", "max")
+
+    def __init__(self) -> None:
+        self._counts = [0] * (len(_BOUNDS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min: float | None = None
+        self.max: float | None = None
+
+    def add(self, seconds: float) -> None:
+        self._counts[bisect.bisect_left(_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+
+    @property
+    def mean(self) -> float | None:
+        return self.sum / self.count if self.count else None
+
+    def quantile(self, q: float) -> float | None:
+        """Upper bound of the bucket holding the ``q`` quantile (0 < q <= 1)."""
+        if not self.count:
+            return None
+        rank = max(1, round(q * self.count))
+        seen = 0
+        for i, n in enumerate(self._counts):
+            seen += n
+            if seen >= rank:
+                bound = _BOUNDS[i] if i < len(_BOUNDS) else self.max
+                return min(bound, self.max)
+        return self.max  # pragma: no cover - rank <= count
+
+    def buckets(self) -> list[tuple[float, int]]:
+        """Non-empty buckets as (upper bound in seconds, count)."""
+        bounds = (*_BOUNDS, float("inf"))
+        return [(bounds[i], n) for i, n in enumerate(self._counts) if n]
+
+
+class LatencyMonitor:
+    """
+    Collect :class:`SessionTiming` from any number of scale clients.
+
+    ``histograms`` maps each phase to the distribution of time spent reaching
+    it from the previous phase, plus ``"total"`` for advertisement to
+    callback and, for GATT clients, ``"connect_to_notify"`` for connection
+    attempt to notifications enabled; only completed sessions are
+    aggregated. ``listener`` (and any added with :meth:`add_listener`)
+    receives every session, completed or not, from the event loop — keep it
+    quick.
+    """
+
+    TOTAL = "total"
+    CONNECT_TO_NOTIFY = "connect_to_notify"
+
+    def __init__(self, listener: Callable[[SessionTiming], None] | None = None) -> None:
+        self._listeners: list[Callable[[SessionTiming], None]] = []
+        if listener is not None:
+            self._listeners.append(listener)
+        self._scales: list[EtekcitySmartFitnessScale] = []
+        self.histograms: dict[str, LatencyHistogram] = {}
+        self.completed = 0
+        self.incomplete = 0
+
+    def attach(self, scale: EtekcitySmartFitnessScale) -> None:
+        """Start timing ``scale``'s sessions."""
+        scale._latency_monitor = self
+        self._scales.append(scale)
+
+    def detach(self, scale: EtekcitySmartFitnessScale) -> None:
+        """Stop timing ``scale``'s sessions."""
+        if scale._latency_monitor is self:
+            scale._latency_monitor = None
+            scale._timing = None
+        if scale in self._scales:
+            self._scales.remove(scale)
+
+    def add_listener(self, listener: Callable[[SessionTiming], None]) -> None:
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[SessionTiming], None]) -> None:
+        self._listeners.remove(listener)
+
+    def report(self, timing: SessionTiming) -> None:
+        """Aggregate a finished session and pass it to the listeners."""
+        if timing.completed:
+            self.completed += 1
+            for phase, seconds in timing.durations().items():
+                self._histogram(phase).add(seconds)
+            self._histogram(self.TOTAL).add(timing.total)
+            connect_to_notify = timing.between(
+                SessionPhase.CONNECTING, SessionPhase.SESSION_STARTED
+            )
+            if connect_to_notify is not None:
+                self._histogram(self.CONNECT_TO_NOTIFY).add(connect_to_notify)
+        else:
+            self.incomplete += 1
+        for listener in self._listeners:
+            listener(timing)
+
+    def _histogram(self, key: str) -> LatencyHistogram:
+        if (hist := self.histograms.get(key)) is None:
+            hist = self.histograms[key] = LatencyHistogram()
+        return hist
+
+    def summary(
+        self, quantiles: tuple[float, ...] = (0.5, 0.9, 0.99)
+    ) -> dict[str, dict[str, float | None]]:
+        """Per phase: count, mean and the given quantiles, in seconds."""
+        return {
+            key: {
+                "count": hist.count,
+                "mean": hist.mean,
+                **{f"p{q * 100:g}": hist.quantile(q) for q in quantiles},
+            }
+            for key, hist in self.histograms.items()
+        }
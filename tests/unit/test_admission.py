@@ -0,0 +1,128 @@
+"""Tests for connection-attempt admission control."""
+
+import asyncio
+import time
+
+import pytest
+
+from src.etekcity_esf551_ble import (
+    AdmissionController,
+    AdmissionDropped,
+    ConnectionPriority,
+    ESF551Scale,
+)
+from src.etekcity_esf551_ble.simulator import ScaleSimulator, SimulatedESF551
+
+
+async def _hold(admission, order, name, release, **kwargs):
+    async with admission.admit(**kwargs):
+        order.append(name)
+        await release.wait()
+
+
+@pytest.mark.asyncio
+async def test_admits_by_priority_then_deadline():
+    admission = AdmissionController(max_concurrent=1, max_advertisement_age=5.0)
+    order = []
+    release = asyncio.Event()
+    now = time.monotonic()
+    tasks = [asyncio.create_task(_hold(admission, order, "holder", release))]
+    await asyncio.sleep(0)
+    for name, kwargs in [
+        ("late", {"advertised_at": now}),
+        ("early", {"advertised_at": now - 1}),
+        ("weigh_in", {"priority": ConnectionPriority.WEIGH_IN}),
+    ]:
+        tasks.append(
+            asyncio.create_task(_hold(admission, order, name, release, **kwargs))
+        )
+    await asyncio.sleep(0)
+    assert (admission.active, admission.waiting) == (1, 3)
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert order == ["holder", "weigh_in", "early", "late"]
+    assert (admission.active, admission.waiting) == (0, 0)
+    assert admission.admitted == 4
+    assert admission.wait_times.count == 4
+
+
+@pytest.mark.asyncio
+async def test_drops_attempts_past_their_deadline():
+    admission = AdmissionController(max_concurrent=1, max_advertisement_age=0.05)
+    release = asyncio.Event()
+    holder = asyncio.create_task(_hold(admission, [], "holder", release))
+    await asyncio.sleep(0)
+
+    with pytest.raises(AdmissionDropped):
+        async with admission.admit():
+            pass
+    with pytest.raises(AdmissionDropped):
+        async with admission.admit(advertised_at=time.monotonic() - 1):
+            pass
+
+    assert (admission.dropped, admission.waiting) == (2, 0)
+    release.set()
+    await holder
+    assert admission.active == 0
+
+
+@pytest.mark.asyncio
+async def test_scales_wait_their_turn():
+    sim = ScaleSimulator()
+    addresses = ["D0:4D:00:11:22:33", "D0:4D:00:11:22:34", "D0:4D:00:11:22:35"]
+    for address in addresses:
+        sim.add(SimulatedESF551(address, weight_kg=70.0))
+    admission = AdmissionController(max_concurrent=1)
+    readings = []
+    scales = [
+        ESF551Scale(
+            address,
+            readings.append,
+            bleak_scanner_backend=sim.scanner(),
+            client_factory=sim.connect,
+            admission=admission,
+        )
+        for address in addresses
+    ]
+    for scale in scales:
+        await scale.async_start()
+
+    await sim.advertise()
+    for _ in range(200):
+        if len(readings) == 3:
+            break
+        await asyncio.sleep(0.01)
+
+    assert sorted(r.address for r in readings) == addresses
+    assert (admission.admitted, admission.dropped) == (3, 0)
+    for scale in scales:
+        await scale.async_stop()
+
+
+@pytest.mark.asyncio
+async def test_stale_attempt_leaves_cooldown_closed():
+    sim = ScaleSimulator()
+    address = "D0:4D:00:11:22:33"
+    sim.add(SimulatedESF551(address, weight_kg=70.0))
+    admission = AdmissionController(max_concurrent=1, max_advertisement_age=0.02)
+    release = asyncio.Event()
+    holder = asyncio.create_task(_hold(admission, [], "holder", release))
+    await asyncio.sleep(0)
+    scale = ESF551Scale(
+        address,
+        None,
+        bleak_scanner_backend=sim.scanner(),
+        client_factory=sim.connect,
+        admission=admission,
+    )
+    await scale.async_start()
+
+    await sim.advertise()
+
+    assert admission.dropped == 1
+    assert scale._client is None and not scale._initializing
+    assert scale._cooldown_end_time <= time.time()
+    release.set()
+    await holder
+    await scale.async_stop()
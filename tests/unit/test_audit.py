@@ -0,0 +1,68 @@
+"""Tests for the offline advertisement-capture audit CLI."""
+
+import io
+import json
+
+import pytest
+
+from src.etekcity_esf551_ble import audit
+
+ESF551_ROW = {
+    "address": "D0:4D:00:1C:29:62",
+    "local_name": "Etekcity Fitness Scale",
+    "manufacturer_data": {"1744": "0162291c004dd00002"},
+}
+UNREGISTERED_ROW = {
+    "address": "04:AC:44:0B:B3:65",
+    "local_name": None,
+    "manufacturer_data": {"65535": "022602000065b30b44ac04"},
+}
+PHONE_ROW = {"address": "AA:BB:CC:DD:EE:FF", "local_name": "Phone"}
+
+
+def test_read_jsonl_and_csv_agree():
+    jsonl = "\n".join(json.dumps(r) for r in (ESF551_ROW, UNREGISTERED_ROW, PHONE_ROW))
+    csv_text = (
+        "address,local_name,manufacturer_data\n"
+        "D0:4D:00:1C:29:62,Etekcity Fitness Scale,1744:0162291c004dd00002\n"
+        "04:AC:44:0B:B3:65,,65535:022602000065b30b44ac04\n"
+        "AA:BB:CC:DD:EE:FF,Phone,\n"
+    )
+    rows = list(audit.read_jsonl(io.StringIO(jsonl + "\n\n")))
+    assert rows == list(audit.read_csv(io.StringIO(csv_text)))
+    assert rows[0] == (
+        "D0:4D:00:1C:29:62",
+        "Etekcity Fitness Scale",
+        {1744: bytes.fromhex("0162291c004dd00002")},
+    )
+    assert rows[2] == ("AA:BB:CC:DD:EE:FF", "Phone", {})
+
+
+def test_malformed_row_names_the_line():
+    with pytest.raises(ValueError, match="line 2"):
+        list(audit.read_jsonl(io.StringIO(json.dumps(ESF551_ROW) + "\n{oops\n")))
+
+
+def test_cli_reports_counts_and_unregistered(tmp_path, capsys):
+    path = tmp_path / "adverts.jsonl"
+    rows = [ESF551_ROW, ESF551_ROW, UNREGISTERED_ROW, PHONE_ROW]
+    path.write_text("\n".join(json.dumps(r) for r in rows))
+    assert audit.main(["--json", str(path)]) == 0
+    assert json.loads(capsys.readouterr().out) == {
+        "total": 4,
+        "counts": {"ESF-551": 2, "ESF-24": 1},
+        "unrecognized": 1,
+        "unregistered": [[65535, 550]],
+    }
+    assert audit.main([str(path)]) == 0
+    out = capsys.readouterr().out
+    assert "  ESF-551      2\n" in out and "  65535, 550 (0x0226)" in out
+
+
+def test_cli_exits_on_bad_input(tmp_path, capsys):
+    path = tmp_path / "adverts.csv"
+    path.write_text("address,local_name,manufacturer_data\nAA,x,1744:zz\n")
+    with pytest.raises(SystemExit) as exc:
+        audit.main([str(path)])
+    assert exc.value.code == 1
+    assert "line 2" in capsys.readouterr().err
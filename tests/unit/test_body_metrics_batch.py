@@ -0,0 +1,71 @@
+"""Unit tests for the vectorized body-metrics batch API."""
+
+import random
+
+import pytest
+
+from src.etekcity_esf551_ble.body_metrics import BodyMetrics, BodyMetricsV2, Sex
+
+np = pytest.importorskip("numpy")
+
+
+def _rows(count: int, seed: int = 551):
+    """Deterministic spread of inputs, including off-grid weights/heights
+    that exercise the rounding-tie handling."""
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(count):
+        weight = rng.choice(
+            [round(rng.uniform(15, 220), 2), round(rng.uniform(15, 220), 3)]
+        )
+        height = rng.choice([round(rng.uniform(1.0, 2.2), 2), rng.uniform(1.0, 2.2)])
+        rows.append(
+            (
+                weight,
+                height,
+                rng.randint(5, 99),
+                rng.choice([Sex.Male, Sex.Female]),
+                rng.randint(100, 1500),
+                rng.random() < 0.5,
+            )
+        )
+    return rows
+
+
+@pytest.mark.parametrize("cls", [BodyMetrics, BodyMetricsV2])
+def test_batch_matches_scalar_exactly(cls):
+    rows = _rows(3000)
+    columns = cls.batch(*zip(*rows))
+
+    for i, row in enumerate(rows):
+        expected = cls(*row).as_dict()
+        assert set(columns) == set(expected)
+        for name, value in expected.items():
+            assert columns[name][i] == value, (name, row)
+
+
+@pytest.mark.parametrize("cls", [BodyMetrics, BodyMetricsV2])
+def test_batch_integer_metrics_are_integer_columns(cls):
+    columns = cls.batch([75.0], [1.8], [30], [Sex.Male], [500])
+    for name, value in cls(75.0, 1.8, 30, Sex.Male, 500).as_dict().items():
+        if isinstance(value, int):
+            assert np.issubdtype(columns[name].dtype, np.integer), name
+
+
+def test_batch_broadcasts_scalar_inputs():
+    columns = BodyMetrics.batch([70.0, 80.0, 90.0], 1.75, 40, Sex.Female, 520, True)
+    assert columns["body_fat_percentage"].shape == (3,)
+    assert columns["body_fat_percentage"][1] == (
+        BodyMetrics(80.0, 1.75, 40, Sex.Female, 520, True).body_fat_percentage
+    )
+
+
+def test_batch_reproduces_the_metabolic_age_ladder():
+    # Walk the health score across every band boundary of the ladder.
+    rows = [
+        (weight / 2, 1.75, 40, Sex.Male, 500, False) for weight in range(80, 300)
+    ]
+    columns = BodyMetrics.batch(*zip(*rows))
+    expected = [BodyMetrics(*row).metabolic_age for row in rows]
+    assert columns["metabolic_age"].tolist() == expected
+    assert len(set(expected)) > 5
@@ -0,0 +1,164 @@
+"""Unit tests for BLE session capture and replay."""
+
+import io
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from bleak.backends.device import BLEDevice
+from bleak.backends.scanner import AdvertisementData
+
+from src.etekcity_esf551_ble import EFSA591SScale, ESF551Scale, FIT8SScale
+from src.etekcity_esf551_ble.capture import (
+    ADVERTISEMENT,
+    NOTIFICATION,
+    SESSION_KEY,
+    WRITE,
+    CaptureRecorder,
+    CaptureReplayer,
+    read_capture,
+)
+from src.etekcity_esf551_ble.efsa591s import protocol as a5
+
+from .test_efsa591s_protocol import IV, KE_RESP, KEY, MAC
+from .test_scales import _FIT8S_ADDRESS, _FIT8S_STABLE_LB
+
+ESF551_ADDRESS = "00:11:22:33:44:55"
+DH = a5.DHParams(d=41983, e=31, g=16, f=9840)  # session-1 capture
+# weight 1.0 kg, impedance 100 ohms (see test_esf551_protocol.py)
+ESF551_FRAME = bytes.fromhex("a502001000000161a100e80300640000000000010100")
+
+
+def _advertisement(payload: bytes) -> AdvertisementData:
+    return AdvertisementData(
+        local_name="Fit 8S",
+        manufacturer_data={0x1234: payload},
+        service_data={"0000fff0-0000-1000-8000-00805f9b34fb": b"\x01"},
+        service_uuids=["0000fff0-0000-1000-8000-00805f9b34fb"],
+        tx_power=None,
+        rssi=-61,
+        platform_data=(),
+    )
+
+
+def _connected(scale):
+    scale._client = Mock(start_notify=AsyncMock(), write_gatt_char=AsyncMock())
+    return scale
+
+
+def _device(address, name):
+    device = Mock(spec=BLEDevice)
+    device.address = address
+    device.name = name
+    return device
+
+
+def test_records_round_trip():
+    buf = io.BytesIO()
+    recorder = CaptureRecorder(buf)
+    ad = _advertisement(_FIT8S_STABLE_LB)
+    recorder.record_advertisement(BLEDevice(_FIT8S_ADDRESS, "Fit 8S", None), ad)
+    recorder.record_notification(ESF551_ADDRESS, "Scale", "fff1", ESF551_FRAME)
+    recorder.record_write(ESF551_ADDRESS, "fff2", b"\x01\x02", False)
+    recorder.record_session_key(MAC, KEY, IV)
+    recorder.close()
+
+    buf.seek(0)
+    records = list(read_capture(buf))
+    kinds = [r.kind for r in records]
+    assert kinds == [ADVERTISEMENT, NOTIFICATION, WRITE, SESSION_KEY]
+    assert records[0].advertisement == ad
+    assert records[0].name == "Fit 8S"
+    assert records[1].data == ESF551_FRAME and records[1].char == "fff1"
+    assert records[2].response is False and records[2].data == b"\x01\x02"
+    assert records[3].address == MAC and records[3].data == KEY + IV
+    times = [r.time for r in records]
+    assert times == sorted(times)
+
+
+def test_rejects_foreign_files():
+    with pytest.raises(ValueError):
+        list(read_capture(io.BytesIO(b"not a capture")))
+
+
+def test_truncated_tail_is_ignored():
+    buf = io.BytesIO()
+    recorder = CaptureRecorder(buf)
+    recorder.record_notification(ESF551_ADDRESS, "Scale", "fff1", ESF551_FRAME)
+    recorder.close()
+    data = buf.getvalue()
+    assert len(list(read_capture(io.BytesIO(data[:-3])))) == 0
+    assert len(list(read_capture(io.BytesIO(data)))) == 1
+
+
+@pytest.mark.asyncio
+async def test_gatt_session_is_recorded_and_replayed(tmp_path):
+    path = tmp_path / "esf551.etkcap"
+    live = _connected(
+        ESF551Scale(ESF551_ADDRESS, Mock(), bleak_scanner_backend=Mock())
+    )
+    with CaptureRecorder(path) as recorder:
+        recorder.attach(live)
+        await live._start_notify("fff1", _device(ESF551_ADDRESS, "Scale"))
+        notify = live._client.start_notify.call_args.args[1]
+        notify("fff1", bytearray(ESF551_FRAME))
+        await live._write_gatt_char("fff2", b"\x01", False)
+    assert live._recorder is None
+
+    callback = Mock()
+    replayed = ESF551Scale(ESF551_ADDRESS, callback, bleak_scanner_backend=Mock())
+    replayer = CaptureReplayer(path)
+    assert [r.kind for r in replayer.records] == [NOTIFICATION, WRITE]
+    assert await replayer.replay(replayed, speed=0) == 1
+
+    callback.assert_called_once()
+    scale_data = callback.call_args.args[0]
+    assert scale_data.measurements == {"weight": 1.0, "impedance": 100}
+    assert scale_data.name == "Scale"
+
+
+@pytest.mark.asyncio
+async def test_advertisement_scale_replay():
+    buf = io.BytesIO()
+    live = FIT8SScale(_FIT8S_ADDRESS, Mock(), bleak_scanner_backend=Mock())
+    recorder = CaptureRecorder(buf)
+    recorder.attach(live)
+    device = BLEDevice(_FIT8S_ADDRESS, "Fit 8S", None)
+    await live._advertisement_callback(device, _advertisement(_FIT8S_STABLE_LB))
+    # Other devices' advertisements are not the client's traffic.
+    await live._advertisement_callback(
+        BLEDevice("11:22:33:44:55:66", None, None), _advertisement(b"")
+    )
+    recorder.close()
+
+    callback = Mock()
+    replayed = FIT8SScale(_FIT8S_ADDRESS, callback, bleak_scanner_backend=Mock())
+    buf.seek(0)
+    assert await CaptureReplayer(buf).replay(replayed, speed=100) == 1
+    callback.assert_called_once()
+    assert callback.call_args.args[0].measurements["weight"] == 70.5
+
+
+@pytest.mark.asyncio
+async def test_encrypted_session_key_is_recorded_and_restored():
+    buf = io.BytesIO()
+    live = _connected(EFSA591SScale(MAC, Mock(), bleak_scanner_backend=Mock()))
+    live._write_char = "fff2"
+    recorder = CaptureRecorder(buf)
+    recorder.attach(live)
+    with (
+        patch.object(a5, "generate_dh", return_value=DH),
+        patch.object(a5, "random_iv", return_value=IV),
+    ):
+        await live._start_notify("fff1", _device(MAC, "Etekcity_Apex"))
+        await live._send_key_exchange()
+        notify = live._client.start_notify.call_args.args[1]
+        notify("fff1", bytearray(KE_RESP))
+    recorder.close()
+    buf.seek(0)
+
+    replayed = EFSA591SScale(MAC, Mock(), bleak_scanner_backend=Mock())
+    replayer = CaptureReplayer(buf)
+    assert SESSION_KEY in [r.kind for r in replayer.records]
+    await replayer.replay(replayed, speed=0)
+    assert replayed._cipher.key == KEY
+    assert replayed._cipher.iv == IV
@@ -0,0 +1,99 @@
+"""Tests for the adaptive cooldown."""
+
+import asyncio
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from src.etekcity_esf551_ble import AdaptiveCooldown, ESF551Scale
+from src.etekcity_esf551_ble.simulator import ScaleSimulator, SimulatedESF551
+
+ADDRESS = "D0:4D:00:11:22:33"
+
+
+def _session(cooldown, start, tail, fallback=5.0, step=0.5, window=None):
+    """Arm at ``start``, then advertise every ``step`` seconds for ``tail``."""
+    armed = cooldown.arm(ADDRESS, fallback, now=start)
+    t = step
+    while t <= tail:
+        cooldown.observe(ADDRESS, t < (armed if window is None else window), start + t)
+        t += step
+    return armed
+
+
+def test_learns_tail_percentile_after_min_samples():
+    cooldown = AdaptiveCooldown(percentile=0.9, min_samples=3, margin=0.5)
+
+    windows = [_session(cooldown, 100.0 * i, tail) for i, tail in enumerate([8, 7, 9])]
+    assert windows == [5.0, 5.0, 5.0]  # fallback until three tails are known
+    # Advertisements after the 5 s window, while the tail went on, got through.
+    assert cooldown.stats[ADDRESS].early > 0
+
+    window = _session(cooldown, 400.0, 7)
+    stats = cooldown.stats[ADDRESS]
+    assert list(stats.samples) == [8.0, 7.0, 9.0]
+    assert window == stats.window == 9.5
+    early = stats.early
+    _session(cooldown, 500.0, 7)
+    assert stats.early == early  # the learned window covers the tail
+
+
+def test_window_is_clamped_and_quiet_gap_ends_tail():
+    cooldown = AdaptiveCooldown(min_samples=1, minimum=2.0, maximum=6.0)
+    _session(cooldown, 0.0, 0.5)
+    cooldown.observe(ADDRESS, False, now=50.0)  # quiet since: the tail is over
+    assert cooldown.window(ADDRESS, 5.0) == 2.0  # 0.5 s + margin, raised to minimum
+
+    cooldown.arm(ADDRESS, 5.0, now=100.0)
+    cooldown.observe(ADDRESS, True, now=101.0)
+    cooldown.observe(ADDRESS, False, now=200.0)  # long after: a new visit
+    assert cooldown.stats[ADDRESS].samples[-1] == 1.0
+    assert cooldown.stats[ADDRESS].early == 0
+
+    _session(cooldown, 300.0, 20)
+    cooldown.arm(ADDRESS, 5.0, now=400.0)
+    assert cooldown.stats[ADDRESS].samples[-1] == 6.0
+    assert cooldown.window(ADDRESS, 5.0) == 6.0
+
+
+@pytest.mark.asyncio
+async def test_scale_arms_learned_window_on_disconnect():
+    sim = ScaleSimulator()
+    sim.add(SimulatedESF551(ADDRESS, weight_kg=70.0))
+    cooldown = AdaptiveCooldown(min_samples=1)
+    readings = []
+    scale = ESF551Scale(
+        ADDRESS,
+        readings.append,
+        bleak_scanner_backend=sim.scanner(),
+        client_factory=sim.connect,
+        cooldown_seconds=0,
+    )
+    cooldown.attach(scale)
+    await scale.async_start()
+    await sim.advertise()
+    for _ in range(200):
+        if readings and scale._client is None:
+            break
+        await asyncio.sleep(0.01)
+
+    stats = cooldown.stats[ADDRESS]
+    assert (stats.sessions, stats.window) == (1, 0)  # fallback: cooldown_seconds
+    await sim.advertise()  # the tail: no window, so it gets through
+    assert stats.early == 1
+    await scale.async_stop()
+    cooldown.detach(scale)
+    assert scale._adaptive_cooldown is None
+
+
+def test_giving_up_after_setup_failures_arms_learned_window():
+    cooldown = AdaptiveCooldown(min_samples=1, margin=0.0)
+    scale = ESF551Scale(ADDRESS, None, bleak_scanner_backend=Mock(), cooldown_seconds=5)
+    cooldown.attach(scale)
+    _session(cooldown, 0.0, 3.0)
+    cooldown.observe(ADDRESS, False, now=50.0)  # a 3 s tail is learned
+    for _ in range(scale._MAX_CONSECUTIVE_SETUP_FAILURES):
+        scale._register_setup_failure("test")
+    assert cooldown.stats[ADDRESS].sessions == 2
+    assert scale._cooldown_end_time - time.time() == pytest.approx(3.0, abs=0.5)
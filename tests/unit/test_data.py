@@ -0,0 +1,70 @@
+"""Tests for the ScaleData reading type."""
+
+import dataclasses
+import pickle
+
+import pytest
+
+from src.etekcity_esf551_ble import (
+    HEART_RATE_KEY,
+    IMPEDANCE_500KHZ_KEY,
+    IMPEDANCE_KEY,
+    WEIGHT_KEY,
+    ScaleData,
+    WeightUnit,
+)
+
+
+def test_typed_fields_back_the_measurements_view():
+    data = ScaleData(name="scale", weight=72.4, heart_rate=61)
+    assert data.measurements == {WEIGHT_KEY: 72.4, HEART_RATE_KEY: 61}
+    assert IMPEDANCE_KEY not in data.measurements
+    data.measurements[IMPEDANCE_KEY] = 510
+    assert data.impedance == 510
+    del data.measurements[HEART_RATE_KEY]
+    assert data.heart_rate is None
+    assert list(data.measurements) == [WEIGHT_KEY, IMPEDANCE_KEY]
+    with pytest.raises(KeyError):
+        del data.measurements[HEART_RATE_KEY]
+
+
+def test_measurements_assignment_replaces_all():
+    data = ScaleData(weight=1.0, impedance=2)
+    data.measurements = {WEIGHT_KEY: 80.15, IMPEDANCE_500KHZ_KEY: 480, "x": "y"}
+    assert (data.weight, data.impedance, data.impedance_500khz) == (80.15, None, 480)
+    # Keys without a typed field are kept, after the typed ones
+    assert dict(data.measurements) == {
+        WEIGHT_KEY: 80.15,
+        IMPEDANCE_500KHZ_KEY: 480,
+        "x": "y",
+    }
+    data.measurements = data.measurements
+    assert len(data.measurements) == 3
+
+
+def test_compact_equal_and_picklable():
+    data = ScaleData(
+        "scale",
+        "AA:BB:CC:DD:EE:FF",
+        display_unit=WeightUnit.LB,
+        measurements={WEIGHT_KEY: 70.0},
+        received_at=1.0,
+    )
+    assert not hasattr(data, "__dict__")
+    other = ScaleData("scale", "AA:BB:CC:DD:EE:FF", display_unit=WeightUnit.LB)
+    other.weight = 70.0
+    assert data == other  # received_at and timing don't take part
+    assert pickle.loads(pickle.dumps(data)) == data
+
+
+def test_replace_and_asdict():
+    data = ScaleData("scale", weight=70.0, measurements={"x": "y"}, received_at=1.0)
+    renamed = dataclasses.replace(data, name="renamed")
+    assert renamed.name == "renamed"
+    assert renamed.measurements == {WEIGHT_KEY: 70.0, "x": "y"}
+    assert renamed.received_at == 1.0
+    renamed.measurements["x"] = "z"
+    assert data.measurements["x"] == "y"  # extras are copied, not shared
+    as_dict = dataclasses.asdict(data)
+    assert as_dict[WEIGHT_KEY] == 70.0 and as_dict["extra"] == {"x": "y"}
+    assert "_extra" not in as_dict and "measurements" not in as_dict
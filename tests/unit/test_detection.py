@@ -4,17 +4,26 @@ Fixtures are real captured payloads (manufacturer-data value as reported by
 bleak/HA — the two-byte company ID already stripped).
 """
 
+import fnmatch
 import logging
+from unittest.mock import patch
+
+import pytest
 
 from src.etekcity_esf551_ble import detection as detection_module
 from src.etekcity_esf551_ble.detection import (
     CAPABILITIES,
     ETEKCITY_MANUFACTURER_ID,
+    BulkDetectionReport,
+    DetectionCache,
     QN_MANUFACTURER_ID,
     ScaleModel,
+    advertisement_filter_patterns,
     detect_model,
+    detect_models_bulk,
     is_etekcity_frame,
     parse_model_code,
+    register_fallback_matcher,
 )
 
 # Real captures
@@ -471,3 +480,190 @@ def test_unrecognized_qn_identifier_logged(caplog):
         )
         detect_model(None, {QN: payload}, address="04:AC:44:0B:B3:65")
     assert caplog.text.count("unrecognized model identifier 550") == 1
+
+
+def test_detection_cache_matches_detect_model():
+    cases = [
+        ("Etekcity Fitness Scale", {MFR: ESF551_PAYLOAD}, "D0:4D:00:1C:29:62"),
+        (None, {MFR: FIT8S_PAYLOAD}, None),
+        (None, {MFR: PURIFIER_PAYLOAD}, None),
+        (None, {QN: RENPHO_QN_PAYLOAD}, "AA:BB:CC:DD:EE:FF"),
+        ("Etekcity Smart Fitness Scale", {MFR: EFSC651_PAYLOAD}, None),
+        ("QN-Scale1", None, None),
+        ("SomeHeadphones", {76: b"\x02\x15"}, None),
+    ]
+    cache = DetectionCache()
+    for _ in range(2):
+        for args in cases:
+            assert cache.detect(*args) == detect_model(*args)
+    assert (cache.misses, cache.hits, len(cache)) == (7, 7, 7)
+    assert cache.hit_rate == 0.5
+
+
+def test_detection_cache_ignores_volatile_bytes():
+    cache = DetectionCache()
+    address = "04:AC:44:0B:AA:07"
+    for h in ("012601010107aa0b44ac04", "012601000207aa0b44ac04"):
+        assert cache(None, {QN: bytes.fromhex(h)}, address) == ScaleModel.ESF24
+    # FIT-8S live weight past the identifier, and EFS-C651 header flag bits
+    fit8s = FIT8S_PAYLOAD[:9] + bytes(11)
+    assert cache(None, {MFR: fit8s}) == ScaleModel.FIT8S
+    assert cache(None, {MFR: FIT8S_PAYLOAD}) == ScaleModel.FIT8S
+    assert cache.misses == 2 and cache.hits == 2
+    # ...but not the bytes classification depends on
+    other_mac = {QN: bytes.fromhex("012601000207aa0b44ac05")}
+    assert cache(None, other_mac, address) == detect_model(None, other_mac, address)
+    assert cache.misses == 3
+
+
+def test_detection_cache_caches_negative_results():
+    cache = DetectionCache()
+    with patch.object(detection_module, "detect_model", wraps=detect_model) as detect:
+        for _ in range(3):
+            assert cache.detect(None, {MFR: PURIFIER_PAYLOAD}) is None
+    assert detect.call_count == 1
+
+
+def test_detection_cache_ttl_and_lru_bounds():
+    clock = [0.0]
+    cache = DetectionCache(maxsize=2, ttl=10.0)
+    with patch.object(detection_module.time, "monotonic", lambda: clock[0]):
+        cache.detect("QN-Scale1", None)
+        cache.detect("A", None)
+        cache.detect("QN-Scale1", None)  # refreshes its LRU position
+        cache.detect("B", None)  # evicts "A"
+        assert len(cache) == 2 and cache.evictions == 1
+        cache.detect("QN-Scale1", None)
+        assert cache.hits == 2
+        clock[0] = 11.0
+        cache.detect("QN-Scale1", None)  # expired: recomputed
+    assert cache.misses == 4 and cache.evictions == 2
+
+
+def test_detection_cache_reports_unregistered_once(caplog):
+    detection_module._reported_identifiers.clear()
+    payload = bytes.fromhex("0162291c004dd00063")  # identifier 99
+    cache = DetectionCache()
+    with caplog.at_level(logging.INFO, logger="src.etekcity_esf551_ble.detection"):
+        for _ in range(3):
+            assert cache("Etekcity Smart Fitness Scale", {MFR: payload}) is None
+        cache.clear()
+        cache("Etekcity Smart Fitness Scale", {MFR: payload})
+    assert caplog.text.count("unrecognized model identifier 99") == 1
+
+
+@pytest.fixture
+def restore_fallback_matchers():
+    saved = list(detection_module.FALLBACK_MATCHERS)
+    yield
+    detection_module.FALLBACK_MATCHERS[:] = saved
+    detection_module._build_fallback_index()
+
+
+def _fnmatch_fallback(local_name, manufacturer_data, address):
+    """The per-advertisement fnmatch loop the compiled index replaces."""
+    for model, required_mfr_id, pattern in detection_module.FALLBACK_MATCHERS:
+        if required_mfr_id is not None and required_mfr_id not in manufacturer_data:
+            continue
+        for candidate in (local_name, address):
+            if candidate and fnmatch.fnmatch(candidate.lower(), pattern.lower()):
+                return model, pattern
+    return None
+
+
+def test_fallback_index_matches_fnmatch_in_list_order(restore_fallback_matchers):
+    register_fallback_matcher(ScaleModel.ESF18, "qn-scale?", QN)
+    register_fallback_matcher(ScaleModel.ESF17, "cf:e9:*")
+    register_fallback_matcher(ScaleModel.ESF551, "*Body*[0-9]")
+    names = [None, "QN-Scale1", "qn-scale2", "My Body Scale 3", "CF:E9:06:00:00:01"]
+    addresses = [None, "cf:e9:06:28:86:45", "CF:E9:07:00:00:00", "04:AC:44:00:00:00"]
+    manufacturer_data = [{}, {MFR: b""}, {QN: b""}, {MFR: b"", QN: b""}]
+    for name in names:
+        for address in addresses:
+            for mfr in manufacturer_data:
+                assert detection_module._match_fallback(
+                    name, mfr, address
+                ) == _fnmatch_fallback(name, mfr, address), (name, address, mfr)
+
+
+def test_registered_matcher_invalidates_detection_cache(restore_fallback_matchers):
+    cache = DetectionCache()
+    assert cache("Etekcity Bathroom Scale", None) is None
+    register_fallback_matcher(ScaleModel.ESF24, "Etekcity Bathroom*")
+    assert ScaleModel.ESF24 == cache("Etekcity Bathroom Scale", None)
+    assert detect_model("etekcity bathroom scale X", None) == ScaleModel.ESF24
+    assert cache.misses == 2
+
+
+def test_directly_appended_matcher_is_indexed(restore_fallback_matchers):
+    cache = DetectionCache()
+    assert cache("Etekcity Bathroom Scale", None) is None
+    detection_module.FALLBACK_MATCHERS.append(
+        (ScaleModel.ESF24, None, "Etekcity Bathroom*")
+    )
+    assert ScaleModel.ESF24 == cache("Etekcity Bathroom Scale", None)
+    assert detect_model("etekcity bathroom scale X", None) == ScaleModel.ESF24
+
+
+def test_detect_models_bulk_matches_detect_model_and_collects_identifiers(caplog):
+    detection_module._reported_identifiers.clear()
+    unregistered_qn = bytes.fromhex("022602000065b30b44ac04")  # 0x0226
+    rows = [
+        ("D0:4D:00:1C:29:62", "Etekcity Fitness Scale", {MFR: ESF551_PAYLOAD}),
+        (None, None, {MFR: FIT8S_PAYLOAD}),
+        (None, None, {MFR: PURIFIER_PAYLOAD}),
+        ("04:AC:44:0B:B3:65", None, {QN: unregistered_qn}),
+        ("04:AC:44:0B:B3:65", None, {QN: unregistered_qn}),
+        (None, "Etekcity Fitness Scale", {MFR: bytes.fromhex("0162291c004dd00063")}),
+        (None, "SomeHeadphones", None),
+    ]
+    report = BulkDetectionReport()
+    with caplog.at_level(logging.INFO, logger="src.etekcity_esf551_ble.detection"):
+        results = list(detect_models_bulk(rows, report))
+    assert results == [detect_model(n, m, a) for a, n, m in rows]
+    assert report.total == 7 and report.unrecognized == 3
+    assert report.counts == {
+        ScaleModel.ESF551: 1,
+        ScaleModel.FIT8S: 1,
+        ScaleModel.ESF24: 2,
+    }
+    assert report.unregistered == {(QN, 0x0226), (MFR, 99)}
+    # Collected, not logged (the detect_model calls above log them once)
+    assert caplog.text.count("unrecognized model identifier 550") == 1
+
+
+def test_detect_models_bulk_is_lazy_and_memoized():
+    rows = iter([(None, "QN-Scale1", None)] * 3 + [(None, "Other", None)])
+    with patch.object(detection_module, "_detect", wraps=detection_module._detect) as d:
+        results = detect_models_bulk(rows, cache_size=1)
+        assert next(results) == ScaleModel.ESF24
+        assert d.call_count == 1
+        assert list(results) == [ScaleModel.ESF24, ScaleModel.ESF24, None]
+    assert d.call_count == 2
+
+
+def _passes(patterns, local_name, manufacturer_data):
+    """Whether BlueZ would forward an advertisement matching any pattern."""
+    structures = [(0x01, b"\x06")]
+    if local_name:
+        structures.append((0x09, local_name.encode()))
+    for company_id, payload in (manufacturer_data or {}).items():
+        structures.append((0xFF, company_id.to_bytes(2, "little") + payload))
+    return any(
+        ad_type == t and data[start : start + len(content)] == content
+        for start, ad_type, content in patterns
+        for t, data in structures
+    )
+
+
+def test_advertisement_filter_patterns_pass_scales_only():
+    patterns = advertisement_filter_patterns()
+    for name, mfr in [
+        (None, {MFR: ESF551_PAYLOAD}),
+        (None, {MFR: FIT8S_PAYLOAD}),
+        (None, {QN: ESF24_PAYLOAD}),
+        ("QN-Scale1", None),
+        ("Etekcity Fitness Scale", None),
+    ]:
+        assert _passes(patterns, name, mfr)
+    assert not _passes(patterns, "SomeHeadphones", {0x004C: b"\x10\x05"})
@@ -0,0 +1,176 @@
+"""Unit tests for the A5 session-key stores and the cached-key fast path."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from src.etekcity_esf551_ble import EFSA591SScale
+from src.etekcity_esf551_ble.efsa591s import protocol as p
+from src.etekcity_esf551_ble.efsa591s.keystore import (
+    CachedSession,
+    FileKeyStore,
+    MemoryKeyStore,
+)
+
+from .test_efsa591s_protocol import IV, KE_RESP, KEY, MAC, MEAS
+
+SESSION = CachedSession(KEY, IV, p.DHParams(d=41983, e=31, g=16, f=9840))
+
+
+class TestStores:
+    def test_memory_store_is_keyed_by_mac_case_insensitively(self):
+        store = MemoryKeyStore()
+        store.put(MAC.lower(), SESSION)
+        assert store.get(MAC) == SESSION
+        store.discard(MAC)
+        assert store.get(MAC) is None
+
+    def test_file_store_round_trips_across_instances(self, tmp_path):
+        path = tmp_path / "sessions.json"
+        FileKeyStore(path).put(MAC, SESSION)
+        assert FileKeyStore(path).get(MAC) == SESSION
+        assert path.stat().st_mode & 0o777 == 0o600
+
+    def test_file_store_discard_persists(self, tmp_path):
+        path = tmp_path / "sessions.json"
+        FileKeyStore(path).put(MAC, SESSION)
+        FileKeyStore(path).discard(MAC)
+        assert FileKeyStore(path).get(MAC) is None
+        assert json.loads(path.read_text()) == {}
+
+    def test_unreadable_file_starts_empty(self, tmp_path):
+        path = tmp_path / "sessions.json"
+        path.write_text("not json")
+        store = FileKeyStore(path)
+        assert store.get(MAC) is None
+        store.put(MAC, SESSION)
+        assert FileKeyStore(path).get(MAC) == SESSION
+
+
+def _connected_scale(store):
+    scale = EFSA591SScale(MAC, Mock(), bleak_scanner_backend=Mock(), key_store=store)
+    scale._client = Mock(
+        services=Mock(get_characteristic=Mock(return_value="char")),
+        start_notify=AsyncMock(),
+        write_gatt_char=AsyncMock(),
+    )
+    return scale
+
+
+def _sent_opcodes(scale):
+    return [
+        p.parse_frame(c.args[1]).opcode
+        for c in scale._client.write_gatt_char.call_args_list
+    ]
+
+
+async def _start(scale):
+    device = Mock(address=MAC)
+    device.name = "Etekcity_Apex"
+    await scale._start_scale_session(device)
+    await asyncio.sleep(0)
+
+
+class TestCachedSession:
+    @pytest.mark.asyncio
+    async def test_cached_key_skips_key_exchange(self):
+        store = MemoryKeyStore()
+        store.put(MAC, SESSION)
+        scale = _connected_scale(store)
+
+        await _start(scale)
+        assert _sent_opcodes(scale) == [p.OPCODE_KEY_VERIFY]
+
+        scale._notification_handler("char", bytearray(MEAS), "Apex", MAC)
+        assert scale.session_resumed
+        assert scale.time_to_first_decrypted_frame is not None
+        assert store.get(MAC) == SESSION
+
+    @pytest.mark.asyncio
+    async def test_rejected_key_falls_back_to_key_exchange(self):
+        store = MemoryKeyStore()
+        store.put(MAC, CachedSession(bytes(16), IV))
+        scale = _connected_scale(store)
+
+        await _start(scale)
+        scale._notification_handler("char", bytearray(MEAS), "Apex", MAC)
+        await asyncio.sleep(0)
+
+        assert _sent_opcodes(scale) == [p.OPCODE_KEY_VERIFY, p.OPCODE_KEY_EXCHANGE]
+        assert store.get(MAC) is None
+        assert not scale.session_resumed
+        assert scale.time_to_first_decrypted_frame is None
+
+    @pytest.mark.asyncio
+    async def test_silent_cached_session_times_out_into_key_exchange(self):
+        store = MemoryKeyStore()
+        store.put(MAC, SESSION)
+        scale = _connected_scale(store)
+        scale.CACHED_SESSION_TIMEOUT = 0
+
+        await _start(scale)
+        await asyncio.sleep(0.01)
+
+        assert _sent_opcodes(scale) == [p.OPCODE_KEY_VERIFY, p.OPCODE_KEY_EXCHANGE]
+        assert store.get(MAC) is None
+
+    @pytest.mark.asyncio
+    async def test_key_exchange_result_is_stored_once_a_frame_decrypts(self):
+        store = MemoryKeyStore()
+        scale = _connected_scale(store)
+
+        with (
+            patch.object(p, "generate_dh", return_value=SESSION.dh),
+            patch.object(p, "random_iv", return_value=IV),
+        ):
+            await _start(scale)
+            scale._notification_handler("char", bytearray(KE_RESP), "Apex", MAC)
+        assert store.get(MAC) is None
+
+        scale._notification_handler("char", bytearray(MEAS), "Apex", MAC)
+        assert store.get(MAC) == SESSION
+        assert not scale.session_resumed
+        assert scale.time_to_first_decrypted_frame is not None
+
+    @pytest.mark.asyncio
+    async def test_rejected_key_is_not_resumed_or_stored_again(self):
+        store = MemoryKeyStore()
+        store.put(MAC, CachedSession(bytes(16), IV))
+        scale = _connected_scale(store)
+        await _start(scale)
+        scale._notification_handler("char", bytearray(MEAS), "Apex", MAC)
+        await asyncio.sleep(0)
+
+        # The next session goes straight to the key exchange...
+        scale._client.write_gatt_char.reset_mock()
+        with (
+            patch.object(p, "generate_dh", return_value=SESSION.dh),
+            patch.object(p, "random_iv", return_value=IV),
+        ):
+            await _start(scale)
+            scale._notification_handler("char", bytearray(KE_RESP), "Apex", MAC)
+        assert _sent_opcodes(scale)[0] == p.OPCODE_KEY_EXCHANGE
+        # ...and does not store its key for a resume the scale refuses.
+        scale._notification_handler("char", bytearray(MEAS), "Apex", MAC)
+        assert scale.time_to_first_decrypted_frame is not None
+        assert store.get(MAC) is None
+
+    @pytest.mark.asyncio
+    async def test_cached_key_needs_a_plausible_reading_not_just_padding(self):
+        store = MemoryKeyStore()
+        store.put(MAC, SESSION)
+        scale = _connected_scale(store)
+        await _start(scale)
+
+        # Valid padding, but a 16777 kg "weight": what a wrong key decodes to.
+        cipher = p.SessionCipher(KEY, IV)
+        garbage = cipher.encrypt(p._pkcs7_pad(b"\xff\xff\xff" + bytes(13)))
+        frame = p.build_frame(1, p.OPCODE_MEASUREMENT, garbage, p.CHANNEL_AES)
+        scale._notification_handler("char", bytearray(frame), "Apex", MAC)
+        await asyncio.sleep(0)
+
+        assert _sent_opcodes(scale) == [p.OPCODE_KEY_VERIFY, p.OPCODE_KEY_EXCHANGE]
+        assert not scale.session_resumed
+        assert store.get(MAC) is None
@@ -64,6 +64,37 @@ class TestFraming:
             frames.extend(r.feed(MEAS[i : i + 20]))
         assert frames == [MEAS]
 
+    def test_reassembler_splits_several_frames_per_chunk_and_skips_junk(self):
+        r = p.FrameReassembler()
+        stream = b"\x00\x01" + KE_RESP + MEAS + b"\x7f" + VERIFY
+        frames = list(r.feed(stream[:30]))
+        frames += r.feed(stream[30:])
+        assert frames == [KE_RESP, MEAS, VERIFY]
+
+    def test_reassembler_feed_parsed_matches_parse_frame(self):
+        r = p.FrameReassembler()
+        parsed = []
+        for i in range(0, len(KE_RESP + MEAS), 7):
+            parsed.extend(r.feed_parsed((KE_RESP + MEAS)[i : i + 7]))
+        assert parsed == [p.parse_frame(KE_RESP), p.parse_frame(MEAS)]
+
+    def test_reassembler_resyncs_past_a_corrupted_length(self):
+        corrupted = bytearray(KE_RESP)
+        corrupted[3] = 0x02  # length now claims 8 bytes, checksum no longer holds
+
+        trusting = p.FrameReassembler()
+        assert list(trusting.feed(bytes(corrupted) + MEAS)) != [MEAS]
+
+        r = p.FrameReassembler(resync=True)
+        assert list(r.feed(bytes(corrupted) + MEAS)) == [MEAS]
+
+    def test_reassembler_resync_rejects_implausible_length(self):
+        bogus = bytes([p.A5_MAGIC, 0x13, 0x01, 0xFF, 0xFF])
+        r = p.FrameReassembler(resync=True)
+        frames = list(r.feed(bogus + MEAS[:20]))
+        frames += r.feed(MEAS[20:])
+        assert frames == [MEAS]
+
 
 class TestMacAndDH:
     def test_reversed_mac(self):
@@ -86,6 +117,15 @@ class TestMacAndDH:
         assert p.DH_EXP_MIN <= dh.g <= p.DH_EXP_MAX
         assert dh.f == pow(dh.e, dh.g, dh.d)
 
+    def test_prime_tables_match_trial_division(self):
+        def is_prime(n):
+            return n > 1 and all(n % i for i in range(2, int(n**0.5) + 1))
+
+        for lo, hi in ((p.DH_MOD_MIN, p.DH_MOD_MAX), (p.DH_BASE_MIN, p.DH_BASE_MAX)):
+            assert p._primes_between(lo, hi) == tuple(
+                n for n in range(lo, hi + 1) if is_prime(n)
+            )
+
 
 class TestKeyExchange:
     def test_parse_ke_response(self):
@@ -269,6 +309,43 @@ class TestPlaintextOpcodes:
         assert pt[1:3] == bytes.fromhex("1502")
 
 
+class TestSessionCipher:
+    def test_decrypts_measurement_like_one_off_helper(self):
+        cipher = p.SessionCipher(KEY, IV)
+        parsed = p.parse_frame(MEAS)
+        assert cipher.decrypt_payload(parsed) == p.decrypt_frame_payload(
+            KEY, IV, parsed
+        )
+        # the contexts are reused, so a second frame must decrypt identically
+        assert cipher.decrypt_payload(parsed) == p.decrypt_frame_payload(
+            KEY, IV, parsed
+        )
+
+    def test_matches_cbc_reference(self):
+        from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
+        cipher = p.SessionCipher(KEY, IV)
+        plaintext = bytes(range(64))
+        enc = Cipher(algorithms.AES(KEY), modes.CBC(IV)).encryptor()
+        expected = enc.update(plaintext) + enc.finalize()
+        assert cipher.encrypt(plaintext) == expected
+        assert cipher.decrypt(expected) == plaintext
+        zero_iv = bytes(16)
+        assert cipher.decrypt(cipher.encrypt(plaintext, zero_iv), zero_iv) == plaintext
+
+    def test_verify_with_session_cipher_matches_bytes_key(self):
+        cipher = p.SessionCipher(KEY, IV)
+        assert p.build_key_verify(0x15, MAC, IV, cipher) == p.build_key_verify(
+            0x15, MAC, IV, KEY
+        )
+
+    def test_rejects_unaligned_input(self):
+        import pytest
+
+        with pytest.raises(ValueError):
+            p.SessionCipher(KEY, IV).decrypt(b"\x00" * 15)
+
+
 class TestSetUnit:
     # Ground truth captured from the app (Frida): channel-1 session key/iv and the
     # exact ciphertext the app's AES doFinal produced for each unit's 0xa163 write.
@@ -293,6 +370,13 @@ class TestSetUnit:
     def test_build_set_unit_full_frame_matches_capture(self):
         assert p.build_set_unit(0x03, 1, self.KEY, self.IV).hex() == self.LB_FRAME
 
+    def test_build_set_unit_with_session_cipher(self):
+        cipher = p.SessionCipher(self.KEY, self.IV)
+        for unit in self.CIPHERTEXT:
+            assert p.build_set_unit(0x03, unit, cipher) == p.build_set_unit(
+                0x03, unit, self.KEY, self.IV
+            )
+
     def test_build_set_unit_rejects_invalid_unit(self):
         import pytest
 
@@ -0,0 +1,109 @@
+"""Unit tests for the shared-scanner ScaleHub."""
+
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from bleak.backends.device import BLEDevice
+
+from src.etekcity_esf551_ble import ESF551Scale, FIT8SScale, ScaleHub
+
+_FIT8S_ADDRESS = "A9:89:5D:ED:A0:63"
+_FIT8S_STABLE_LB = bytes(
+    b"\x01\x63\xa0\xed\x5d\x89\xa9\x00\x00\x00\x64\x13\x01\xf4\x01\x01\x01\x00\x00\x00"
+)
+
+
+def _advertisement(address: str, payload: bytes = _FIT8S_STABLE_LB):
+    ble_device = Mock(spec=BLEDevice)
+    ble_device.address = address
+    ble_device.name = "Fit 8S"
+    advertisement_data = Mock()
+    advertisement_data.manufacturer_data = {0x1234: payload}
+    return ble_device, advertisement_data
+
+
+def test_hub_scales_build_no_scanner_of_their_own():
+    hub = ScaleHub(bleak_scanner_backend=Mock())
+    with patch(
+        "src.etekcity_esf551_ble.scale.get_platform_scanner_backend_type"
+    ) as mock_get_scanner:
+        scale = ESF551Scale("00:11:22:33:44:55", Mock(), hub=hub)
+
+    mock_get_scanner.assert_not_called()
+    assert scale._scanner is None
+
+
+def test_hub_registers_its_callback_on_a_custom_backend():
+    backend = Mock()
+    hub = ScaleHub(bleak_scanner_backend=backend)
+    backend.register_detection_callback.assert_called_once_with(
+        hub._advertisement_callback
+    )
+
+
+@pytest.mark.asyncio
+async def test_hub_dispatches_only_to_the_registered_address():
+    hub = ScaleHub(bleak_scanner_backend=Mock())
+    callback = Mock()
+    scale = FIT8SScale(_FIT8S_ADDRESS, callback, hub=hub)
+    await scale.async_start()
+
+    await hub._advertisement_callback(*_advertisement("00:11:22:33:44:55"))
+    callback.assert_not_called()
+
+    await hub._advertisement_callback(*_advertisement(_FIT8S_ADDRESS))
+    callback.assert_called_once()
+    assert callback.call_args.args[0].measurements["weight"] == 70.5
+
+
+@pytest.mark.asyncio
+async def test_scale_start_stop_register_without_touching_the_scanner():
+    scanner = Mock(start=AsyncMock(), stop=AsyncMock())
+    hub = ScaleHub(bleak_scanner_backend=scanner)
+    scale = FIT8SScale(_FIT8S_ADDRESS, Mock(), hub=hub)
+
+    await scale.async_start()
+    assert hub.scales[_FIT8S_ADDRESS] is scale
+    await scale.async_stop()
+    assert _FIT8S_ADDRESS not in hub.scales
+
+    scanner.start.assert_not_called()
+    scanner.stop.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_hub_start_stop_drive_the_shared_scanner():
+    scanner = Mock(start=AsyncMock(), stop=AsyncMock())
+    hub = ScaleHub(bleak_scanner_backend=scanner)
+
+    await hub.async_start()
+    await hub.async_stop()
+
+    scanner.start.assert_awaited_once()
+    scanner.stop.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_removed_scale_no_longer_receives_advertisements():
+    hub = ScaleHub(bleak_scanner_backend=Mock())
+    callback = Mock()
+    scale = FIT8SScale(_FIT8S_ADDRESS, callback, hub=hub, cooldown_seconds=0)
+    hub.add(scale)
+    hub.remove(scale)
+
+    await hub._advertisement_callback(*_advertisement(_FIT8S_ADDRESS))
+    callback.assert_not_called()
+
+
+def test_hub_rejects_a_second_client_for_the_same_address():
+    hub = ScaleHub(bleak_scanner_backend=Mock())
+    first = FIT8SScale(_FIT8S_ADDRESS, Mock(), hub=hub)
+    second = FIT8SScale(_FIT8S_ADDRESS, Mock(), hub=hub)
+    hub.add(first)
+    hub.add(first)  # idempotent
+
+    with pytest.raises(ValueError):
+        hub.add(second)
+    # Removing a client that isn't the registered one leaves the entry alone.
+    hub.remove(second)
+    assert hub.scales[_FIT8S_ADDRESS] is first
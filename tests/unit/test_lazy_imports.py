@@ -0,0 +1,72 @@
+"""Import-time checks: the package must import without its BLE stack."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+HEAVY = ("bleak", "bleak_retry_connector", "cryptography")
+
+
+def _run(code: str) -> str:
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.strip()
+
+
+def _loaded_after(statement: str) -> set[str]:
+    out = _run(
+        f"import sys\n{statement}\n"
+        f"print(','.join(m for m in {HEAVY!r} if m in sys.modules))"
+    )
+    return set(filter(None, out.split(",")))
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "import src.etekcity_esf551_ble",
+        "from src.etekcity_esf551_ble import BodyMetrics, detect_model, ScaleModel",
+        "import src.etekcity_esf551_ble.detection",
+        "import src.etekcity_esf551_ble.body_metrics",
+    ],
+)
+def test_light_imports_skip_ble_stack(statement):
+    assert _loaded_after(statement) == set()
+
+
+def test_clients_load_on_first_access():
+    assert _loaded_after(
+        "import src.etekcity_esf551_ble as lib\nlib.SCALE_CLASSES"
+    ) == set(HEAVY)
+    assert _loaded_after("from src.etekcity_esf551_ble import ESF551Scale") >= {"bleak"}
+
+
+def test_unknown_attribute():
+    import src.etekcity_esf551_ble as lib
+
+    with pytest.raises(AttributeError):
+        lib.NoSuchScale  # noqa: B018
+    assert "ESF551Scale" in dir(lib)
+
+
+def _import_seconds(statement: str, runs: int = 3) -> float:
+    """Best-of-``runs`` wall time of ``statement`` in a fresh interpreter."""
+    code = (
+        "import time\nt = time.perf_counter()\n"
+        f"{statement}\nprint(time.perf_counter() - t)"
+    )
+    return min(float(_run(code)) for _ in range(runs))
+
+
+def test_import_time_benchmark():
+    light = _import_seconds("import src.etekcity_esf551_ble")
+    full = _import_seconds("import src.etekcity_esf551_ble as lib\nlib.SCALE_CLASSES")
+    print(f"\nimport: {light * 1e3:.1f} ms; with clients: {full * 1e3:.1f} ms")
+    assert light < full
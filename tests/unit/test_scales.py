@@ -16,6 +16,7 @@ from src.etekcity_esf551_ble import (
     WeightUnit,
 )
 from src.etekcity_esf551_ble.efsa591s import protocol as a5
+from src.etekcity_esf551_ble.esf24.protocol import parse_stored_measurement
 
 # weight 70.5 kg + impedance 500 ohms, MAC "A9:89:5D:ED:A0:63" (LE), stable, unit=LB.
 _FIT8S_ADDRESS = "A9:89:5D:ED:A0:63"
@@ -269,6 +270,55 @@ async def test_esf24_malformed_stored_frame_warns_rather_than_going_unrecognized
     assert not any("unrecognized" in m for m in messages)
 
 
+def test_esf24_stored_measurements_callback_receives_records_once():
+    """With a stored-measurements callback the drain is enabled and each
+    record is delivered once, with the time it was taken."""
+    callback, stored = Mock(), Mock()
+    scale = ESF24Scale(
+        "00:11:22:33:44:55",
+        callback,
+        bleak_scanner_backend=Mock(),
+        stored_measurements_callback=stored,
+    )
+    assert scale._clear_stored_measurements
+
+    for _ in range(2):  # the second drain repeats an already delivered record
+        scale._notification_handler(
+            "char",
+            bytearray.fromhex(_ESF24_STORED_SINGLE),
+            "QN-Scale1",
+            "test_address",
+        )
+    callback.assert_not_called()
+    stored.assert_called_once()
+    [data] = stored.call_args.args[0]
+    assert data.address == "test_address"
+    assert data.measurements == {
+        "weight": 110.8,
+        "impedance": 363,
+        "impedance_500khz": 308,
+    }
+    frame = parse_stored_measurement(bytearray.fromhex(_ESF24_STORED_SINGLE))
+    assert data.received_at == frame.timestamp
+
+
+def test_esf24_interrupted_drain_is_delivered_on_disconnect():
+    stored = Mock()
+    scale = ESF24Scale(
+        "00:11:22:33:44:55",
+        Mock(),
+        bleak_scanner_backend=Mock(),
+        stored_measurements_callback=stored,
+    )
+    # Record 1 of 6, then the connection drops
+    scale._notification_handler(
+        "char", bytearray.fromhex(_ESF24_STORED_BATCH_1), "QN-Scale1", "test_address"
+    )
+    stored.assert_not_called()
+    scale._unavailable_callback(Mock())
+    assert [d.weight for d in stored.call_args.args[0]] == [111.9]
+
+
 @pytest.mark.asyncio
 async def test_esf24_empty_store_frame_is_not_unrecognized():
     logger = Mock()
@@ -357,8 +407,7 @@ def test_default_logger_keeps_each_models_own_module_name():
 def test_efsc651_emits_captured_weight_and_impedance():
     callback = Mock()
     scale = EFSC651Scale("CF:E9:06:17:9A:46", callback, bleak_scanner_backend=Mock())
-    scale._key = b"\x01" * 16
-    scale._iv = b"\x02" * 16
+    scale._cipher = a5.SessionCipher(b"\x01" * 16, b"\x02" * 16)
     plaintext = bytes.fromhex(
         "32323635303933365f5f5f5f5f5f5f5f5f5f5f5f0000"
         "6e2201ad3687002ed8726a0102000002"
@@ -366,7 +415,7 @@ def test_efsc651_emits_captured_weight_and_impedance():
     frame = a5.build_frame(1, 0x4422, b"\x00" * 16, a5.CHANNEL_AES)
 
     with patch(
-        "src.etekcity_esf551_ble.efsc651.scale.a5.decrypt_frame_payload",
+        "src.etekcity_esf551_ble.efsc651.scale.a5.SessionCipher.decrypt_payload",
         return_value=plaintext,
     ):
         scale._handle_frame(frame, "Etekcity Smart Fitness Scale", scale.address)
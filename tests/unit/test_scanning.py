@@ -0,0 +1,119 @@
+"""Tests for passive-first hybrid scanning."""
+
+import asyncio
+
+import pytest
+
+from src.etekcity_esf551_ble import (
+    BluetoothScanningMode,
+    ESF551Scale,
+    HybridScanner,
+    ScaleHub,
+)
+from src.etekcity_esf551_ble.scale import create_platform_scanner
+from src.etekcity_esf551_ble.simulator import ScaleSimulator, SimulatedESF551
+
+ADDRESS = "D0:4D:00:11:22:33"
+OTHER = "D0:4D:00:11:22:44"
+
+
+def _simulated(active_seconds=0.05):
+    sim = ScaleSimulator()
+    sim.add(SimulatedESF551(ADDRESS, weight_kg=70.0))
+    sim.add(SimulatedESF551(OTHER, weight_kg=80.0))
+    passive, active = sim.scanner(), sim.scanner()
+    scanner = HybridScanner(
+        passive,
+        active,
+        lambda device, _: device.address == ADDRESS,
+        active_seconds=active_seconds,
+    )
+    return sim, scanner, passive, active
+
+
+@pytest.mark.asyncio
+async def test_escalates_on_watched_advertisement_and_drops_back():
+    sim, scanner, passive, active = _simulated()
+    seen = []
+    scanner.register_detection_callback(lambda device, _: seen.append(device.address))
+    await scanner.start()
+    assert (passive.running, active.running) == (True, False)
+
+    await sim.advertise(OTHER)
+    await asyncio.sleep(0)
+    assert scanner.mode is BluetoothScanningMode.PASSIVE
+
+    await sim.advertise(ADDRESS)
+    await asyncio.sleep(0)
+    assert scanner.mode is BluetoothScanningMode.ACTIVE
+    assert (passive.running, active.running) == (False, True)
+    await sim.advertise(ADDRESS)  # delivered by the active scanner
+
+    await asyncio.sleep(0.1)
+    assert scanner.mode is BluetoothScanningMode.PASSIVE
+    assert (passive.running, active.running) == (True, False)
+    assert seen == [OTHER, ADDRESS, ADDRESS]
+    assert scanner.escalations == 1
+    await scanner.stop()
+    assert not passive.running
+    seconds = scanner.mode_seconds()
+    assert seconds[BluetoothScanningMode.ACTIVE] >= 0.05
+    assert seconds[BluetoothScanningMode.PASSIVE] > 0
+
+
+@pytest.mark.asyncio
+async def test_failed_escalation_resumes_passive_scanning(monkeypatch):
+    sim, scanner, passive, active = _simulated()
+
+    async def broken_start():
+        raise RuntimeError("adapter busy")
+
+    monkeypatch.setattr(active, "start", broken_start)
+    await scanner.start()
+    await sim.advertise(ADDRESS)
+    await asyncio.sleep(0.01)
+    assert scanner.mode is BluetoothScanningMode.PASSIVE
+    assert (passive.running, active.running) == (True, False)
+    assert scanner.escalations == 0
+    seen = []
+    scanner.register_detection_callback(lambda device, _: seen.append(device.address))
+    await sim.advertise(OTHER)
+    assert seen == [OTHER]  # still scanning
+    await scanner.stop()
+    assert scanner.mode_seconds()[BluetoothScanningMode.ACTIVE] == 0
+
+
+@pytest.mark.asyncio
+async def test_scale_measures_through_hybrid_scanner():
+    sim, scanner, _, active = _simulated(active_seconds=5.0)
+    readings = []
+    scale = ESF551Scale(
+        ADDRESS,
+        readings.append,
+        bleak_scanner_backend=scanner,
+        client_factory=sim.connect,
+    )
+    assert scale.scanner is scanner
+    await scale.async_start()
+
+    await sim.advertise(ADDRESS)
+    for _ in range(200):
+        if readings:
+            break
+        await asyncio.sleep(0.01)
+
+    assert readings[0].address == ADDRESS
+    assert active.running
+    await scale.async_stop()
+    assert not active.running
+
+
+def test_hybrid_mode_builds_hybrid_scanner():
+    scanner = create_platform_scanner(
+        lambda device, data: None,
+        BluetoothScanningMode.HYBRID,
+        escalate_for=lambda device, data: True,
+    )
+    assert isinstance(scanner, HybridScanner)
+    hub = ScaleHub(scanning_mode=BluetoothScanningMode.HYBRID)
+    assert isinstance(hub.scanner, HybridScanner)
@@ -0,0 +1,162 @@
+"""Tests for the multi-adapter connection scheduler."""
+
+import asyncio
+import time
+from unittest.mock import Mock
+
+import pytest
+from bleak.backends.device import BLEDevice
+
+from src.etekcity_esf551_ble import (
+    ConnectionPriority,
+    ConnectionScheduler,
+    ESF551Scale,
+)
+from src.etekcity_esf551_ble.simulator import ScaleSimulator, SimulatedESF551
+
+
+class _FakeConnector:
+    """Connector whose clients stay connected until ``drop`` is called."""
+
+    def __init__(self, fail=False):
+        self.calls = []
+        self.fail = fail
+
+    async def __call__(self, ble_device, name, disconnected_callback, adapter):
+        await asyncio.sleep(0)
+        self.calls.append((name, adapter, ble_device))
+        if self.fail:
+            raise TimeoutError("no answer")
+        client = Mock(is_connected=True)
+        client.drop = lambda: disconnected_callback(client)
+        return client
+
+
+def _device(address, adapter=None):
+    details = {"path": f"/org/bluez/{adapter}/dev_x"} if adapter else None
+    return BLEDevice(address, "scale", details)
+
+
+@pytest.mark.asyncio
+async def test_assigns_least_loaded_adapter_and_releases_on_disconnect():
+    connector = _FakeConnector()
+    scheduler = ConnectionScheduler(["hci0", "hci1"], 2, connector=connector)
+
+    clients = [
+        await scheduler.connect(_device(f"AA:{i}"), f"AA:{i}", Mock()) for i in range(3)
+    ]
+
+    assert [adapter for _, adapter, _ in connector.calls] == ["hci0", "hci1", "hci0"]
+    assert scheduler.stats["hci0"].active == 2
+    clients[0].drop()
+    clients[0].drop()  # released once
+    assert scheduler.stats["hci0"].active == 1
+    assert scheduler.stats["hci0"].success_rate == 1.0
+
+
+@pytest.mark.asyncio
+async def test_queues_at_cap_and_serves_weigh_in_first():
+    connector = _FakeConnector()
+    scheduler = ConnectionScheduler(["hci0"], 1, connector=connector)
+    first = await scheduler.connect(_device("AA:00"), "first", Mock())
+
+    normal = asyncio.create_task(scheduler.connect(_device("AA:01"), "normal", Mock()))
+    weigh_in = asyncio.create_task(
+        scheduler.connect(
+            _device("AA:02"), "weigh_in", Mock(), ConnectionPriority.WEIGH_IN
+        )
+    )
+    await asyncio.sleep(0.01)
+    assert scheduler.waiting == 2
+    assert scheduler.stats["hci0"].queued == 2
+
+    first.drop()
+    (await weigh_in).drop()
+    await normal
+    assert [name for name, _, _ in connector.calls] == ["first", "weigh_in", "normal"]
+    assert scheduler.stats["hci0"].queued == 0
+
+
+@pytest.mark.asyncio
+async def test_failure_releases_slot_and_counts():
+    scheduler = ConnectionScheduler(["hci0"], 1, connector=_FakeConnector(fail=True))
+
+    for _ in range(2):
+        with pytest.raises(TimeoutError):
+            await scheduler.connect(_device("AA:00"), "a", Mock())
+
+    stats = scheduler.stats["hci0"]
+    assert (stats.active, stats.attempts, stats.failures) == (0, 2, 2)
+    assert stats.success_rate == 0.0
+
+
+@pytest.mark.asyncio
+async def test_only_adapters_that_see_the_scale_are_used():
+    connector = _FakeConnector()
+    scheduler = ConnectionScheduler(["hci0", "hci1"], 1, connector=connector)
+    scheduler.watch("AA:00")
+    seen_on_hci1 = _device("AA:00", "hci1")
+    scheduler.observe(seen_on_hci1)
+
+    await scheduler.connect(_device("AA:00"), "a", Mock())
+    blocked = asyncio.create_task(scheduler.connect(_device("AA:00"), "b", Mock()))
+    await asyncio.sleep(0.01)
+
+    assert connector.calls == [("a", "hci1", seen_on_hci1)]
+    assert scheduler.stats["hci0"].queued == 0
+    assert scheduler.stats["hci1"].queued == 1
+    blocked.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await blocked
+    assert scheduler.waiting == 0
+    assert scheduler.stats["hci1"].queued == 0
+
+
+@pytest.mark.asyncio
+async def test_scales_connect_through_scheduler():
+    sim = ScaleSimulator()
+    addresses = ["D0:4D:00:11:22:33", "D0:4D:00:11:22:34"]
+    for address in addresses:
+        sim.add(SimulatedESF551(address, weight_kg=70.0))
+    scheduler = ConnectionScheduler(
+        ["hci0", "hci1"],
+        connector=lambda device, name, callback, adapter: sim.connect(
+            device, name, callback
+        ),
+    )
+    readings = []
+    scales = [
+        ESF551Scale(
+            address,
+            readings.append,
+            bleak_scanner_backend=sim.scanner(),
+            scheduler=scheduler,
+        )
+        for address in addresses
+    ]
+    for scale in scales:
+        await scale.async_start()
+
+    await sim.advertise()
+    for _ in range(200):
+        if len(readings) == 2 and all(s._client is None for s in scales):
+            break
+        await asyncio.sleep(0.01)
+
+    assert sorted(r.address for r in readings) == addresses
+    assert {a: s.successes for a, s in scheduler.stats.items()} == {
+        "hci0": 1,
+        "hci1": 1,
+    }
+    assert all(s.active == 0 for s in scheduler.stats.values())
+    for scale in scales:
+        await scale.async_stop()
+
+
+def test_interrupted_weigh_in_gets_priority():
+    scale = ESF551Scale("D0:4D:00:11:22:33", None, bleak_scanner_backend=Mock())
+    assert scale._connection_priority() is ConnectionPriority.NORMAL
+    scale._weigh_in_started = time.monotonic()
+    assert scale._connection_priority() is ConnectionPriority.WEIGH_IN
+    scale._weigh_in_started -= scale._WEIGH_IN_WINDOW
+    assert scale._connection_priority() is ConnectionPriority.NORMAL
@@ -0,0 +1,80 @@
+"""Tests for GATT service-cache reuse."""
+
+import asyncio
+
+import pytest
+
+from src.etekcity_esf551_ble import ESF551Scale, LatencyMonitor, ServiceCache
+from src.etekcity_esf551_ble.simulator import (
+    LinkConditions,
+    ScaleSimulator,
+    SimulatedESF551,
+    SimulatedServices,
+)
+
+ADDRESS = "D0:4D:00:11:22:33"
+
+
+def _setup(discovery_time=0.0):
+    sim = ScaleSimulator(LinkConditions(discovery_time=discovery_time))
+    sim.add(SimulatedESF551(ADDRESS, weight_kg=70.0))
+    cache = ServiceCache(connector=sim.connect)
+    readings = []
+    scale = ESF551Scale(
+        ADDRESS,
+        readings.append,
+        bleak_scanner_backend=sim.scanner(),
+        service_cache=cache,
+        cooldown_seconds=0,
+    )
+    return sim, cache, scale, readings
+
+
+async def _weigh_in(sim, scale, readings):
+    count = len(readings)
+    await sim.advertise()
+    for _ in range(300):
+        if len(readings) > count and scale._client is None:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("no reading")
+
+
+@pytest.mark.asyncio
+async def test_reconnect_skips_discovery():
+    sim, cache, scale, readings = _setup(discovery_time=0.05)
+    monitor = LatencyMonitor()
+    monitor.attach(scale)
+    await scale.async_start()
+    await _weigh_in(sim, scale, readings)
+    await _weigh_in(sim, scale, readings)
+    await scale.async_stop()
+
+    stats = cache.stats[ADDRESS]
+    assert (stats.sessions, stats.invalidations) == (2, 0)
+    # Only the first connection discovered.
+    assert stats.connect_to_notify.max - stats.connect_to_notify.min > 0.04
+    assert monitor.histograms[LatencyMonitor.CONNECT_TO_NOTIFY].count == 2
+
+
+@pytest.mark.asyncio
+async def test_stale_services_are_cleared_and_rediscovered():
+    sim, cache, scale, readings = _setup()
+    # A cached database without the scale's characteristics.
+    sim.services_cache[ADDRESS] = SimulatedServices({})
+    await scale.async_start()
+    await sim.advertise()
+    for _ in range(100):
+        if scale._client is None and not scale._initializing:
+            break
+        await asyncio.sleep(0.01)
+
+    stats = cache.stats[ADDRESS]
+    assert (stats.sessions, stats.invalidations) == (0, 1)
+    assert ADDRESS not in sim.services_cache
+    assert not readings
+
+    await _weigh_in(sim, scale, readings)
+    await scale.async_stop()
+    assert stats.sessions == 1
+    assert list(sim.services_cache[ADDRESS])  # rediscovered in full
@@ -0,0 +1,384 @@
+"""End-to-end tests of the scale clients against the simulated backend."""
+
+import asyncio
+import time
+from unittest.mock import Mock
+
+import pytest
+from bleak.exc import BleakError
+
+from src.etekcity_esf551_ble import (
+    EFSA591SScale,
+    EFSC651Scale,
+    ESF24Scale,
+    ESF551Scale,
+    LatencyMonitor,
+    MeasurementStore,
+    MemoryKeyStore,
+    ScaleHub,
+    SessionPhase,
+    WeightUnit,
+)
+from src.etekcity_esf551_ble.const import ALIRO_CHARACTERISTIC_UUID
+from src.etekcity_esf551_ble.detection import ScaleModel, detect_model
+from src.etekcity_esf551_ble.simulator import (
+    LinkConditions,
+    ScaleSimulator,
+    SimulatedEFSA591S,
+    SimulatedClient,
+    SimulatedEFSC651,
+    SimulatedESF24,
+    SimulatedESF551,
+)
+
+ESF551_ADDRESS = "D0:4D:00:11:22:33"
+ESF24_ADDRESS = "ED:67:39:11:22:33"
+A591S_ADDRESS = "CF:EA:01:28:86:45"
+C651_ADDRESS = "CF:E9:06:28:86:45"
+
+
+async def _weigh(sim, scale_cls, address, timeout=2.0, **kwargs):
+    """Start a client on the simulator, advertise once, return its readings."""
+    readings = []
+    done = asyncio.Event()
+
+    def callback(data):
+        readings.append(data)
+        done.set()
+
+    store = kwargs.pop("store", None)
+    scale = scale_cls(
+        address,
+        callback,
+        bleak_scanner_backend=sim.scanner(),
+        client_factory=sim.connect,
+        **kwargs,
+    )
+    if store is not None:
+        store.attach(scale)
+    await scale.async_start()
+    await sim.advertise(address)
+    await asyncio.wait_for(done.wait(), timeout)
+    return scale, readings
+
+
+async def _until_disconnected(scale, timeout=2.0):
+    async def wait():
+        while scale._client is not None:
+            await asyncio.sleep(0.005)
+
+    await asyncio.wait_for(wait(), timeout)
+
+
+@pytest.mark.parametrize(
+    ("sim_cls", "address", "model"),
+    [
+        (SimulatedESF551, ESF551_ADDRESS, ScaleModel.ESF551),
+        (SimulatedESF24, ESF24_ADDRESS, ScaleModel.ESF24),
+        (SimulatedEFSA591S, A591S_ADDRESS, ScaleModel.EFSA591S),
+        (SimulatedEFSC651, C651_ADDRESS, ScaleModel.EFSC651),
+    ],
+)
+def test_advertisements_are_detected(sim_cls, address, model):
+    device, ad = sim_cls(address).advertisement()
+    assert device.address == address
+    assert detect_model(ad.local_name, ad.manufacturer_data, address) == model
+
+
+@pytest.mark.asyncio
+async def test_esf551_session():
+    sim = ScaleSimulator()
+    virtual = sim.add(SimulatedESF551(ESF551_ADDRESS, weight_kg=68.2, impedance=511))
+    scale, readings = await _weigh(
+        sim, ESF551Scale, ESF551_ADDRESS, display_unit=WeightUnit.LB
+    )
+    await _until_disconnected(scale)
+    assert len(readings) == 1
+    assert readings[0].measurements["weight"] == 68.2
+    assert readings[0].measurements["impedance"] == 511
+    assert readings[0].hw_version == "1.0"
+    assert readings[0].weight == 68.2
+    assert readings[0].received_at is not None
+    assert virtual.display_unit == WeightUnit.LB
+    assert virtual.sessions == 1
+
+
+@pytest.mark.asyncio
+async def test_esf24_session_drains_stored_measurements():
+    sim = ScaleSimulator()
+    stored_at = int(time.time()) - 3600
+    virtual = sim.add(
+        SimulatedESF24(
+            ESF24_ADDRESS, weight_kg=80.15, stored=[(stored_at, 79.9, 500, 470)]
+        )
+    )
+    scale, readings = await _weigh(
+        sim, ESF24Scale, ESF24_ADDRESS, clear_stored_measurements=True
+    )
+    await _until_disconnected(scale)
+    assert readings[0].measurements == {
+        "weight": 80.15,
+        "impedance": 520,
+        "impedance_500khz": 480,
+    }
+    assert virtual.stored == []
+    opcodes = [data[0] for _, data in virtual.writes]
+    assert opcodes == [0x13, 0x20, 0x22, 0x1F]
+
+
+@pytest.mark.asyncio
+async def test_esf24_commands_keep_order_over_jittery_link(monkeypatch):
+    sim = ScaleSimulator(LinkConditions(latency=0.005, jitter=0.01), seed=3)
+    virtual = sim.add(SimulatedESF24(ESF24_ADDRESS, stored=[(946700000, 80, 0, 0)]))
+    responses = []
+    write = SimulatedClient.write_gatt_char
+
+    async def spy(self, char, data, response=None):
+        responses.append((data[0], response))
+        await write(self, char, data, response)
+
+    monkeypatch.setattr(SimulatedClient, "write_gatt_char", spy)
+    scale, _ = await _weigh(
+        sim, ESF24Scale, ESF24_ADDRESS, clear_stored_measurements=True
+    )
+    await _until_disconnected(scale)
+    assert [data[0] for _, data in virtual.writes] == [0x13, 0x20, 0x22, 0x1F]
+    # Answered commands skip the write response; end-measurement keeps it.
+    assert responses == [(0x13, False), (0x20, False), (0x22, False), (0x1F, True)]
+    stats = scale.command_stats
+    assert set(stats) == {"unit_update", "set_time", "stored_query", "end_measurement"}
+    for command in stats.values():
+        assert (command.sent, command.failed) == (1, 0)
+        assert command.queued.count == command.round_trip.count == 1
+        assert command.round_trip.min >= 0.01  # at least the two-way latency
+
+
+@pytest.mark.asyncio
+async def test_write_without_explicit_response_follows_characteristic(monkeypatch):
+    sim = ScaleSimulator()
+    virtual = sim.add(SimulatedESF551(ESF551_ADDRESS))
+    round_trips = []
+    round_trip = SimulatedClient._round_trip
+
+    async def spy(self):
+        round_trips.append(True)
+        await round_trip(self)
+
+    monkeypatch.setattr(SimulatedClient, "_round_trip", spy)
+    client = await sim.connect(virtual.advertisement()[0], "scale")
+    # Like bleak, response=None means a response when "write" is offered.
+    await client.write_gatt_char(ALIRO_CHARACTERISTIC_UUID, b"\x00")
+    assert len(round_trips) == 1
+    client.services.get_characteristic(ALIRO_CHARACTERISTIC_UUID).properties = [
+        "write-without-response"
+    ]
+    await client.write_gatt_char(ALIRO_CHARACTERISTIC_UUID, b"\x00")
+    assert len(round_trips) == 1
+    await client.disconnect()
+
+
+async def _esf24_time_to_final_frame(fast_start, **kwargs):
+    sim = ScaleSimulator(LinkConditions(latency=0.01))
+    virtual = sim.add(SimulatedESF24(ESF24_ADDRESS, **kwargs))
+    timings = []
+    monitor = LatencyMonitor(listener=timings.append)
+    scale = ESF24Scale(
+        ESF24_ADDRESS,
+        Mock(),
+        bleak_scanner_backend=sim.scanner(),
+        client_factory=sim.connect,
+        fast_start=fast_start,
+    )
+    scale._FAST_START_TIMEOUT = 0.1
+    monitor.attach(scale)
+    await scale.async_start()
+    await sim.advertise()
+    await asyncio.sleep(0.05)
+    await _until_disconnected(scale)
+    [timing] = timings
+    assert timing.completed
+    elapsed = timing.between(SessionPhase.CONNECTING, SessionPhase.FINAL_FRAME)
+    return scale, virtual, elapsed
+
+
+@pytest.mark.asyncio
+async def test_esf24_fast_start_skips_the_prompt_round_trips():
+    _, _, prompted = await _esf24_time_to_final_frame(fast_start=False)
+    scale, virtual, fast = await _esf24_time_to_final_frame(fast_start=True)
+    # The prompts still arrive; neither command is sent twice.
+    assert [data[0] for _, data in virtual.writes] == [0x13, 0x20, 0x1F]
+    assert scale.fast_start_fallbacks == 0
+    assert fast < prompted
+
+
+@pytest.mark.asyncio
+async def test_esf24_fast_start_falls_back_when_the_scale_drops_commands():
+    # Prompts slower than the link: the early commands arrive first.
+    scale, virtual, _ = await _esf24_time_to_final_frame(
+        fast_start=True, early_commands=False, frame_interval=0.05
+    )
+    assert [data[0] for _, data in virtual.writes] == [0x13, 0x20, 0x13, 0x20, 0x1F]
+    assert scale.fast_start_fallbacks == 1
+    # One miss can be a crossed prompt: the next session still fast-starts.
+    assert not scale._fast_start_rejected
+
+
+def test_esf24_fast_start_stops_after_consecutive_misses():
+    scale = ESF24Scale(
+        ESF24_ADDRESS, Mock(), bleak_scanner_backend=Mock(), fast_start=True
+    )
+    for _ in range(scale._MAX_FAST_START_MISSES - 1):
+        scale._fast_start_fallback()
+    scale._fast_start_timer = Mock()
+    scale._fast_start_confirmed()  # an acknowledged session resets the count
+    for _ in range(scale._MAX_FAST_START_MISSES - 1):
+        scale._fast_start_fallback()
+    assert not scale._fast_start_rejected
+    scale._fast_start_fallback()
+    assert scale._fast_start_rejected
+    assert scale.fast_start_fallbacks == 2 * scale._MAX_FAST_START_MISSES - 1
+
+
+@pytest.mark.asyncio
+async def test_esf24_failed_fast_start_write_hands_over_to_the_prompts(monkeypatch):
+    write = SimulatedClient.write_gatt_char
+    failed = []
+
+    async def flaky(self, char, data, response=None):
+        if not failed:
+            failed.append(data[0])
+            raise BleakError("write failed")
+        await write(self, char, data, response)
+
+    safe_write = ESF24Scale._safe_write
+    armed_after_failure = []
+
+    async def spy(self, data, response=True):
+        if not (sent := await safe_write(self, data, response)):
+            armed_after_failure.append(self._fast_start_timer is not None)
+        return sent
+
+    monkeypatch.setattr(SimulatedClient, "write_gatt_char", flaky)
+    monkeypatch.setattr(ESF24Scale, "_safe_write", spy)
+    scale, virtual, _ = await _esf24_time_to_final_frame(fast_start=True)
+    assert failed == [0x13]
+    assert armed_after_failure == [False]
+    # The unit prompt was answered after all; the failure was not a miss.
+    assert 0x13 in [data[0] for _, data in virtual.writes]
+    assert scale.fast_start_fallbacks == 0
+
+
+@pytest.mark.asyncio
+async def test_esf24_stored_measurements_are_ingested_in_one_batch():
+    sim = ScaleSimulator()
+    now = int(time.time())
+    records = [(now - 7200, 80.4, 510, 470), (now - 3600, 80.1, 0, 0)]
+    virtual = sim.add(SimulatedESF24(ESF24_ADDRESS, stored=list(records)))
+    batches = []
+    store = MeasurementStore()
+    scale, readings = await _weigh(
+        sim,
+        ESF24Scale,
+        ESF24_ADDRESS,
+        stored_measurements_callback=batches.append,
+        store=store,
+    )
+    await _until_disconnected(scale)
+    assert virtual.stored == []
+    [batch] = batches
+    assert [(d.received_at, d.weight) for d in batch] == [
+        (now - 7200, 80.4),
+        (now - 3600, 80.1),
+    ]
+    assert batch[1].impedance is None
+    assert len(readings) == 1
+    # Stored readings land in the history at the time they were taken
+    assert list(store.query().weight) == [80.4, 80.1, readings[0].weight]
+
+
+@pytest.mark.asyncio
+async def test_efsa591s_handshake_over_fragmented_link():
+    sim = ScaleSimulator(LinkConditions(latency=0.002, fragment_size=20), seed=1)
+    virtual = sim.add(SimulatedEFSA591S(A591S_ADDRESS, weight_kg=81.3, impedance=498))
+    scale, readings = await _weigh(
+        sim, EFSA591SScale, A591S_ADDRESS, display_unit=WeightUnit.ST
+    )
+    await _until_disconnected(scale)
+    assert readings[0].measurements["weight"] == 81.3
+    assert readings[0].measurements["impedance"] == 498
+    assert readings[0].measurements["heart_rate"] == 68
+    assert readings[0].heart_rate == 68
+    assert virtual.display_unit == WeightUnit.ST
+    assert scale.time_to_first_decrypted_frame is not None
+
+
+@pytest.mark.asyncio
+async def test_efsc651_resumes_cached_session():
+    sim = ScaleSimulator()
+    sim.add(SimulatedEFSC651(C651_ADDRESS, impedance=612, resume_sessions=True))
+    store = MemoryKeyStore()
+    scale, readings = await _weigh(sim, EFSC651Scale, C651_ADDRESS, key_store=store)
+    await _until_disconnected(scale)
+    assert readings[0].measurements["impedance"] == 612
+    assert not scale.session_resumed
+    assert store.get(C651_ADDRESS) is not None
+
+    scale, readings = await _weigh(sim, EFSC651Scale, C651_ADDRESS, key_store=store)
+    assert readings[0].measurements["impedance"] == 612
+    assert scale.session_resumed
+
+
+@pytest.mark.asyncio
+async def test_lost_notifications_fail_the_weigh_in_not_the_client():
+    sim = ScaleSimulator(LinkConditions(loss=1.0))
+    virtual = sim.add(SimulatedESF551(ESF551_ADDRESS))
+    callback = Mock()
+    scale = ESF551Scale(
+        ESF551_ADDRESS,
+        callback,
+        bleak_scanner_backend=sim.scanner(),
+        client_factory=sim.connect,
+    )
+    await scale.async_start()
+    await sim.advertise()
+    await _until_disconnected(scale)
+    callback.assert_not_called()
+    assert virtual.sessions == 1
+
+
+@pytest.mark.asyncio
+async def test_many_concurrent_scales():
+    sim = ScaleSimulator(LinkConditions(latency=0.001, jitter=0.002), seed=7)
+    kinds = [SimulatedESF551, SimulatedESF24, SimulatedEFSA591S, SimulatedEFSC651]
+    clients = {
+        SimulatedESF551: ESF551Scale,
+        SimulatedESF24: ESF24Scale,
+        SimulatedEFSA591S: EFSA591SScale,
+        SimulatedEFSC651: EFSC651Scale,
+    }
+    readings = {}
+    done = asyncio.Event()
+    count = 200
+
+    def callback(data):
+        readings[data.address] = data
+        if len(readings) == count:
+            done.set()
+
+    hub = ScaleHub(bleak_scanner_backend=sim.scanner())
+    await hub.async_start()
+    for i in range(count):
+        sim_cls = kinds[i % len(kinds)]
+        address = f"C0:00:00:00:{i >> 8:02X}:{i & 0xFF:02X}"
+        sim.add(sim_cls(address, weight_kg=50 + i / 10))
+        await clients[sim_cls](
+            address,
+            callback,
+            hub=hub,
+            client_factory=sim.connect,
+        ).async_start()
+
+    await sim.advertise()
+    await asyncio.wait_for(done.wait(), 5.0)
+    for i, address in enumerate(sim.scales):
+        assert readings[address].measurements["weight"] == round(50 + i / 10, 2)
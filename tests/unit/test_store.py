@@ -0,0 +1,144 @@
+"""Tests for the columnar measurement history store."""
+
+import asyncio
+import math
+
+import pytest
+
+from src.etekcity_esf551_ble import (
+    BodyMetrics,
+    ESF551Scale,
+    MeasurementStore,
+    ScaleData,
+    Sex,
+)
+from src.etekcity_esf551_ble.simulator import ScaleSimulator, SimulatedESF551
+from src.etekcity_esf551_ble.store import MAGIC
+
+A = "D0:4D:00:00:00:0A"
+B = "D0:4D:00:00:00:0B"
+
+
+def _reading(address, at, weight, impedance=None, **kwargs):
+    return ScaleData(
+        address=address,
+        weight=weight,
+        impedance=impedance,
+        received_at=at,
+        **kwargs,
+    )
+
+
+def _fill(store):
+    store.append(_reading(A, 100.0, 70.0, 500), "ESF-551")
+    store.append(_reading(B, 110.0, 80.0, heart_rate=60), "EFS-A591S")
+    store.append(_reading(A, 120.0, 70.5, 505), "ESF-551")
+    # Out of order, as stored offline measurements arrive
+    store.append(_reading(A, 90.0, 71.0, impedance_500khz=480), "ESF-24")
+
+
+def test_time_range_and_address_queries():
+    store = MeasurementStore()
+    _fill(store)
+    everything = store.query()
+    assert list(everything.timestamp) == [90.0, 100.0, 110.0, 120.0]
+    assert everything.address == [A, A, B, A]
+    assert everything.model == ["ESF-24", "ESF-551", "EFS-A591S", "ESF-551"]
+    assert math.isnan(everything.impedance[0]) and everything.impedance[1] == 500
+
+    window = store.query(start=100.0, end=120.0)
+    assert list(window.weight) == [70.0, 80.0]
+    assert list(store.query(address=A, start=95.0).weight) == [70.0, 70.5]
+    assert len(store.query(address="AA:AA:AA:AA:AA:AA").timestamp) == 0
+    assert sorted(store.addresses) == [A, B]
+
+    [reading] = store.readings(address=B)
+    assert (reading.weight, reading.impedance, reading.heart_rate) == (80.0, None, 60)
+    assert reading.received_at == 110.0
+
+
+def test_persists_and_reloads(tmp_path):
+    path = tmp_path / "history.etkms"
+    with MeasurementStore(path) as store:
+        _fill(store)
+    assert path.read_bytes().startswith(MAGIC)
+
+    # A record cut short by a crash is dropped, and appending resumes cleanly
+    with open(path, "ab") as f:
+        f.write(b"\x01\x2e\x00\x00\x00")
+    with MeasurementStore(path) as store:
+        assert len(store) == 4
+        store.append(_reading(B, 130.0, 79.5), "EFS-A591S")
+    with MeasurementStore(path) as store:
+        assert list(store.query(address=B).weight) == [80.0, 79.5]
+
+
+def test_compaction_sorts_and_drops_duplicates(tmp_path):
+    path = tmp_path / "history.etkms"
+    store = MeasurementStore(path, compact_every=6)
+    _fill(store)
+    store.append(_reading(A, 90.0, 71.0, impedance_500khz=480), "ESF-24")
+    size_before = path.stat().st_size
+    store.append(_reading(A, 100.0, 70.0, 500), "ESF-551")  # 6th: compacts
+    assert len(store) == 4
+    assert path.stat().st_size < size_before
+    store.close()
+    reloaded = MeasurementStore(path)
+    assert list(reloaded.query().timestamp) == [90.0, 100.0, 110.0, 120.0]
+
+    assert reloaded.prune(before=105.0) == 2
+    assert list(MeasurementStore(path).query().timestamp) == [110.0, 120.0]
+
+
+def test_body_metrics_from_columns():
+    pytest.importorskip("numpy")
+    store = MeasurementStore()
+    _fill(store)
+    metrics = store.body_metrics(1.75, 30, Sex.Male, address=A)
+    # Only the readings with an impedance
+    assert list(metrics["timestamp"]) == [100.0, 120.0]
+    expected = BodyMetrics(70.5, 1.75, 30, Sex.Male, 505).as_dict()
+    for name, value in expected.items():
+        assert metrics[name][1] == value
+
+
+def test_body_metrics_take_per_reading_profiles():
+    pytest.importorskip("numpy")
+    store = MeasurementStore()
+    _fill(store)
+    # One entry per reading of A, including the one without an impedance.
+    metrics = store.body_metrics(
+        [1.6, 1.75, 1.9], [40, 30, 31], [Sex.Female, Sex.Male, Sex.Female], address=A
+    )
+    assert list(metrics["timestamp"]) == [100.0, 120.0]
+    for row, expected in enumerate(
+        [
+            BodyMetrics(70.0, 1.75, 30, Sex.Male, 500),
+            BodyMetrics(70.5, 1.9, 31, Sex.Female, 505),
+        ]
+    ):
+        for name, value in expected.as_dict().items():
+            assert metrics[name][row] == value
+
+
+@pytest.mark.asyncio
+async def test_attached_client_readings_are_stored():
+    sim = ScaleSimulator()
+    sim.add(SimulatedESF551(A, weight_kg=68.2, impedance=511))
+    store = MeasurementStore()
+    delivered = asyncio.Event()
+    scale = ESF551Scale(
+        A,
+        lambda data: delivered.set(),
+        bleak_scanner_backend=sim.scanner(),
+        client_factory=sim.connect,
+    )
+    store.attach(scale)
+    await scale.async_start()
+    await sim.advertise(A)
+    await asyncio.wait_for(delivered.wait(), 2.0)
+    columns = store.query(address=A)
+    assert columns.model == ["ESF-551"]
+    assert (columns.weight[0], columns.impedance[0]) == (68.2, 511)
+    store.detach(scale)
+    assert scale._store is None
@@ -0,0 +1,128 @@
+"""Unit tests for async-iterator measurement streams."""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from bleak.backends.device import BLEDevice
+
+from src.etekcity_esf551_ble import (
+    ESF551Scale,
+    FIT8SScale,
+    MeasurementStream,
+    OverflowPolicy,
+    ScaleData,
+)
+from src.etekcity_esf551_ble.simulator import ScaleSimulator, SimulatedESF551
+
+from .test_capture import _advertisement
+from .test_scales import _FIT8S_ADDRESS, _FIT8S_STABLE_LB
+
+
+def _reading(weight):
+    data = ScaleData()
+    data.measurements = {"weight": weight}
+    return data
+
+
+def _scale():
+    scanner = Mock(start=AsyncMock(), stop=AsyncMock())
+    return FIT8SScale(_FIT8S_ADDRESS, None, bleak_scanner_backend=scanner)
+
+
+async def _drain(stream):
+    return [data.measurements["weight"] async for data in stream]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("overflow", "expected", "dropped"),
+    [
+        (OverflowPolicy.DROP_OLDEST, [3, 4], 3),
+        (OverflowPolicy.DROP_NEWEST, [0, 1], 3),
+        (OverflowPolicy.BLOCK, [0, 1, 2, 3, 4], 0),
+    ],
+)
+async def test_overflow_policies(overflow, expected, dropped):
+    scale = _scale()
+    stream = scale.measurements(maxsize=2, overflow=overflow)
+    for weight in range(5):
+        scale._deliver(_reading(weight))
+    stream.close()
+    assert await _drain(stream) == expected
+    assert stream.dropped == dropped
+
+
+@pytest.mark.asyncio
+async def test_block_backlog_is_capped(monkeypatch):
+    monkeypatch.setattr(MeasurementStream, "MAX_BACKLOG", 2)
+    scale = _scale()
+    stream = scale.measurements(maxsize=2, overflow=OverflowPolicy.BLOCK)
+    for weight in range(6):
+        scale._deliver(_reading(weight))
+    assert stream.qsize() == 4
+    stream.close()
+    assert await _drain(stream) == [0, 1, 2, 3]
+    assert stream.dropped == 2
+
+
+@pytest.mark.asyncio
+async def test_every_stream_gets_every_reading():
+    scale = _scale()
+    first, second = scale.measurements(), scale.measurements()
+    scale._deliver(_reading(70.0))
+    second.close()
+    scale._deliver(_reading(71.0))
+    await scale.async_stop()
+    assert await _drain(first) == [70.0, 71.0]
+    assert await _drain(second) == [70.0]
+    assert scale._streams == set()
+
+
+@pytest.mark.asyncio
+async def test_consumer_waits_for_advertisement_scale_reading():
+    scale = _scale()
+    device = BLEDevice(_FIT8S_ADDRESS, "Fit 8S", None)
+
+    async def consume():
+        async with scale.measurements() as stream:
+            async for data in stream:
+                return data
+
+    consumer = asyncio.create_task(consume())
+    await asyncio.sleep(0)
+    await scale._advertisement_callback(device, _advertisement(_FIT8S_STABLE_LB))
+    data = await asyncio.wait_for(consumer, 1.0)
+    assert data.measurements["weight"] == 70.5
+    assert scale._streams == set()
+
+
+@pytest.mark.asyncio
+async def test_close_wakes_waiting_consumer():
+    stream = _scale().measurements()
+    consumer = asyncio.create_task(_drain(stream))
+    await asyncio.sleep(0)
+    stream.close()
+    assert await asyncio.wait_for(consumer, 1.0) == []
+
+
+@pytest.mark.asyncio
+async def test_gatt_scale_stream():
+    address = "D0:4D:00:11:22:33"
+    sim = ScaleSimulator()
+    sim.add(SimulatedESF551(address, weight_kg=64.3))
+    scale = ESF551Scale(
+        address, None, bleak_scanner_backend=sim.scanner(), client_factory=sim.connect
+    )
+    stream = scale.measurements(maxsize=1)
+    await scale.async_start()
+    await sim.advertise()
+    data = await asyncio.wait_for(anext(stream), 1.0)
+    assert data.measurements["weight"] == 64.3
+    await scale.async_stop()
+    assert await _drain(stream) == []
+
+
+def test_rejects_empty_stream():
+    with pytest.raises(ValueError):
+        _scale().measurements(maxsize=0)
@@ -0,0 +1,151 @@
+"""Unit tests for per-session latency instrumentation."""
+
+import asyncio
+from unittest.mock import Mock
+
+import pytest
+from bleak.backends.device import BLEDevice
+
+from src.etekcity_esf551_ble import (
+    EFSA591SScale,
+    ESF24Scale,
+    FIT8SScale,
+    LatencyHistogram,
+    LatencyMonitor,
+    SessionPhase,
+)
+from src.etekcity_esf551_ble.simulator import (
+    LinkConditions,
+    ScaleSimulator,
+    SimulatedEFSA591S,
+    SimulatedESF24,
+)
+
+from .test_capture import _advertisement
+from .test_scales import _FIT8S_ADDRESS, _FIT8S_STABLE_LB
+
+ESF24_ADDRESS = "ED:67:39:11:22:33"
+A591S_ADDRESS = "CF:EA:01:28:86:45"
+
+
+async def _weigh(sim, scale_cls, address, monitor=None):
+    done = asyncio.Event()
+    readings = []
+
+    def callback(data):
+        readings.append(data)
+        done.set()
+
+    scale = scale_cls(
+        address,
+        callback,
+        bleak_scanner_backend=sim.scanner(),
+        client_factory=sim.connect,
+    )
+    if monitor is not None:
+        monitor.attach(scale)
+    await scale.async_start()
+    await sim.advertise(address)
+    await asyncio.wait_for(done.wait(), 2.0)
+    return scale, readings[0]
+
+
+def test_histogram_quantiles():
+    hist = LatencyHistogram()
+    assert hist.quantile(0.5) is None
+    for ms in range(1, 101):
+        hist.add(ms / 1000)
+    assert hist.count == 100
+    assert hist.mean == pytest.approx(0.0505)
+    assert 0.045 < hist.quantile(0.5) < 0.06
+    assert 0.09 < hist.quantile(0.99) <= 0.1
+    assert hist.quantile(1.0) == 0.1
+    assert sum(n for _, n in hist.buckets()) == 100
+
+
+@pytest.mark.asyncio
+async def test_gatt_session_phases():
+    sim = ScaleSimulator(LinkConditions(latency=0.002))
+    sim.add(SimulatedESF24(ESF24_ADDRESS))
+    sessions = []
+    monitor = LatencyMonitor(listener=sessions.append)
+    _, data = await _weigh(sim, ESF24Scale, ESF24_ADDRESS, monitor)
+
+    timing = data.timing
+    assert sessions == [timing]
+    assert timing.completed and timing.model == "ESF24Scale"
+    assert list(timing.durations()) == list(SessionPhase)
+    marks = [timing.marks[phase] for phase in SessionPhase]
+    assert marks == sorted(marks)
+    assert timing.elapsed(SessionPhase.FINAL_FRAME) == pytest.approx(timing.total)
+    assert monitor.completed == 1
+    assert monitor.histograms["total"].count == 1
+    assert monitor.summary()[SessionPhase.CONNECTED]["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_encrypted_handshake_is_timed():
+    sim = ScaleSimulator()
+    sim.add(SimulatedEFSA591S(A591S_ADDRESS))
+    monitor = LatencyMonitor()
+    _, data = await _weigh(sim, EFSA591SScale, A591S_ADDRESS, monitor)
+    assert SessionPhase.HANDSHAKE in data.timing.marks
+
+
+@pytest.mark.asyncio
+async def test_failed_connection_is_reported_incomplete():
+    sim = ScaleSimulator()
+    sessions = []
+    monitor = LatencyMonitor(listener=sessions.append)
+    scale = ESF24Scale(
+        ESF24_ADDRESS, Mock(), bleak_scanner_backend=Mock(), client_factory=sim.connect
+    )
+    monitor.attach(scale)
+    # Not a simulated scale, so the connection attempt fails.
+    await scale._advertisement_callback(
+        BLEDevice(ESF24_ADDRESS, "QN-Scale", None), Mock()
+    )
+    assert len(sessions) == 1
+    assert not sessions[0].completed
+    assert SessionPhase.CONNECTING in sessions[0].marks
+    assert monitor.incomplete == 1 and "total" not in monitor.histograms
+    assert scale._timing is None
+
+
+@pytest.mark.asyncio
+async def test_advertisement_while_connected_opens_no_timing():
+    sessions = []
+    monitor = LatencyMonitor(listener=sessions.append)
+    scale = ESF24Scale(ESF24_ADDRESS, Mock(), bleak_scanner_backend=Mock())
+    monitor.attach(scale)
+    scale._client = Mock()  # the previous session has not disconnected yet
+    await scale._advertisement_callback(
+        BLEDevice(ESF24_ADDRESS, "QN-Scale", None), Mock()
+    )
+    assert scale._timing is None
+    assert sessions == []
+
+
+@pytest.mark.asyncio
+async def test_advertisement_scale_timing():
+    callback = Mock()
+    scale = FIT8SScale(_FIT8S_ADDRESS, callback, bleak_scanner_backend=Mock())
+    monitor = LatencyMonitor()
+    monitor.attach(scale)
+    device = BLEDevice(_FIT8S_ADDRESS, "Fit 8S", None)
+    await scale._advertisement_callback(device, _advertisement(b"\x00"))
+    assert scale._timing is None  # no reading, nothing to time
+    await scale._advertisement_callback(device, _advertisement(_FIT8S_STABLE_LB))
+    timing = callback.call_args.args[0].timing
+    assert list(timing.marks) == [
+        SessionPhase.ADVERTISEMENT,
+        SessionPhase.COOLDOWN_PASSED,
+        SessionPhase.FIRST_FRAME,
+        SessionPhase.FINAL_FRAME,
+    ]
+
+    monitor.detach(scale)
+    scale._cooldown_end_time = 0
+    await scale._advertisement_callback(device, _advertisement(_FIT8S_STABLE_LB))
+    assert callback.call_args.args[0].timing is None
+    assert monitor.completed == 1